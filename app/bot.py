@@ -4,9 +4,19 @@ from logging.handlers import RotatingFileHandler
 import os
 from aiogram import Bot, Dispatcher
 from app.core.config import BOT_TOKEN
-from app.handlers import candidate_handlers, common, employer_search
+from app.handlers import candidate_handlers, common, employer_search, inline_search, saved_searches, shortlist
 from app.middlewares.logging import LoggingMiddleware, CustomFormatter
 from app.middlewares.fsm_timeout import FSMTimeoutMiddleware
+from app.middlewares.deadline import DeadlineMiddleware
+from app.middlewares.callback_answer import EarlyCallbackAnswerMiddleware
+from app.keyboards.inline import warm_up_keyboards
+from app.utils.message_render import RenderedMessagesMiddleware
+from app.services.decision_filter import decision_filter
+from app.services.employer_cache import employer_cache
+from app.services.saved_searches import saved_search_scheduler, saved_search_store
+from app.services.shortlist import shortlist_store
+from app.services.uploads import file_hash_index
+from app.services.skills import skill_index
 
 def setup_logging() -> None:
     """Настройка логирования."""
@@ -24,24 +34,46 @@ def setup_logging() -> None:
 async def main():
     """Главная функция запуска бота."""
     setup_logging()
+    warm_up_keyboards()
+    await employer_cache.load()
+    await saved_search_store.load()
+    await decision_filter.load()
+    await shortlist_store.load()
+    await file_hash_index.load()
+    await skill_index.load()
     
     bot = Bot(token=BOT_TOKEN, parse_mode='HTML')
+    bot.session.middleware(RenderedMessagesMiddleware())
     
     dp = Dispatcher()
     
     dp.update.middleware(FSMTimeoutMiddleware())
     dp.message.outer_middleware(LoggingMiddleware())
     dp.callback_query.outer_middleware(LoggingMiddleware())
+    dp.callback_query.middleware(EarlyCallbackAnswerMiddleware())
+    dp.message.middleware(DeadlineMiddleware())
+    dp.callback_query.middleware(DeadlineMiddleware())
+    dp.inline_query.middleware(DeadlineMiddleware())
     
     dp.include_router(common.router)
+    dp.include_router(saved_searches.router)
+    dp.include_router(shortlist.router)
     dp.include_router(candidate_handlers.router)
     dp.include_router(employer_search.router)
+    dp.include_router(inline_search.router)
     
+    saved_search_scheduler.start(bot)
     try:
         await dp.start_polling(bot)
     except Exception as e:
         logging.critical(f"Critical error starting bot: {e}", exc_info=True)
     finally:
+        await saved_search_scheduler.stop()
+        await decision_filter.save()
+        await employer_cache.save()
+        await shortlist_store.save()
+        await file_hash_index.save()
+        await saved_search_store.save()
         await bot.session.close()
 
 if __name__ == "__main__":
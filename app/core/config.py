@@ -1,9 +1,12 @@
+import os
 from dotenv import load_dotenv
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
 load_dotenv()
 
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
 class Settings(BaseSettings):
     """Конфигурация приложения."""
     BOT_TOKEN: str = Field(..., env="BOT_TOKEN")
@@ -12,6 +15,73 @@ class Settings(BaseSettings):
     SEARCH_SERVICE_URL: str = Field(..., env="SEARCH_SERVICE_URL")
     FILE_SERVICE_URL: str = Field(..., env="FILE_SERVICE_URL")
 
+    CIRCUIT_FAILURE_THRESHOLD: int = Field(5, env="CIRCUIT_FAILURE_THRESHOLD")
+    CIRCUIT_RECOVERY_TIMEOUT: float = Field(30.0, env="CIRCUIT_RECOVERY_TIMEOUT")
+    CIRCUIT_HALF_OPEN_MAX_CALLS: int = Field(1, env="CIRCUIT_HALF_OPEN_MAX_CALLS")
+    RETRY_BUDGET_RATIO: float = Field(0.2, env="RETRY_BUDGET_RATIO")
+    RETRY_BUDGET_MAX_TOKENS: float = Field(10.0, env="RETRY_BUDGET_MAX_TOKENS")
+    API_FALLBACK_TTL: float = Field(300.0, env="API_FALLBACK_TTL")
+
+    SEARCH_HEDGING_ENABLED: bool = Field(False, env="SEARCH_HEDGING_ENABLED")
+    SEARCH_HEDGE_PERCENTILE: float = Field(95.0, env="SEARCH_HEDGE_PERCENTILE")
+    SEARCH_HEDGE_MIN_DELAY: float = Field(0.1, env="SEARCH_HEDGE_MIN_DELAY")
+    SEARCH_HEDGE_DEFAULT_DELAY: float = Field(1.0, env="SEARCH_HEDGE_DEFAULT_DELAY")
+
+    UPDATE_DEADLINE: float = Field(15.0, env="UPDATE_DEADLINE")
+
+    UPLOAD_MAX_CONCURRENT: int = Field(4, env="UPLOAD_MAX_CONCURRENT")
+    UPLOAD_MAX_BYTES_IN_FLIGHT: int = Field(32 * 1024 * 1024, env="UPLOAD_MAX_BYTES_IN_FLIGHT")
+    UPLOAD_SPOOL_THRESHOLD: int = Field(1024 * 1024, env="UPLOAD_SPOOL_THRESHOLD")
+    FILE_HASH_INDEX_PATH: str = Field("file_hash_index.json", env="FILE_HASH_INDEX_PATH")
+    FILE_HASH_INDEX_SIZE: int = Field(10000, env="FILE_HASH_INDEX_SIZE")
+    FILE_HASH_INDEX_FLUSH_DELAY: float = Field(5.0, env="FILE_HASH_INDEX_FLUSH_DELAY")
+    AVATAR_MAX_SIDE: int = Field(640, env="AVATAR_MAX_SIDE")
+    AVATAR_JPEG_QUALITY: int = Field(85, env="AVATAR_JPEG_QUALITY")
+
+    EMPLOYER_CACHE_PATH: str = Field("employer_cache.json", env="EMPLOYER_CACHE_PATH")
+    EMPLOYER_CACHE_REFRESH_AFTER: float = Field(3600.0, env="EMPLOYER_CACHE_REFRESH_AFTER")
+    EMPLOYER_CACHE_FLUSH_DELAY: float = Field(5.0, env="EMPLOYER_CACHE_FLUSH_DELAY")
+
+    PROFILE_CACHE_SIZE: int = Field(2048, env="PROFILE_CACHE_SIZE")
+    PROFILE_CACHE_TTL: float = Field(300.0, env="PROFILE_CACHE_TTL")
+    HYDRATION_CONCURRENCY: int = Field(5, env="HYDRATION_CONCURRENCY")
+
+    SAVED_SEARCHES_PATH: str = Field("saved_searches.json", env="SAVED_SEARCHES_PATH")
+    SAVED_SEARCH_INTERVAL: float = Field(3600.0, env="SAVED_SEARCH_INTERVAL")
+    SAVED_SEARCH_JITTER: float = Field(0.2, env="SAVED_SEARCH_JITTER")
+    SAVED_SEARCH_CONCURRENCY: int = Field(4, env="SAVED_SEARCH_CONCURRENCY")
+    SAVED_SEARCH_TICK: float = Field(30.0, env="SAVED_SEARCH_TICK")
+    SAVED_SEARCH_PAGE_SIZE: int = Field(20, env="SAVED_SEARCH_PAGE_SIZE")
+    SAVED_SEARCH_SEEN_LIMIT: int = Field(5000, env="SAVED_SEARCH_SEEN_LIMIT")
+    SAVED_SEARCH_MAX_PER_OWNER: int = Field(10, env="SAVED_SEARCH_MAX_PER_OWNER")
+    SAVED_SEARCH_FLUSH_DELAY: float = Field(30.0, env="SAVED_SEARCH_FLUSH_DELAY")
+
+    DECISION_FILTER_PATH: str = Field("decision_filter.json", env="DECISION_FILTER_PATH")
+    DECISION_FILTER_CAPACITY: int = Field(5000, env="DECISION_FILTER_CAPACITY")
+    DECISION_FILTER_ERROR_RATE: float = Field(0.001, env="DECISION_FILTER_ERROR_RATE")
+    DECISION_FILTER_RECENT_SIZE: int = Field(500, env="DECISION_FILTER_RECENT_SIZE")
+    DECISION_FILTER_FLUSH_DELAY: float = Field(5.0, env="DECISION_FILTER_FLUSH_DELAY")
+
+    RERANK_WINDOW: int = Field(10, env="RERANK_WINDOW")
+    SEARCH_MAX_PAGES: int = Field(5, env="SEARCH_MAX_PAGES")
+    RERANK_MUST_WEIGHT: float = Field(0.6, env="RERANK_MUST_WEIGHT")
+    RERANK_NICE_WEIGHT: float = Field(0.25, env="RERANK_NICE_WEIGHT")
+    RERANK_EXPERIENCE_WEIGHT: float = Field(0.15, env="RERANK_EXPERIENCE_WEIGHT")
+    RERANK_EXPERIENCE_TOLERANCE: float = Field(3.0, env="RERANK_EXPERIENCE_TOLERANCE")
+
+    SKILLS_DATA_PATH: str = Field(os.path.join(APP_DIR, "data", "skills.json"), env="SKILLS_DATA_PATH")
+
+    INLINE_CACHE_TIME: int = Field(60, env="INLINE_CACHE_TIME")
+    INLINE_CACHE_SIZE: int = Field(512, env="INLINE_CACHE_SIZE")
+    INLINE_CACHE_TTL: float = Field(120.0, env="INLINE_CACHE_TTL")
+    INLINE_DEBOUNCE: float = Field(0.4, env="INLINE_DEBOUNCE")
+    INLINE_RESULTS_LIMIT: int = Field(20, env="INLINE_RESULTS_LIMIT")
+
+    SHORTLIST_PATH: str = Field("shortlist.json", env="SHORTLIST_PATH")
+    SHORTLIST_MAX_SIZE: int = Field(200, env="SHORTLIST_MAX_SIZE")
+    SHORTLIST_PAGE_SIZE: int = Field(8, env="SHORTLIST_PAGE_SIZE")
+    SHORTLIST_FLUSH_DELAY: float = Field(5.0, env="SHORTLIST_FLUSH_DELAY")
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
@@ -22,4 +92,60 @@ BOT_TOKEN = settings.BOT_TOKEN
 CANDIDATE_SERVICE_URL = settings.CANDIDATE_SERVICE_URL
 EMPLOYER_SERVICE_URL = settings.EMPLOYER_SERVICE_URL
 SEARCH_SERVICE_URL = settings.SEARCH_SERVICE_URL
-FILE_SERVICE_URL = settings.FILE_SERVICE_URL
\ No newline at end of file
+FILE_SERVICE_URL = settings.FILE_SERVICE_URL
+
+CIRCUIT_FAILURE_THRESHOLD = settings.CIRCUIT_FAILURE_THRESHOLD
+CIRCUIT_RECOVERY_TIMEOUT = settings.CIRCUIT_RECOVERY_TIMEOUT
+CIRCUIT_HALF_OPEN_MAX_CALLS = settings.CIRCUIT_HALF_OPEN_MAX_CALLS
+RETRY_BUDGET_RATIO = settings.RETRY_BUDGET_RATIO
+RETRY_BUDGET_MAX_TOKENS = settings.RETRY_BUDGET_MAX_TOKENS
+API_FALLBACK_TTL = settings.API_FALLBACK_TTL
+SEARCH_HEDGING_ENABLED = settings.SEARCH_HEDGING_ENABLED
+SEARCH_HEDGE_PERCENTILE = settings.SEARCH_HEDGE_PERCENTILE
+SEARCH_HEDGE_MIN_DELAY = settings.SEARCH_HEDGE_MIN_DELAY
+SEARCH_HEDGE_DEFAULT_DELAY = settings.SEARCH_HEDGE_DEFAULT_DELAY
+UPDATE_DEADLINE = settings.UPDATE_DEADLINE
+UPLOAD_MAX_CONCURRENT = settings.UPLOAD_MAX_CONCURRENT
+UPLOAD_MAX_BYTES_IN_FLIGHT = settings.UPLOAD_MAX_BYTES_IN_FLIGHT
+UPLOAD_SPOOL_THRESHOLD = settings.UPLOAD_SPOOL_THRESHOLD
+FILE_HASH_INDEX_PATH = settings.FILE_HASH_INDEX_PATH
+FILE_HASH_INDEX_SIZE = settings.FILE_HASH_INDEX_SIZE
+FILE_HASH_INDEX_FLUSH_DELAY = settings.FILE_HASH_INDEX_FLUSH_DELAY
+AVATAR_MAX_SIDE = settings.AVATAR_MAX_SIDE
+AVATAR_JPEG_QUALITY = settings.AVATAR_JPEG_QUALITY
+EMPLOYER_CACHE_PATH = settings.EMPLOYER_CACHE_PATH
+EMPLOYER_CACHE_REFRESH_AFTER = settings.EMPLOYER_CACHE_REFRESH_AFTER
+EMPLOYER_CACHE_FLUSH_DELAY = settings.EMPLOYER_CACHE_FLUSH_DELAY
+PROFILE_CACHE_SIZE = settings.PROFILE_CACHE_SIZE
+PROFILE_CACHE_TTL = settings.PROFILE_CACHE_TTL
+HYDRATION_CONCURRENCY = settings.HYDRATION_CONCURRENCY
+SAVED_SEARCHES_PATH = settings.SAVED_SEARCHES_PATH
+SAVED_SEARCH_INTERVAL = settings.SAVED_SEARCH_INTERVAL
+SAVED_SEARCH_JITTER = settings.SAVED_SEARCH_JITTER
+SAVED_SEARCH_CONCURRENCY = settings.SAVED_SEARCH_CONCURRENCY
+SAVED_SEARCH_TICK = settings.SAVED_SEARCH_TICK
+SAVED_SEARCH_PAGE_SIZE = settings.SAVED_SEARCH_PAGE_SIZE
+SAVED_SEARCH_SEEN_LIMIT = settings.SAVED_SEARCH_SEEN_LIMIT
+SAVED_SEARCH_MAX_PER_OWNER = settings.SAVED_SEARCH_MAX_PER_OWNER
+SAVED_SEARCH_FLUSH_DELAY = settings.SAVED_SEARCH_FLUSH_DELAY
+DECISION_FILTER_PATH = settings.DECISION_FILTER_PATH
+DECISION_FILTER_CAPACITY = settings.DECISION_FILTER_CAPACITY
+DECISION_FILTER_ERROR_RATE = settings.DECISION_FILTER_ERROR_RATE
+DECISION_FILTER_RECENT_SIZE = settings.DECISION_FILTER_RECENT_SIZE
+DECISION_FILTER_FLUSH_DELAY = settings.DECISION_FILTER_FLUSH_DELAY
+RERANK_WINDOW = settings.RERANK_WINDOW
+SEARCH_MAX_PAGES = settings.SEARCH_MAX_PAGES
+RERANK_MUST_WEIGHT = settings.RERANK_MUST_WEIGHT
+RERANK_NICE_WEIGHT = settings.RERANK_NICE_WEIGHT
+RERANK_EXPERIENCE_WEIGHT = settings.RERANK_EXPERIENCE_WEIGHT
+RERANK_EXPERIENCE_TOLERANCE = settings.RERANK_EXPERIENCE_TOLERANCE
+SKILLS_DATA_PATH = settings.SKILLS_DATA_PATH
+INLINE_CACHE_TIME = settings.INLINE_CACHE_TIME
+INLINE_CACHE_SIZE = settings.INLINE_CACHE_SIZE
+INLINE_CACHE_TTL = settings.INLINE_CACHE_TTL
+INLINE_DEBOUNCE = settings.INLINE_DEBOUNCE
+INLINE_RESULTS_LIMIT = settings.INLINE_RESULTS_LIMIT
+SHORTLIST_PATH = settings.SHORTLIST_PATH
+SHORTLIST_MAX_SIZE = settings.SHORTLIST_MAX_SIZE
+SHORTLIST_PAGE_SIZE = settings.SHORTLIST_PAGE_SIZE
+SHORTLIST_FLUSH_DELAY = settings.SHORTLIST_FLUSH_DELAY
\ No newline at end of file
@@ -9,6 +9,8 @@ class Messages:
         INVALID_INPUT = "❌ Неверный ввод. Пожалуйста, следуйте инструкциям текущего шага."
         SESSION_TIMEOUT = "❌ Сессия истекла. Начните заново."
         API_ERROR = "❌ Ошибка сервера. Попробуйте позже."
+        SERVICE_UNAVAILABLE = "⏳ Сервис временно недоступен. Попробуйте через минуту."
+        DEADLINE_EXCEEDED = "⏳ Запрос выполняется слишком долго. Попробуйте еще раз чуть позже."
 
     class Profile:
         NOT_FOUND = "❌ Ваш профиль не найден. Пожалуйста, зарегистрируйтесь с помощью команды /start."
@@ -44,6 +46,7 @@ class Messages:
 
         ENTER_SKILL = "❓ Хотите добавить навыки? Нажмите 'Да' или 'Нет'."
         ENTER_SKILL_NAME = "❓ Введите название навыка (например: Python):"
+        SKILL_SUGGESTIONS = "🔎 Навыка «{name}» нет в справочнике. Возможно, вы имели в виду:"
         ENTER_SKILL_KIND = "❓ Выберите тип навыка:"
         ENTER_SKILL_LEVEL = "❓ Выберите уровень владения навыком (1-5):"
         SKILL_ADDED = "✅ Навык {name} добавлен!"
@@ -98,13 +101,16 @@ class Messages:
         UPLOAD_RESUME = "❓ Загрузите ваше резюме (PDF или DOCX, до 10 МБ) или используйте /skip:"
         RESUME_PROCESSING = "⏳ Обрабатываем ваше резюме..."
         RESUME_UPDATED = "✅ Резюме успешно загружено!"
+        RESUME_UNCHANGED = "ℹ️ Это резюме уже загружено, ничего не изменилось."
         RESUME_UPDATE_ERROR = "❌ Ошибка при загрузке резюме. Попробуйте снова."
         RESUME_WRONG_TYPE = "❌ Резюме должно быть в формате PDF или DOCX."
         RESUME_TOO_BIG = "❌ Резюме слишком большое (макс. 10 МБ)."
 
         UPLOAD_AVATAR = "❓ Загрузите ваш аватар (фото) или используйте /skip:"
         AVATAR_PROCESSING = "⏳ Обрабатываем ваш аватар..."
+        UPLOAD_QUEUED = "⏳ Сейчас много загрузок, ваш файл в очереди. Обработаем через несколько секунд..."
         AVATAR_UPDATED = "✅ Аватар успешно загружен!"
+        AVATAR_UNCHANGED = "ℹ️ Этот аватар уже загружен, ничего не изменилось."
         AVATAR_UPDATE_ERROR = "❌ Ошибка при загрузке аватара. Попробуйте снова."
         DELETE_AVATAR_OK = "✅ Аватар успешно удален!"
         DELETE_AVATAR_ERROR = "❌ Ошибка при удалении аватара."
@@ -133,13 +139,40 @@ class Messages:
         SAVING = "💾 Сохранил. Начинаю поиск кандидатов..."
         FOUND = "✅ Найдено кандидатов: {total}. Показываю первых:"
         NO_MORE = "Больше кандидатов по вашему запросу нет. Начните новый поиск /search."
-        DECISION_LIKE = "✅ Кандидат отмечен как подходящий."
         DECISION_ERROR = "Не удалось сохранить выбор."
         SESSION_EXPIRED = "Ошибка: сессия поиска истекла. Начните заново."
         CONTACTS_REQUEST = "Запрашиваю контакты..."
         CONTACTS_ERROR = "❌ Произошла ошибка при запросе контактов."
         CONTACTS_GRANTED = "✅ Доступ получен. Контакты кандидата:\n\n{contacts}"
         CONTACTS_DENIED = "🤷‍♂️ Кандидат ограничил доступ к своим контактам."
+        RESUME_FETCH_PROFILE = "Запрашиваю профиль..."
+        RESUME_FETCH_LINK = "Запрашиваю ссылку на файл..."
         RESUME_NONE = "У этого кандидата нет загруженного резюме."
         RESUME_LINK = "🔗 Ваша ссылка на скачивание (действительна 5 минут):"
         RESUME_ERROR = "Не удалось получить ссылку на резюме. Сервис файлов может быть недоступен."
+
+    class SavedSearch:
+        SAVED = "💾 Поиск «{title}» сохранен. Я пришлю уведомление, когда появятся новые кандидаты.\nСписок поисков: /saved_searches"
+        NO_FILTERS = "Сначала выполните поиск с помощью /search, затем сохраните его командой /save_search."
+        LIMIT = "❌ Можно сохранить не больше {limit} поисков. Удалите ненужные в /saved_searches."
+        LIST = "📋 Ваши сохраненные поиски. Нажмите на поиск, чтобы запустить его:"
+        EMPTY = "У вас нет сохраненных поисков. Выполните /search и сохраните его командой /save_search."
+        NOT_FOUND = "❌ Сохраненный поиск не найден."
+        RUNNING = "🔎 Запускаю поиск «{title}»..."
+        NEW_CANDIDATES = "🔔 Новые кандидаты по сохраненному поиску «{title}»:\n\n{candidates}\n\nЗапустить поиск: /saved_searches"
+        MORE_CANDIDATES = "…и еще {count}"
+
+    class Inline:
+        HINT = "Например: python django 3+"
+        NO_RESULTS = "Никого не нашлось — уточнить поиск в боте"
+        EMPLOYERS_ONLY = "Поиск доступен работодателям — начните с /search в боте"
+        NO_NAME = "Имя не указано"
+        NO_ROLE = "Должность не указана"
+        EXPERIENCE = "опыт {years:g} г."
+
+    class Shortlist:
+        TITLE = "⭐ Понравившиеся кандидаты ({total}):"
+        EMPTY = "Список понравившихся кандидатов пуст. Отмечайте кандидатов кнопкой «👍 Подходит» в /search."
+        LINE = "{number}. <b>{name}</b> — {role}"
+        UNAVAILABLE = "{number}. <i>профиль недоступен</i>"
+        HINT = "📞 — контакты, 📄 — резюме."
\ No newline at end of file
@@ -1,23 +1,29 @@
-from typing import Dict, Any, List, Optional, TypedDict
+import asyncio
+from typing import Dict, Any, List, Mapping, Optional, Set, TypedDict
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, InputMediaPhoto
+from aiogram.types import Message, CallbackQuery
 from aiogram.filters import Command, StateFilter
 from aiogram.fsm.context import FSMContext
 from app.states.candidate import CandidateFSM
 from app.services.api_client import candidate_api_client, file_api_client
+from app.services.models import Candidate, state_dump, state_load
+from app.services.profile_draft import ProfileDraft, apply_patch
+from app.services.skills import skill_index
+from app.utils.deadline import clear_deadline
 from app.keyboards.inline import (
     ProfileAction, EditFieldCallback, WorkModeCallback, SkillKindCallback,
-    SkillLevelCallback, ConfirmationCallback, ContactsVisibilityCallback,
+    SkillSuggestionCallback, SkillLevelCallback, ConfirmationCallback, ContactsVisibilityCallback,
     get_profile_edit_keyboard, get_work_modes_keyboard, get_skill_kind_keyboard,
-    get_skill_level_keyboard, get_confirmation_keyboard, get_contacts_visibility_keyboard,
-    get_profile_actions_keyboard,
+    get_skill_suggestions_keyboard, get_skill_level_keyboard, get_confirmation_keyboard, get_contacts_visibility_keyboard,
+    get_profile_actions_keyboard, WORK_MODES, mask_to_work_modes, toggle_work_mode,
 )
 from app.core.messages import Messages
 from app.utils.validators import (
     validate_list_length, validate_name,
     validate_headline_role, validate_location,
 )
-from app.utils.formatters import format_candidate_profile
+from app.utils.formatters import format_candidate_profile, CAPTION_LIMIT, TEXT_LIMIT
+from app.utils.message_render import render_card
 from app.handlers.candidate_processors import (
     process_add_experience_responsibilities, process_confirm_add_experience,
     process_skill_level, process_confirm_add_skill,
@@ -29,6 +35,7 @@ import logging
 
 router = Router()
 logger = logging.getLogger(__name__)
+_background_tasks: Set[asyncio.Task] = set()
 
 class CandidateData(TypedDict, total=False):
     mode: str
@@ -57,17 +64,22 @@ class CandidateData(TypedDict, total=False):
     current_exp_end_date: Optional[str]
     current_skill_name: Optional[str]
     current_skill_kind: Optional[str]
+    current_skill_input: Optional[str]
     current_project_title: Optional[str]
     current_project_description: Optional[str]
     profile_cache: Optional[Dict[str, Any]]
 
+def _cached_profile(data: Mapping[str, Any]) -> Optional[Candidate]:
+    """Профиль из кэша в данных FSM (хранится встроенными типами)."""
+    return state_load(data.get('profile_cache'), Candidate)
+
 async def _show_profile(target: Message | CallbackQuery, state: FSMContext) -> None:
     """Показать профиль кандидата."""
     user_id: int = target.from_user.id if isinstance(target, Message) else target.from_user.id
     logger.info(f"User {user_id} requesting profile display")
 
     data: CandidateData = await state.get_data()
-    profile: Optional[Dict[str, Any]] = data.get('profile_cache')
+    profile: Optional[Candidate] = _cached_profile(data)
     if not profile:
         try:
             profile = await candidate_api_client.get_candidate_by_telegram_id(user_id)
@@ -77,7 +89,7 @@ async def _show_profile(target: Message | CallbackQuery, state: FSMContext) -> N
                 else:
                     await target.message.answer(Messages.Profile.NOT_FOUND)
                 return
-            await state.update_data(profile_cache=profile)
+            await state.update_data(profile_cache=state_dump(profile))
         except Exception as e:
             logger.error(f"Error fetching profile for user {user_id}: {str(e)}", exc_info=True)
             if isinstance(target, Message):
@@ -87,48 +99,58 @@ async def _show_profile(target: Message | CallbackQuery, state: FSMContext) -> N
             return
 
     avatar_url: Optional[str] = None
-    if profile.get("avatar_file_id"):
+    if profile.avatar_file_id:
         try:
-            avatar_url = await file_api_client.get_download_url_by_file_id(profile["avatar_file_id"])
+            avatar_url = await file_api_client.get_download_url_by_file_id(profile.avatar_file_id)
         except Exception as e:
             logger.warning(f"Error getting avatar URL for user {user_id}: {str(e)}")
 
-    caption = format_candidate_profile(profile)
-    has_avatar = bool(profile.get("avatar_file_id"))
-    has_resume = bool(profile.get("resumes"))
+    caption = format_candidate_profile(profile, limit=CAPTION_LIMIT if avatar_url else TEXT_LIMIT)
+    has_avatar = bool(profile.avatar_file_id)
+    has_resume = bool(profile.resumes)
     keyboard = get_profile_actions_keyboard(has_avatar=has_avatar, has_resume=has_resume)
 
     target_message = target if isinstance(target, Message) else target.message
     is_callback = isinstance(target, CallbackQuery)
-    is_photo_in_callback = bool(target_message.photo) if is_callback else False
 
     try:
-        if avatar_url:
-            if is_callback:
-                if is_photo_in_callback:
-                    await target_message.edit_media(media=InputMediaPhoto(media=avatar_url, caption=caption), reply_markup=keyboard)
-                else:
-                    await target_message.delete()
-                    await target_message.answer_photo(photo=avatar_url, caption=caption, reply_markup=keyboard)
-            else:
-                await target_message.answer_photo(photo=avatar_url, caption=caption, reply_markup=keyboard)
-        else:
-            if is_callback:
-                if is_photo_in_callback:
-                    await target_message.delete()
-                    await target_message.answer(text=caption, reply_markup=keyboard)
-                else:
-                    await target_message.edit_text(text=caption, reply_markup=keyboard)
-            else:
-                await target_message.answer(text=caption, reply_markup=keyboard)
+        await render_card(
+            target_message, caption, keyboard,
+            photo=avatar_url, photo_key=profile.avatar_file_id, edit=is_callback,
+        )
     except Exception as e:
         logger.error(f"Error displaying profile for user {user_id}: {str(e)}", exc_info=True)
         await target_message.answer(text=caption, reply_markup=keyboard)
 
-    if is_callback:
-        await target.answer()
     await state.set_state(CandidateFSM.showing_profile)
 
+async def _apply_local_update(state: FSMContext, telegram_id: int, base: Optional[Candidate], patch: Mapping[str, Any]) -> None:
+    """Оптимистичное обновление кэша профиля после успешного изменения и фоновая сверка с сервисом."""
+    patched = apply_patch(base, patch) if base is not None else None
+    if patched is None:
+        await state.update_data(profile_cache=None)
+        return
+    await state.update_data(profile_cache=state_dump(patched))
+    task = asyncio.create_task(_reconcile_profile(state, telegram_id, base))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+async def _update_cached_profile(state: FSMContext, telegram_id: int, data: Mapping[str, Any], patch: Mapping[str, Any]) -> None:
+    """Локальное обновление кэша профиля из процессоров (data прочитаны до очистки FSM)."""
+    await _apply_local_update(state, telegram_id, _cached_profile(data), patch)
+
+async def _reconcile_profile(state: FSMContext, telegram_id: int, base: Candidate) -> None:
+    """Фоновая загрузка актуального профиля вместо локально обновленного."""
+    clear_deadline()
+    try:
+        profile = await candidate_api_client.get_candidate_by_telegram_id(telegram_id)
+    except Exception as e:
+        logger.warning(f"Profile reconcile failed for user {telegram_id}: {str(e)}")
+        return
+    # Профиль, совпадающий с исходным, — устаревший ответ (fallback-кэш), локальную версию не затираем.
+    if profile and profile != base:
+        await state.update_data(profile_cache=state_dump(profile))
+
 async def _ask_for_experience(message: Message, state: FSMContext) -> None:
     """Запросить добавление опыта работы."""
     await state.update_data(experiences=[])
@@ -190,6 +212,8 @@ async def _finish_registration_or_edit(message: Message, state: FSMContext) -> N
     mode: str = data.get('mode', 'register')
     telegram_id: int = message.from_user.id
     logger.info(f"User {telegram_id} finishing, mode={mode}")
+    payload: Dict[str, Any] = {}
+    success = False
 
     try:
         if mode == 'register':
@@ -206,17 +230,11 @@ async def _finish_registration_or_edit(message: Message, state: FSMContext) -> N
             if key in data:
                 validate_list_length(data[key], max_length=max_len, item_type=item_type)
 
-        payload = data.copy()
-        if mode == 'edit':
-            payload = {data.get('field_to_edit'): payload.get(data.get('field_to_edit'))} if data.get('field_to_edit') else {}
-            if 'new_experiences' in data:
-                payload['experiences'] = data['new_experiences']
-            if 'new_skills' in data:
-                payload['skills'] = data['new_skills']
-            if 'new_projects' in data:
-                payload['projects'] = data['new_projects']
-
-        success = await candidate_api_client.update_candidate_profile(telegram_id, payload)
+        draft = ProfileDraft.from_state(data, mode, base=_cached_profile(data))
+        payload = draft.patch()
+        logger.info(f"User {telegram_id} profile patch: {list(payload)} of {list(draft.dirty_fields)}")
+
+        success = await candidate_api_client.update_candidate_profile(telegram_id, payload) if payload else True
         msg = Messages.Profile.FINISH_OK if mode == 'register' else Messages.Profile.FIELD_UPDATED
         await message.answer(msg if success else Messages.Profile.FINISH_ERROR)
     except ValueError as e:
@@ -226,6 +244,8 @@ async def _finish_registration_or_edit(message: Message, state: FSMContext) -> N
         await message.answer(Messages.Profile.FINISH_ERROR)
     finally:
         await state.clear()
+        if success:
+            await _apply_local_update(state, telegram_id, _cached_profile(data), payload)
         await _show_profile(message, state)
 
 @router.message(Command("profile"))
@@ -258,16 +278,19 @@ async def handle_profile_action(callback: CallbackQuery, callback_data: ProfileA
         msg = Messages.Profile.DELETE_AVATAR_OK if success else Messages.Profile.DELETE_AVATAR_ERROR
         await callback.message.answer(msg)
         await callback.message.delete()
-        await state.update_data(profile_cache=None)
+        if success:
+            data: CandidateData = await state.get_data()
+            await _apply_local_update(state, callback.from_user.id, _cached_profile(data), {"avatar_file_id": None, "avatars": []})
         await _show_profile(callback, state)
     elif callback_data.action == "delete_resume":
         success = await candidate_api_client.delete_resume(callback.from_user.id)
         msg = Messages.Profile.DELETE_RESUME_OK if success else Messages.Profile.DELETE_RESUME_ERROR
         await callback.message.answer(msg)
         await callback.message.delete()
-        await state.update_data(profile_cache=None)
+        if success:
+            data: CandidateData = await state.get_data()
+            await _apply_local_update(state, callback.from_user.id, _cached_profile(data), {"resumes": [], "has_resume": False})
         await _show_profile(callback, state)
-    await callback.answer()
 
 @router.callback_query(EditFieldCallback.filter(F.field_name != "back"), CandidateFSM.choosing_field)
 async def handle_field_chosen(callback: CallbackQuery, callback_data: EditFieldCallback, state: FSMContext) -> None:
@@ -299,10 +322,9 @@ async def handle_field_chosen(callback: CallbackQuery, callback_data: EditFieldC
         await state.set_state(CandidateFSM.block_entry)
         await callback.message.answer(Messages.Profile.ENTER_PROJECT_TITLE)
     elif field == "work_modes":
-        await state.update_data(option_type='work_modes', work_modes=[])
+        await state.update_data(option_type='work_modes')
         await state.set_state(CandidateFSM.selecting_options)
-        await callback.message.answer(Messages.Profile.WORK_MODE_SELECT, reply_markup=get_work_modes_keyboard(selected=set()))
-    await callback.answer()
+        await callback.message.answer(Messages.Profile.WORK_MODE_SELECT, reply_markup=get_work_modes_keyboard())
 
 @router.callback_query(EditFieldCallback.filter(F.field_name == "back"), CandidateFSM.choosing_field)
 async def handle_back_to_profile(callback: CallbackQuery, state: FSMContext) -> None:
@@ -310,7 +332,6 @@ async def handle_back_to_profile(callback: CallbackQuery, state: FSMContext) ->
     logger.info(f"User {callback.from_user.id} back to profile")
     await state.clear()
     await _show_profile(callback, state)
-    await callback.answer()
 
 @router.message(CandidateFSM.entering_basic_info)
 async def handle_basic_input(message: Message, state: FSMContext) -> None:
@@ -344,7 +365,8 @@ async def handle_basic_input(message: Message, state: FSMContext) -> None:
             msg = Messages.Profile.FIELD_UPDATED if success else Messages.Profile.FIELD_UPDATE_ERROR
             await message.answer(msg)
             await state.clear()
-            await state.update_data(profile_cache=None)
+            if success:
+                await _apply_local_update(state, message.from_user.id, _cached_profile(data), update_payload)
             await _show_profile(message, state)
         elif mode == 'register':
             if current_field == 'display_name':
@@ -367,10 +389,8 @@ async def handle_basic_input(message: Message, state: FSMContext) -> None:
                     await message.answer(Messages.Common.INVALID_INPUT)
                     await message.answer(Messages.Profile.ENTER_LOCATION)
                     return
-                await state.update_data(location=input_text.capitalize())
-                await state.update_data(work_modes=[])
-                await message.answer(Messages.Profile.WORK_MODE_SELECT, reply_markup=get_work_modes_keyboard(selected=set()))
-                await state.update_data(option_type='work_modes')
+                await state.update_data(location=input_text.capitalize(), option_type='work_modes')
+                await message.answer(Messages.Profile.WORK_MODE_SELECT, reply_markup=get_work_modes_keyboard())
                 await state.set_state(CandidateFSM.selecting_options)
     except Exception as e:
         logger.error(f"Error in handle_basic_input for user {message.from_user.id}: {str(e)}", exc_info=True)
@@ -407,10 +427,17 @@ async def handle_block_entry(message: Message, state: FSMContext) -> None:
                 await process_add_experience_responsibilities(message, state, mode=mode)
         elif block_type == 'skill':
             if current_step == 'name':
-                await state.update_data(current_skill_name=message.text)
-                await message.answer(Messages.Profile.ENTER_SKILL_KIND, reply_markup=get_skill_kind_keyboard())
-                await state.update_data(option_type='skill_kind')
-                await state.set_state(CandidateFSM.selecting_options)
+                name = skill_index.exact(message.text)
+                suggestions = skill_index.suggest(message.text) if name is None else []
+                if suggestions:
+                    typed = skill_index.normalize(message.text)
+                    await state.update_data(current_skill_input=typed)
+                    keyboard = get_skill_suggestions_keyboard(
+                        tuple((skill_index.names.index(s), s) for s in suggestions), typed
+                    )
+                    await message.answer(Messages.Profile.SKILL_SUGGESTIONS.format(name=typed), reply_markup=keyboard)
+                    return
+                await _ask_for_skill_kind(message, state, name or skill_index.normalize(message.text))
         elif block_type == 'project':
             if current_step == 'title':
                 await state.update_data(current_project_title=message.text)
@@ -445,7 +472,7 @@ async def handle_confirm(callback: CallbackQuery, callback_data: ConfirmationCal
                 await callback.message.delete()
                 await _ask_for_skills(callback.message, state)
         elif action_type == 'add_another_exp':
-            await process_confirm_add_experience(callback, callback_data, state, mode=mode, next_func=_ask_for_skills, show_profile_func=_show_profile)
+            await process_confirm_add_experience(callback, callback_data, state, mode=mode, next_func=_ask_for_skills, show_profile_func=_show_profile, update_cache_func=_update_cached_profile)
         elif action_type == 'start_adding_project':
             if callback_data.action == "yes":
                 await callback.message.edit_text(Messages.Profile.ENTER_PROJECT_TITLE)
@@ -455,40 +482,32 @@ async def handle_confirm(callback: CallbackQuery, callback_data: ConfirmationCal
                 await callback.message.delete()
                 await _ask_for_location(callback.message, state)
         elif action_type == 'add_another_project':
-            await process_confirm_add_project(callback, callback_data, state, mode=mode, next_func=_ask_for_location, show_profile_func=_show_profile)
+            await process_confirm_add_project(callback, callback_data, state, mode=mode, next_func=_ask_for_location, show_profile_func=_show_profile, update_cache_func=_update_cached_profile)
         elif action_type == 'add_another_skill':
-            await process_confirm_add_skill(callback, callback_data, state, mode=mode, next_func=_ask_for_projects, show_profile_func=_show_profile)
+            await process_confirm_add_skill(callback, callback_data, state, mode=mode, next_func=_ask_for_projects, show_profile_func=_show_profile, update_cache_func=_update_cached_profile)
     except Exception as e:
         logger.error(f"Error in handle_confirm for user {callback.from_user.id}: {str(e)}", exc_info=True)
         await callback.message.answer(Messages.Common.INVALID_INPUT)
-    await callback.answer()
 
-@router.callback_query(WorkModeCallback.filter(F.mode != "done"), CandidateFSM.selecting_options)
+@router.callback_query(WorkModeCallback.filter(F.mode.in_(WORK_MODES)), CandidateFSM.selecting_options)
 async def handle_work_mode_selection(callback: CallbackQuery, callback_data: WorkModeCallback, state: FSMContext) -> None:
-    """Обработка выбора форматов работы."""
-    data: CandidateData = await state.get_data()
-    selected_modes = set(data.get("work_modes", []))
-    if callback_data.mode in selected_modes:
-        selected_modes.remove(callback_data.mode)
-    else:
-        selected_modes.add(callback_data.mode)
-    await state.update_data(work_modes=list(selected_modes))
+    """Обработка выбора форматов работы (выбор хранится в callback, FSM не трогаем)."""
+    selected = toggle_work_mode(callback_data.selected, callback_data.mode)
+    selected_modes = mask_to_work_modes(selected)
     await callback.message.edit_text(
         Messages.Profile.WORK_MODE_SELECT + f"\nТекущий выбор: {', '.join(selected_modes) if selected_modes else 'пусто'}",
-        reply_markup=get_work_modes_keyboard(selected=selected_modes)
+        reply_markup=get_work_modes_keyboard(selected)
     )
-    await callback.answer()
 
 @router.callback_query(WorkModeCallback.filter(F.mode == "done"), CandidateFSM.selecting_options)
-async def handle_work_mode_done(callback: CallbackQuery, state: FSMContext) -> None:
+async def handle_work_mode_done(callback: CallbackQuery, callback_data: WorkModeCallback, state: FSMContext) -> None:
     """Обработка завершения выбора форматов работы."""
     data: CandidateData = await state.get_data()
     mode: str = data.get('mode', 'register')
-    selected_modes: List[str] = data.get("work_modes", [])
+    selected_modes: List[str] = mask_to_work_modes(callback_data.selected)
     logger.info(f"User {callback.from_user.id} finished work mode selection: {selected_modes}")
     if not selected_modes:
         await callback.message.edit_text(Messages.Common.INVALID_INPUT)
-        await callback.answer()
         return
     await callback.message.edit_text(
         f"Форматы работы выбраны: {', '.join(selected_modes)} ✅",
@@ -500,11 +519,37 @@ async def handle_work_mode_done(callback: CallbackQuery, state: FSMContext) -> N
         msg = Messages.Profile.WORK_MODE_UPDATED if success else Messages.Profile.WORK_MODE_UPDATE_ERROR
         await callback.message.answer(msg)
         await state.clear()
-        await state.update_data(profile_cache=None)
+        if success:
+            await _apply_local_update(state, callback.from_user.id, _cached_profile(data), update_payload)
         await _show_profile(callback, state)
     else:
+        await state.update_data(work_modes=selected_modes)
         await _ask_for_contacts(callback.message, state)
-    await callback.answer()
+
+async def _ask_for_skill_kind(message: Message, state: FSMContext, name: str, edit: bool = False) -> None:
+    """Сохранение названия навыка и переход к выбору типа."""
+    await state.update_data(current_skill_name=name, current_skill_input=None)
+    if edit:
+        await message.edit_text(Messages.Profile.ENTER_SKILL_KIND, reply_markup=get_skill_kind_keyboard())
+    else:
+        await message.answer(Messages.Profile.ENTER_SKILL_KIND, reply_markup=get_skill_kind_keyboard())
+    await state.update_data(option_type='skill_kind')
+    await state.set_state(CandidateFSM.selecting_options)
+
+@router.callback_query(SkillSuggestionCallback.filter(), CandidateFSM.block_entry)
+async def handle_skill_suggestion(callback: CallbackQuery, callback_data: SkillSuggestionCallback, state: FSMContext) -> None:
+    """Обработка выбора подсказки названия навыка."""
+    data: CandidateData = await state.get_data()
+    typed: Optional[str] = data.get('current_skill_input')
+    if 0 <= callback_data.index < len(skill_index.names):
+        name = skill_index.names[callback_data.index]
+    elif typed:
+        name = typed
+    else:
+        await callback.message.edit_text(Messages.Profile.ENTER_SKILL_NAME)
+        return
+    logger.info(f"User {callback.from_user.id} picked skill suggestion: {name}")
+    await _ask_for_skill_kind(callback.message, state, name, edit=True)
 
 @router.callback_query(SkillKindCallback.filter(), CandidateFSM.selecting_options)
 async def handle_skill_kind(callback: CallbackQuery, callback_data: SkillKindCallback, state: FSMContext) -> None:
@@ -516,7 +561,6 @@ async def handle_skill_kind(callback: CallbackQuery, callback_data: SkillKindCal
         reply_markup=get_skill_level_keyboard()
     )
     await state.update_data(option_type='skill_level')
-    await callback.answer()
 
 @router.callback_query(SkillLevelCallback.filter(), CandidateFSM.selecting_options)
 async def handle_skill_level(callback: CallbackQuery, callback_data: SkillLevelCallback, state: FSMContext) -> None:
@@ -533,16 +577,16 @@ async def handle_contacts_edit(message: Message, state: FSMContext) -> None:
     """Обработка ввода контактов."""
     data: CandidateData = await state.get_data()
     mode: str = data.get('mode', 'register')
-    await process_contacts(message, state, mode=mode, next_func=_ask_for_visibility, show_profile_func=_show_profile)
+    await process_contacts(message, state, mode=mode, next_func=_ask_for_visibility, show_profile_func=_show_profile, update_cache_func=_update_cached_profile)
 
 @router.callback_query(ContactsVisibilityCallback.filter(), CandidateFSM.selecting_options)
 async def handle_contacts_visibility_edit(callback: CallbackQuery, callback_data: ContactsVisibilityCallback, state: FSMContext) -> None:
     """Обработка выбора видимости контактов."""
     data: CandidateData = await state.get_data()
     mode: str = data.get('mode', 'register')
-    await process_contacts_visibility(callback, callback_data, state, mode=mode, next_func=_ask_for_resume, show_profile_func=_show_profile)
+    await process_contacts_visibility(callback, callback_data, state, mode=mode, next_func=_ask_for_resume, show_profile_func=_show_profile, update_cache_func=_update_cached_profile)
 
-@router.message(F.document, CandidateFSM.uploading_file)
+@router.message(F.document, CandidateFSM.uploading_file, flags={"deadline": 60})
 async def handle_resume_upload_edit(message: Message, state: FSMContext) -> None:
     """Обработка загрузки резюме."""
     data: CandidateData = await state.get_data()
@@ -557,7 +601,7 @@ async def handle_resume_upload_edit(message: Message, state: FSMContext) -> None
         else:
             await _ask_for_avatar(message, state)
 
-@router.message(F.photo, CandidateFSM.uploading_file)
+@router.message(F.photo, CandidateFSM.uploading_file, flags={"deadline": 60})
 async def handle_avatar_upload_edit(message: Message, state: FSMContext) -> None:
     """Обработка загрузки аватара."""
     data: CandidateData = await state.get_data()
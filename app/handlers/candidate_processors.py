@@ -9,6 +9,9 @@ from app.utils.validators import (
     ValidationError, validate_list_length
 )
 from app.services.api_client import file_api_client, candidate_api_client
+from app.services.uploads import file_hash_index, upload_manager
+from app.utils.images import pick_photo_size, prepare_avatar
+from app.utils.metrics import metrics
 import logging
 
 logger = logging.getLogger(__name__)
@@ -44,7 +47,7 @@ async def process_add_experience_responsibilities(message: Message, state: FSMCo
         logger.error(f"Error in process_add_experience_responsibilities: {str(e)}", exc_info=True)
         await message.answer(Messages.Common.INVALID_INPUT)
 
-async def process_confirm_add_experience(callback: CallbackQuery, callback_data: ConfirmationCallback, state: FSMContext, mode: str = 'register', next_func: Optional[Callable] = None, show_profile_func: Optional[Callable] = None) -> None:
+async def process_confirm_add_experience(callback: CallbackQuery, callback_data: ConfirmationCallback, state: FSMContext, mode: str = 'register', next_func: Optional[Callable] = None, show_profile_func: Optional[Callable] = None, update_cache_func: Optional[Callable] = None) -> None:
     """Процесс подтверждения добавления опыта работы."""
     try:
         if callback_data.action == "yes":
@@ -60,6 +63,8 @@ async def process_confirm_add_experience(callback: CallbackQuery, callback_data:
                 msg = Messages.Profile.EXPERIENCE_UPDATED if success else Messages.Profile.EXPERIENCE_UPDATE_ERROR
                 await callback.message.answer(msg)
                 await state.clear()
+                if success and update_cache_func:
+                    await update_cache_func(state, callback.from_user.id, data, update_payload)
                 if show_profile_func:
                     await show_profile_func(callback, state)
             else:
@@ -68,7 +73,6 @@ async def process_confirm_add_experience(callback: CallbackQuery, callback_data:
     except Exception as e:
         logger.error(f"Error in process_confirm_add_experience: {str(e)}", exc_info=True)
         await callback.message.answer(Messages.Common.CANCELLED)
-    await callback.answer()
 
 async def process_skill_level(callback: CallbackQuery, callback_data: SkillLevelCallback, state: FSMContext, mode: str = 'register') -> None:
     """Процесс выбора уровня навыка."""
@@ -98,7 +102,7 @@ async def process_skill_level(callback: CallbackQuery, callback_data: SkillLevel
         logger.error(f"Error in process_skill_level: {str(e)}", exc_info=True)
         await callback.message.answer(Messages.Common.INVALID_INPUT)
 
-async def process_confirm_add_skill(callback: CallbackQuery, callback_data: ConfirmationCallback, state: FSMContext, mode: str = 'register', next_func: Optional[Callable] = None, show_profile_func: Optional[Callable] = None) -> None:
+async def process_confirm_add_skill(callback: CallbackQuery, callback_data: ConfirmationCallback, state: FSMContext, mode: str = 'register', next_func: Optional[Callable] = None, show_profile_func: Optional[Callable] = None, update_cache_func: Optional[Callable] = None) -> None:
     """Процесс подтверждения добавления навыка."""
     try:
         if callback_data.action == "yes":
@@ -114,6 +118,8 @@ async def process_confirm_add_skill(callback: CallbackQuery, callback_data: Conf
                 msg = Messages.Profile.SKILLS_UPDATED if success else Messages.Profile.SKILLS_UPDATE_ERROR
                 await callback.message.answer(msg)
                 await state.clear()
+                if success and update_cache_func:
+                    await update_cache_func(state, callback.from_user.id, data, update_payload)
                 if show_profile_func:
                     await show_profile_func(callback, state)
             else:
@@ -122,7 +128,6 @@ async def process_confirm_add_skill(callback: CallbackQuery, callback_data: Conf
     except Exception as e:
         logger.error(f"Error in process_confirm_add_skill: {str(e)}", exc_info=True)
         await callback.message.answer(Messages.Common.CANCELLED)
-    await callback.answer()
 
 async def process_project_links(message: Message, state: FSMContext, mode: str = 'register') -> None:
     """Процесс добавления ссылок к проекту."""
@@ -152,7 +157,7 @@ async def process_project_links(message: Message, state: FSMContext, mode: str =
         logger.error(f"Error in process_project_links: {str(e)}", exc_info=True)
         await message.answer(Messages.Common.INVALID_INPUT)
 
-async def process_confirm_add_project(callback: CallbackQuery, callback_data: ConfirmationCallback, state: FSMContext, mode: str = 'register', next_func: Optional[Callable] = None, show_profile_func: Optional[Callable] = None) -> None:
+async def process_confirm_add_project(callback: CallbackQuery, callback_data: ConfirmationCallback, state: FSMContext, mode: str = 'register', next_func: Optional[Callable] = None, show_profile_func: Optional[Callable] = None, update_cache_func: Optional[Callable] = None) -> None:
     """Процесс подтверждения добавления проекта."""
     try:
         if callback_data.action == "yes":
@@ -168,6 +173,8 @@ async def process_confirm_add_project(callback: CallbackQuery, callback_data: Co
                 msg = Messages.Profile.PROJECTS_UPDATED if success else Messages.Profile.PROJECTS_UPDATE_ERROR
                 await callback.message.answer(msg)
                 await state.clear()
+                if success and update_cache_func:
+                    await update_cache_func(state, callback.from_user.id, data, update_payload)
                 if show_profile_func:
                     await show_profile_func(callback, state)
             else:
@@ -176,9 +183,8 @@ async def process_confirm_add_project(callback: CallbackQuery, callback_data: Co
     except Exception as e:
         logger.error(f"Error in process_confirm_add_project: {str(e)}", exc_info=True)
         await callback.message.answer(Messages.Common.CANCELLED)
-    await callback.answer()
 
-async def process_contacts(message: Message, state: FSMContext, mode: str = 'register', next_func: Optional[Callable] = None, show_profile_func: Optional[Callable] = None) -> None:
+async def process_contacts(message: Message, state: FSMContext, mode: str = 'register', next_func: Optional[Callable] = None, show_profile_func: Optional[Callable] = None, update_cache_func: Optional[Callable] = None) -> None:
     """Процесс обработки контактов."""
     try:
         contacts_text: Optional[str] = message.text if message.text and not message.text.startswith('/skip') else None
@@ -198,6 +204,8 @@ async def process_contacts(message: Message, state: FSMContext, mode: str = 'reg
                 msg = Messages.Profile.CONTACTS_UPDATED if success else Messages.Profile.CONTACTS_UPDATE_ERROR
                 await message.answer(msg)
                 await state.clear()
+                if success and update_cache_func:
+                    await update_cache_func(state, message.from_user.id, data, update_payload)
                 if show_profile_func:
                     await show_profile_func(message, state)
             else:
@@ -210,7 +218,7 @@ async def process_contacts(message: Message, state: FSMContext, mode: str = 'reg
         logger.error(f"Error in process_contacts: {str(e)}", exc_info=True)
         await message.answer(Messages.Common.INVALID_INPUT)
 
-async def process_contacts_visibility(callback: CallbackQuery, callback_data: ContactsVisibilityCallback, state: FSMContext, mode: str = 'register', next_func: Optional[Callable] = None, show_profile_func: Optional[Callable] = None) -> None:
+async def process_contacts_visibility(callback: CallbackQuery, callback_data: ContactsVisibilityCallback, state: FSMContext, mode: str = 'register', next_func: Optional[Callable] = None, show_profile_func: Optional[Callable] = None, update_cache_func: Optional[Callable] = None) -> None:
     """Процесс обработки видимости контактов."""
     try:
         await state.update_data(contacts_visibility=callback_data.visibility)
@@ -222,6 +230,8 @@ async def process_contacts_visibility(callback: CallbackQuery, callback_data: Co
             msg = Messages.Profile.CONTACTS_UPDATED if success else Messages.Profile.CONTACTS_UPDATE_ERROR
             await callback.message.answer(msg)
             await state.clear()
+            if success and update_cache_func:
+                await update_cache_func(state, callback.from_user.id, data, update_payload)
             if show_profile_func:
                 await show_profile_func(callback, state)
         else:
@@ -230,7 +240,6 @@ async def process_contacts_visibility(callback: CallbackQuery, callback_data: Co
     except Exception as e:
         logger.error(f"Error in process_contacts_visibility: {str(e)}", exc_info=True)
         await callback.message.answer(Messages.Common.CANCELLED)
-    await callback.answer()
 
 async def process_resume_upload(message: Message, state: FSMContext, telegram_id: int) -> bool:
     """Процесс загрузки резюме с валидацией."""
@@ -243,23 +252,32 @@ async def process_resume_upload(message: Message, state: FSMContext, telegram_id
         if document.file_size > 10 * 1024 * 1024:
             await message.answer(Messages.Profile.RESUME_TOO_BIG)
             return False
-        file_info = await message.bot.get_file(document.file_id)
-        file_data = await message.bot.download_file(file_info.file_path)
-        candidate_profile = await candidate_api_client.get_candidate_by_telegram_id(telegram_id)
-        old_file_id = candidate_profile.get("resumes")[0]["file_id"] if candidate_profile and candidate_profile.get("resumes") else None
-        extension = document.file_name.split('.')[-1].lower()
-        content_type = 'application/pdf' if extension == 'pdf' else 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
-        file_response = await file_api_client.upload_file(
-            filename=document.file_name,
-            file_data=file_data.read(),
-            content_type=content_type,
-            owner_id=telegram_id,
-            file_type='resume'
-        )
+        if upload_manager.would_wait(document.file_size):
+            await message.answer(Messages.Profile.UPLOAD_QUEUED)
+        async with upload_manager.slot(document.file_size):
+            _, file_data, digest = await upload_manager.download(message.bot, document.file_id)
+            with file_data:
+                candidate_profile = await candidate_api_client.get_candidate_by_telegram_id(telegram_id)
+                old_file_id = candidate_profile.resumes[0].file_id if candidate_profile and candidate_profile.resumes else None
+                if file_hash_index.is_current(telegram_id, 'resume', digest, old_file_id):
+                    metrics.inc("uploads.deduplicated")
+                    await message.answer(Messages.Profile.RESUME_UNCHANGED)
+                    return True
+                extension = document.file_name.split('.')[-1].lower()
+                content_type = 'application/pdf' if extension == 'pdf' else 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+                file_response = await file_api_client.upload_file(
+                    filename=document.file_name,
+                    file_data=file_data,
+                    content_type=content_type,
+                    owner_id=telegram_id,
+                    file_type='resume'
+                )
         if not file_response:
             await message.answer(Messages.Profile.RESUME_UPDATE_ERROR)
             return False
-        success = await candidate_api_client.replace_resume(telegram_id, file_response['id'])
+        success = await candidate_api_client.replace_resume(telegram_id, file_response.id)
+        if success:
+            file_hash_index.remember(telegram_id, 'resume', digest, file_response.id)
         if success and old_file_id:
             await file_api_client.delete_file(old_file_id, owner_telegram_id=telegram_id)
         await message.answer(Messages.Profile.RESUME_UPDATED if success else Messages.Profile.RESUME_UPDATE_ERROR)
@@ -273,25 +291,37 @@ async def process_avatar_upload(message: Message, state: FSMContext, telegram_id
     """Процесс загрузки аватара с валидацией."""
     try:
         await message.answer(Messages.Profile.AVATAR_PROCESSING)
-        photo = message.photo[-1]
-        file_info = await message.bot.get_file(photo.file_id)
-        file_data = await message.bot.download_file(file_info.file_path)
-        candidate_profile = await candidate_api_client.get_candidate_by_telegram_id(telegram_id)
-        old_file_id = candidate_profile.get("avatars")[0]["file_id"] if candidate_profile and candidate_profile.get("avatars") else None
-        extension = file_info.file_path.split('.')[-1].lower()
-        content_type = 'image/jpeg' if extension in ['jpg', 'jpeg'] else 'image/png'
-        filename = f"{photo.file_unique_id}.{extension}"
-        file_response = await file_api_client.upload_file(
-            filename=filename,
-            file_data=file_data.read(),
-            content_type=content_type,
-            owner_id=telegram_id,
-            file_type='avatar'
-        )
+        photo = pick_photo_size(message.photo)
+        if upload_manager.would_wait(photo.file_size):
+            await message.answer(Messages.Profile.UPLOAD_QUEUED)
+        async with upload_manager.slot(photo.file_size):
+            file_info, file_data, digest = await upload_manager.download(message.bot, photo.file_id)
+            with file_data:
+                candidate_profile = await candidate_api_client.get_candidate_by_telegram_id(telegram_id)
+                old_file_id = candidate_profile.avatars[0].file_id if candidate_profile and candidate_profile.avatars else None
+                if file_hash_index.is_current(telegram_id, 'avatar', digest, old_file_id):
+                    metrics.inc("uploads.deduplicated")
+                    await message.answer(Messages.Profile.AVATAR_UNCHANGED)
+                    return True
+                extension = file_info.file_path.split('.')[-1].lower()
+                content_type = 'image/jpeg' if extension in ['jpg', 'jpeg'] else 'image/png'
+                downscaled = await prepare_avatar(file_data)
+                if downscaled is not None:
+                    extension, content_type = 'jpg', 'image/jpeg'
+                filename = f"{photo.file_unique_id}.{extension}"
+                file_response = await file_api_client.upload_file(
+                    filename=filename,
+                    file_data=downscaled if downscaled is not None else file_data,
+                    content_type=content_type,
+                    owner_id=telegram_id,
+                    file_type='avatar'
+                )
         if not file_response:
             await message.answer(Messages.Profile.AVATAR_UPDATE_ERROR)
             return False
-        success = await candidate_api_client.replace_avatar(telegram_id, file_response['id'])
+        success = await candidate_api_client.replace_avatar(telegram_id, file_response.id)
+        if success:
+            file_hash_index.remember(telegram_id, 'avatar', digest, file_response.id)
         if success and old_file_id:
             await file_api_client.delete_file(old_file_id, owner_telegram_id=telegram_id)
         await message.answer(Messages.Profile.AVATAR_UPDATED if success else Messages.Profile.AVATAR_UPDATE_ERROR)
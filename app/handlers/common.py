@@ -22,7 +22,6 @@ async def cmd_start(message: Message, state: FSMContext) -> None:
 @router.callback_query(RoleCallback.filter(F.role_name == "candidate"))
 async def cq_select_candidate(callback: CallbackQuery, state: FSMContext) -> None:
     """Выбор роли кандидата."""
-    await callback.answer()
     user = callback.from_user
     logger.info(f"User {user.id} selected candidate role")
     await candidate_api_client.create_candidate(telegram_id=user.id, telegram_name=user.username or user.full_name)
@@ -33,7 +32,6 @@ async def cq_select_candidate(callback: CallbackQuery, state: FSMContext) -> Non
 @router.callback_query(RoleCallback.filter(F.role_name == "employer"))
 async def cq_select_employer(callback: CallbackQuery, state: FSMContext) -> None:
     """Выбор роли работодателя."""
-    await callback.answer()
     logger.info(f"User {callback.from_user.id} selected employer role")
     await state.update_data(filter_step='role')
     await state.set_state(EmployerSearch.entering_filters)
@@ -1,18 +1,34 @@
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto, ReplyKeyboardRemove
+from aiogram.types import Message, CallbackQuery, User, InlineKeyboardButton, InlineKeyboardMarkup, ReplyKeyboardRemove
 from aiogram.filters import Command
 from aiogram.fsm.context import FSMContext
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Tuple
 from app.states.employer import EmployerSearch
-from app.services.api_client import employer_api_client, search_api_client, candidate_api_client, file_api_client
+from app.services.api_client import APIHTTPError, employer_api_client, search_api_client, file_api_client
+from app.services.decision_filter import decision_filter
+from app.services.employer_cache import employer_cache
+from app.services.models import Candidate, Employer, SearchResponse, SearchSession, state_dump, state_load
+from app.services.hydration import profile_hydrator
+from app.services.ranking import candidate_ranker
+from app.services.saved_searches import saved_search_store
+from app.services.shortlist import shortlist_store
+from app.services.skills import skill_index
+from app.core.config import RERANK_WINDOW, SEARCH_MAX_PAGES
+from app.utils.metrics import metrics
 from app.keyboards.inline import get_liked_candidate_keyboard, get_initial_search_keyboard, SearchResultAction, SearchResultDecision
-from app.utils.formatters import format_candidate_profile
+from app.utils.formatters import format_candidate_profile, CAPTION_LIMIT, TEXT_LIMIT
+from app.utils.message_render import ProgressMessage, render_card
 from app.core.messages import Messages
+import asyncio
 import logging
+import time
 
 router = Router()
 logger = logging.getLogger(__name__)
 
+# С запасом, чтобы после отсева уже просмотренных кандидатов окно ранжирования не оказалось пустым.
+SEARCH_FETCH_SIZE = 2 * RERANK_WINDOW
+
 async def show_candidate_profile(message: Message | CallbackQuery, state: FSMContext) -> None:
     """Отображение профиля кандидата в поиске."""
     data: Dict[str, Any] = await state.get_data()
@@ -23,44 +39,29 @@ async def show_candidate_profile(message: Message | CallbackQuery, state: FSMCon
 
     if not found_profiles or idx >= len(found_profiles):
         await target_message.answer(Messages.EmployerSearch.NO_MORE)
-        if isinstance(message, CallbackQuery): await message.answer()
         await state.clear()
         return
 
-    profile = found_profiles[idx]
-    candidate_id = profile['id']
+    profile = state_load(found_profiles[idx], Candidate)
+    candidate_id = profile.id
 
     avatar_url: Optional[str] = None
-    if profile.get("avatar_file_id"):
-        avatar_url = await file_api_client.get_download_url_by_file_id(profile["avatar_file_id"])
+    if profile.avatar_file_id:
+        avatar_url = await file_api_client.get_download_url_by_file_id(profile.avatar_file_id)
 
-    caption = format_candidate_profile(profile)
-    has_resume = profile.get("has_resume", False)
+    caption = format_candidate_profile(profile, limit=CAPTION_LIMIT if avatar_url else TEXT_LIMIT)
+    has_resume = profile.has_resume
     keyboard = get_initial_search_keyboard(candidate_id, has_resume)
 
-    current_message_is_photo = bool(target_message.photo)
-
     try:
-        if avatar_url:
-            if current_message_is_photo:
-                await target_message.edit_media(media=InputMediaPhoto(media=avatar_url, caption=caption),
-                                                reply_markup=keyboard)
-            else:
-                await target_message.delete()
-                await target_message.answer_photo(photo=avatar_url, caption=caption, reply_markup=keyboard)
-        else:
-            if current_message_is_photo:
-                await target_message.delete()
-                await target_message.answer(text=caption, reply_markup=keyboard)
-            else:
-                await target_message.edit_text(text=caption, reply_markup=keyboard)
+        await render_card(
+            target_message, caption, keyboard,
+            photo=avatar_url, photo_key=profile.avatar_file_id, edit=isinstance(message, CallbackQuery),
+        )
     except Exception as e:
         logger.error(f"Error showing candidate profile for user {message.from_user.id}: {str(e)}")
         await target_message.answer(text=caption, reply_markup=keyboard)
 
-    if isinstance(message, CallbackQuery):
-        await message.answer()
-
 @router.message(Command("search"))
 async def cmd_search(message: Message, state: FSMContext) -> None:
     """Обработка команды /search."""
@@ -70,7 +71,94 @@ async def cmd_search(message: Message, state: FSMContext) -> None:
     await state.set_state(EmployerSearch.entering_filters)
     await message.answer(Messages.EmployerSearch.STEP_1)
 
-@router.message(EmployerSearch.entering_filters)
+async def _open_search_session(telegram_id: int, username: Optional[str], filters: Dict[str, Any]) -> Tuple[Optional[Employer], Optional[SearchSession]]:
+    """Ветка графа запуска поиска: работодатель -> сессия поиска."""
+    employer_profile: Optional[Employer] = None
+    for _ in range(2):
+        employer_profile = await employer_cache.get_or_create(telegram_id, username)
+        if not employer_profile:
+            return None, None
+        try:
+            return employer_profile, await employer_api_client.create_search_session(employer_profile.id, filters)
+        except APIHTTPError as e:
+            if e.status_code != 404:
+                raise
+            # Работодателя из кэша больше нет в сервисе: повторяем один раз с профилем, полученным заново.
+            employer_cache.invalidate(telegram_id)
+            metrics.inc("employer_cache.stale")
+    return employer_profile, None
+
+async def _find_candidates(telegram_id: int, filters: Dict[str, Any]) -> Tuple[Optional[SearchResponse], List[Candidate]]:
+    """Ветка графа запуска поиска: поиск -> отсев просмотренных -> параллельная загрузка профилей -> ранжирование.
+
+    Если после отсева просмотренных окно ранжирования не заполнено, запрашиваются
+    следующие страницы поиска (не больше SEARCH_MAX_PAGES).
+    """
+    size = SEARCH_FETCH_SIZE if decision_filter.has(telegram_id) else RERANK_WINDOW
+    search_response: Optional[SearchResponse] = None
+    candidate_ids: Dict[str, None] = {}
+    for page in range(1, SEARCH_MAX_PAGES + 1):
+        page_response = await search_api_client.search_candidates({**filters, "page": page, "size": size})
+        if page == 1:
+            search_response = page_response
+        else:
+            metrics.inc("search.extra_page")
+        if not page_response or not page_response.results:
+            break
+        results = page_response.results
+        candidate_ids.update(dict.fromkeys(decision_filter.filter(telegram_id, (res.candidate_id for res in results))))
+        total = page_response.total
+        if len(candidate_ids) >= RERANK_WINDOW or len(results) < size or (total is not None and page * size >= total):
+            break
+    if not candidate_ids:
+        return search_response, []
+    found_profiles = await profile_hydrator.hydrate(list(candidate_ids)[:RERANK_WINDOW])
+    found_profiles = candidate_ranker.rank(
+        found_profiles,
+        must_skills=filters.get("must_skills") or (),
+        nice_skills=filters.get("nice_skills") or (),
+        experience_min=filters.get("experience_min"),
+        experience_max=filters.get("experience_max"),
+    )
+    return search_response, found_profiles
+
+async def kickoff_search(message: Message, state: FSMContext, filters: Dict[str, Any], user: Optional[User] = None) -> None:
+    """Запуск поиска: создание сессии и поиск кандидатов выполняются параллельно.
+
+    user — работодатель, если message отправлено ботом (запуск из кнопки).
+    """
+    started = time.monotonic()
+    user = user or message.from_user
+    saved_search_store.remember_filters(user.id, filters)
+    session_task = asyncio.create_task(_open_search_session(user.id, user.username, filters))
+    candidates_task = asyncio.create_task(_find_candidates(user.id, filters))
+    try:
+        (employer_profile, search_session), (search_response, found_profiles) = await asyncio.gather(session_task, candidates_task)
+    except BaseException:
+        session_task.cancel()
+        candidates_task.cancel()
+        raise
+    if not employer_profile:
+        await message.answer(Messages.EmployerSearch.EMPLOYER_ERROR)
+        await state.clear()
+        return
+    if not search_session:
+        await message.answer(Messages.EmployerSearch.SEARCH_ERROR)
+        await state.clear()
+        return
+    await state.update_data(employer_profile=state_dump(employer_profile), session_id=search_session.id)
+    if not found_profiles:
+        await message.answer(Messages.EmployerSearch.NO_RESULTS)
+        await state.clear()
+        return
+    total_found = search_response.total if search_response.total is not None else len(found_profiles)
+    await state.update_data(found_profiles=state_dump(found_profiles), current_index=0)
+    await state.set_state(EmployerSearch.showing_results)
+    await message.answer(Messages.EmployerSearch.FOUND.format(total=total_found))
+    await show_candidate_profile(message, state)
+    metrics.observe("search.time_to_first_card", time.monotonic() - started)
+
+@router.message(EmployerSearch.entering_filters, flags={"deadline": 30})
 async def handle_filter_input(message: Message, state: FSMContext) -> None:
     """Обработка ввода фильтров."""
     data: Dict[str, Any] = await state.get_data()
@@ -86,13 +174,13 @@ async def handle_filter_input(message: Message, state: FSMContext) -> None:
             await message.answer(Messages.EmployerSearch.STEP_2)
             await state.update_data(filter_step="must_skills")
         elif filter_step == "must_skills":
-            skills = [s.strip().lower() for s in message.text.split(",")]
+            skills = [s.lower() for s in skill_index.normalize_many(message.text.split(","))]
             await state.update_data(must_skills=skills)
             await message.answer(Messages.EmployerSearch.STEP_3)
             await state.update_data(filter_step="nice_skills")
         elif filter_step == "nice_skills":
             if message.text != "/skip":
-                skills = [s.strip().lower() for s in message.text.split(",")]
+                skills = [s.lower() for s in skill_index.normalize_many(message.text.split(","))]
                 await state.update_data(nice_skills=skills)
             await message.answer(Messages.EmployerSearch.STEP_4)
             await state.update_data(filter_step="experience")
@@ -108,42 +196,7 @@ async def handle_filter_input(message: Message, state: FSMContext) -> None:
                 await state.update_data(location_query=message.text)
             await message.answer(Messages.EmployerSearch.SAVING, reply_markup=ReplyKeyboardRemove())
             filters = await state.get_data()
-            employer_profile = await employer_api_client.get_or_create_employer(
-                message.from_user.id, message.from_user.username
-            )
-            if not employer_profile:
-                await message.answer(Messages.EmployerSearch.EMPLOYER_ERROR)
-                await state.clear()
-                return
-            await state.update_data(employer_profile=employer_profile)
-            search_session = await employer_api_client.create_search_session(employer_profile["id"], filters)
-            if not search_session:
-                await message.answer(Messages.EmployerSearch.SEARCH_ERROR)
-                await state.clear()
-                return
-            await state.update_data(session_id=search_session["id"])
-            filters["page"] = 1
-            filters["size"] = 5
-            search_response = await search_api_client.search_candidates(filters)
-            if not search_response or not search_response.get("results"):
-                await message.answer(Messages.EmployerSearch.NO_RESULTS)
-                await state.clear()
-                return
-            found_profiles = []
-            for res in search_response["results"]:
-                candidate_id = res["candidate_id"]
-                profile = await candidate_api_client.get_candidate(candidate_id)
-                if profile:
-                    found_profiles.append(profile)
-            if not found_profiles:
-                await message.answer(Messages.EmployerSearch.NO_RESULTS)
-                await state.clear()
-                return
-            total_found = search_response.get("total", len(found_profiles))
-            await state.update_data(found_profiles=found_profiles, current_index=0)
-            await state.set_state(EmployerSearch.showing_results)
-            await message.answer(Messages.EmployerSearch.FOUND.format(total=total_found))
-            await show_candidate_profile(message, state)
+            await kickoff_search(message, state, filters)
 
     except (ValueError, IndexError) as e:
         logger.warning(f"Invalid filter input from user {message.from_user.id}: {str(e)}")
@@ -162,7 +215,7 @@ async def handle_decision(callback: CallbackQuery, callback_data: SearchResultDe
     data: Dict[str, Any] = await state.get_data()
     session_id: Optional[str] = data.get("session_id")
     if not session_id:
-        await callback.answer(Messages.EmployerSearch.SESSION_EXPIRED, show_alert=True)
+        await callback.message.answer(Messages.EmployerSearch.SESSION_EXPIRED)
         return
     success = await employer_api_client.save_decision(
         session_id=session_id,
@@ -170,14 +223,14 @@ async def handle_decision(callback: CallbackQuery, callback_data: SearchResultDe
         decision=callback_data.action
     )
     if not success:
-        await callback.answer(Messages.EmployerSearch.DECISION_ERROR, show_alert=True)
+        await callback.message.answer(Messages.EmployerSearch.DECISION_ERROR)
         return
+    decision_filter.record(callback.from_user.id, callback_data.candidate_id)
     if callback_data.action == "like":
-        await callback.answer(Messages.EmployerSearch.DECISION_LIKE)
+        shortlist_store.add(callback.from_user.id, callback_data.candidate_id)
         new_keyboard = get_liked_candidate_keyboard(callback_data.candidate_id)
         await callback.message.edit_reply_markup(reply_markup=new_keyboard)
     else:
-        await callback.answer("Выбор сохранен.")
         await process_next_candidate(callback, state)
 
 @router.callback_query(SearchResultAction.filter(F.action == "next"), EmployerSearch.showing_results)
@@ -185,47 +238,57 @@ async def handle_next_candidate(callback: CallbackQuery, state: FSMContext) -> N
     """Переход к следующему кандидату."""
     await process_next_candidate(callback, state)
 
-@router.callback_query(SearchResultAction.filter(F.action == "contact"), EmployerSearch.showing_results)
-async def handle_show_contact(callback: CallbackQuery, callback_data: SearchResultAction, state: FSMContext) -> None:
-    """Запрос контактов кандидата."""
-    data: Dict[str, Any] = await state.get_data()
-    employer_profile = data.get('employer_profile')
-    if not employer_profile:
-        await callback.answer(Messages.EmployerSearch.SESSION_EXPIRED, show_alert=True)
-        return
-    await callback.answer(Messages.EmployerSearch.CONTACTS_REQUEST, show_alert=False)
+async def send_contacts(message: Message, employer_id: str, candidate_id: str) -> None:
+    """Запрос контактов кандидата с выводом прогресса в чат."""
+    progress = ProgressMessage(message)
+    await progress.update(Messages.EmployerSearch.CONTACTS_REQUEST)
     response = await employer_api_client.request_contacts(
-        employer_id=employer_profile['id'],
-        candidate_id=callback_data.candidate_id
+        employer_id=employer_id,
+        candidate_id=candidate_id
     )
     if not response:
-        await callback.message.answer(Messages.EmployerSearch.CONTACTS_ERROR)
+        await progress.update(Messages.EmployerSearch.CONTACTS_ERROR)
         return
-    if response.get("granted") and response.get("contacts"):
-        contacts = response["contacts"]
+    if response.granted and response.contacts:
+        contacts = response.contacts
         contact_text = "\n".join([f"<b>{key.capitalize()}:</b> {value}" for key, value in contacts.items()])
-        await callback.message.answer(Messages.EmployerSearch.CONTACTS_GRANTED.format(contacts=contact_text))
+        await progress.update(Messages.EmployerSearch.CONTACTS_GRANTED.format(contacts=contact_text))
     else:
-        await callback.message.answer(Messages.EmployerSearch.CONTACTS_DENIED)
+        await progress.update(Messages.EmployerSearch.CONTACTS_DENIED)
 
-@router.callback_query(SearchResultAction.filter(F.action == "get_resume"), EmployerSearch.showing_results)
-async def handle_get_resume(callback: CallbackQuery, callback_data: SearchResultAction, state: FSMContext) -> None:
-    """Получение резюме кандидата."""
-    await callback.answer("Запрашиваю профиль...")
-    profile = await candidate_api_client.get_candidate(callback_data.candidate_id)
-    if not profile or not profile.get("resumes"):
-        await callback.message.answer(Messages.EmployerSearch.RESUME_NONE)
+async def send_resume(message: Message, candidate_id: str) -> None:
+    """Отправка ссылки на резюме кандидата с выводом прогресса в чат."""
+    progress = ProgressMessage(message)
+    await progress.update(Messages.EmployerSearch.RESUME_FETCH_PROFILE)
+    profile = await profile_hydrator.get(candidate_id)
+    if not profile or not profile.resumes:
+        await progress.update(Messages.EmployerSearch.RESUME_NONE)
         return
-    file_id = profile["resumes"][0]["file_id"]
-    await callback.answer("Запрашиваю ссылку на файл...")
+    file_id = profile.resumes[0].file_id
+    await progress.update(Messages.EmployerSearch.RESUME_FETCH_LINK)
     link = await file_api_client.get_download_url_by_file_id(file_id)
     if link:
         keyboard = InlineKeyboardMarkup(inline_keyboard=[
             [InlineKeyboardButton(text="📥 Скачать файл", url=link)]
         ])
-        await callback.message.answer(
+        await progress.update(
             Messages.EmployerSearch.RESUME_LINK,
             reply_markup=keyboard
         )
     else:
-        await callback.message.answer(Messages.EmployerSearch.RESUME_ERROR)
\ No newline at end of file
+        await progress.update(Messages.EmployerSearch.RESUME_ERROR)
+
+@router.callback_query(SearchResultAction.filter(F.action == "contact"), EmployerSearch.showing_results)
+async def handle_show_contact(callback: CallbackQuery, callback_data: SearchResultAction, state: FSMContext) -> None:
+    """Запрос контактов кандидата."""
+    data: Dict[str, Any] = await state.get_data()
+    employer_profile = state_load(data.get('employer_profile'), Employer)
+    if not employer_profile:
+        await callback.message.answer(Messages.EmployerSearch.SESSION_EXPIRED)
+        return
+    await send_contacts(callback.message, employer_profile.id, callback_data.candidate_id)
+
+@router.callback_query(SearchResultAction.filter(F.action == "get_resume"), EmployerSearch.showing_results)
+async def handle_get_resume(callback: CallbackQuery, callback_data: SearchResultAction, state: FSMContext) -> None:
+    """Получение резюме кандидата."""
+    await send_resume(callback.message, callback_data.candidate_id)
\ No newline at end of file
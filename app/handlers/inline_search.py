@@ -0,0 +1,64 @@
+from typing import List
+from aiogram import Router
+from aiogram.types import InlineQuery, InlineQueryResultArticle, InlineQueryResultsButton, InputTextMessageContent
+from app.core.config import INLINE_CACHE_TIME
+from app.core.messages import Messages
+from app.services.decision_filter import decision_filter
+from app.services.employer_cache import employer_cache
+from app.services.inline_search import inline_candidate_search, parse_inline_query
+from app.services.models import Candidate
+from app.utils.formatters import format_candidate_profile, TEXT_LIMIT
+import logging
+
+router = Router()
+logger = logging.getLogger(__name__)
+
+DESCRIPTION_SKILLS = 4
+
+def _description(profile: Candidate) -> str:
+    """Краткое описание кандидата для списка inline-результатов."""
+    parts = [profile.headline_role or Messages.Inline.NO_ROLE]
+    if profile.experience_years is not None:
+        parts.append(Messages.Inline.EXPERIENCE.format(years=profile.experience_years))
+    if profile.skills:
+        parts.append(", ".join(s.skill for s in profile.skills[:DESCRIPTION_SKILLS]))
+    return " · ".join(parts)
+
+def _article(profile: Candidate) -> InlineQueryResultArticle:
+    return InlineQueryResultArticle(
+        id=profile.id,
+        title=profile.display_name or Messages.Inline.NO_NAME,
+        description=_description(profile),
+        input_message_content=InputTextMessageContent(message_text=format_candidate_profile(profile, limit=TEXT_LIMIT)),
+    )
+
+@router.inline_query(flags={"deadline": 10})
+async def handle_inline_query(inline_query: InlineQuery) -> None:
+    """Поиск кандидатов из любого чата: @bot python django 3+."""
+    user_id = inline_query.from_user.id
+    if employer_cache.get(user_id) is None:
+        # Карточки кандидатов доступны только работодателям, которые уже начинали поиск в боте.
+        await inline_query.answer(
+            [], cache_time=INLINE_CACHE_TIME, is_personal=True,
+            button=InlineQueryResultsButton(text=Messages.Inline.EMPLOYERS_ONLY, start_parameter="employer"),
+        )
+        return
+    filters = parse_inline_query(inline_query.query)
+    if filters is None:
+        await inline_query.answer(
+            [], cache_time=INLINE_CACHE_TIME,
+            button=InlineQueryResultsButton(text=Messages.Inline.HINT, start_parameter="search"),
+        )
+        return
+    candidates = inline_candidate_search.cached(filters)
+    if candidates is None:
+        if not await inline_candidate_search.debounce(user_id):
+            return
+        logger.info(f"User {user_id} inline search: {filters}")
+        candidates = await inline_candidate_search.search(filters)
+    results: List[InlineQueryResultArticle] = [
+        _article(profile) for profile in candidates if not decision_filter.is_decided(user_id, profile.id)
+    ]
+    button = None if results else InlineQueryResultsButton(text=Messages.Inline.NO_RESULTS, start_parameter="search")
+    # Результаты персональные: из них убраны кандидаты, по которым пользователь уже принял решение.
+    await inline_query.answer(results, cache_time=INLINE_CACHE_TIME, is_personal=True, button=button)
@@ -0,0 +1,80 @@
+from typing import Any, Dict, Optional
+from aiogram import Router
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup
+from aiogram.filters import Command
+from aiogram.fsm.context import FSMContext
+from app.core.messages import Messages
+from app.handlers.employer_search import kickoff_search
+from app.keyboards.inline import SavedSearchCallback, get_saved_searches_keyboard
+from app.services.saved_searches import (
+    SavedSearchLimitError, saved_search_scheduler, saved_search_store,
+)
+import logging
+
+router = Router()
+logger = logging.getLogger(__name__)
+
+TITLE_MAX_LENGTH = 40
+
+def _search_title(filters: Dict[str, Any]) -> str:
+    """Название поиска: должность и первые обязательные навыки."""
+    title = filters.get("role", "Поиск")
+    skills = filters.get("must_skills") or []
+    if skills:
+        title = f"{title}: {', '.join(skills[:3])}"
+    return title if len(title) <= TITLE_MAX_LENGTH else title[:TITLE_MAX_LENGTH - 1] + "…"
+
+def _list_keyboard(telegram_id: int) -> Optional[InlineKeyboardMarkup]:
+    """Клавиатура со списком поисков пользователя (None, если поисков нет)."""
+    searches = saved_search_store.list_for(telegram_id)
+    return get_saved_searches_keyboard(tuple((s.id, s.title) for s in searches)) if searches else None
+
+@router.message(Command("save_search"))
+async def cmd_save_search(message: Message) -> None:
+    """Сохранение фильтров последнего поиска."""
+    filters = saved_search_store.last_filters(message.from_user.id)
+    if not filters.get("role"):
+        await message.answer(Messages.SavedSearch.NO_FILTERS)
+        return
+    try:
+        search = await saved_search_store.add(message.from_user.id, _search_title(filters), filters)
+    except SavedSearchLimitError:
+        await message.answer(Messages.SavedSearch.LIMIT.format(limit=saved_search_store.max_per_owner))
+        return
+    logger.info(f"User {message.from_user.id} saved search {search.id}: {filters}")
+    try:
+        # Первый запуск заполняет список уже известных кандидатов, уведомления не отправляются.
+        await saved_search_scheduler.run_once(None, search)
+        await saved_search_store.save()
+    except Exception as e:
+        logger.warning(f"Initial run of saved search {search.id} failed: {e}")
+    await message.answer(Messages.SavedSearch.SAVED.format(title=search.title))
+
+@router.message(Command("saved_searches"))
+async def cmd_saved_searches(message: Message) -> None:
+    """Список сохраненных поисков."""
+    keyboard = _list_keyboard(message.from_user.id)
+    if keyboard is None:
+        await message.answer(Messages.SavedSearch.EMPTY)
+        return
+    await message.answer(Messages.SavedSearch.LIST, reply_markup=keyboard)
+
+@router.callback_query(SavedSearchCallback.filter(), flags={"deadline": 30})
+async def handle_saved_search(callback: CallbackQuery, callback_data: SavedSearchCallback, state: FSMContext) -> None:
+    """Запуск или удаление сохраненного поиска."""
+    search = saved_search_store.get(callback_data.search_id)
+    if search is None or search.owner_telegram_id != callback.from_user.id:
+        await callback.message.answer(Messages.SavedSearch.NOT_FOUND)
+        return
+    logger.info(f"User {callback.from_user.id} {callback_data.action} saved search {search.id}")
+    if callback_data.action == "delete":
+        await saved_search_store.remove(search.id, owner_telegram_id=callback.from_user.id)
+        keyboard = _list_keyboard(callback.from_user.id)
+        await callback.message.edit_text(
+            Messages.SavedSearch.LIST if keyboard else Messages.SavedSearch.EMPTY, reply_markup=keyboard
+        )
+        return
+    await state.clear()
+    await state.update_data(**search.filters)
+    progress = await callback.message.answer(Messages.SavedSearch.RUNNING.format(title=search.title))
+    await kickoff_search(progress, state, dict(search.filters), user=callback.from_user)
@@ -0,0 +1,71 @@
+import math
+from typing import List, Optional, Tuple
+from aiogram import Router, F
+from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup
+from aiogram.filters import Command
+from app.core.config import SHORTLIST_PAGE_SIZE
+from app.core.messages import Messages
+from app.handlers.employer_search import send_contacts, send_resume
+from app.keyboards.inline import ShortlistCallback, get_shortlist_keyboard
+from app.services.employer_cache import employer_cache
+from app.services.hydration import profile_hydrator
+from app.services.shortlist import shortlist_store
+from app.utils.message_render import render_card
+import logging
+
+router = Router()
+logger = logging.getLogger(__name__)
+
+async def _render_page(telegram_id: int, page: int) -> Tuple[str, Optional[InlineKeyboardMarkup]]:
+    """Текст и клавиатура страницы списка: профили страницы загружаются одним пакетом."""
+    candidate_ids = shortlist_store.get(telegram_id)
+    if not candidate_ids:
+        return Messages.Shortlist.EMPTY, None
+    pages = math.ceil(len(candidate_ids) / SHORTLIST_PAGE_SIZE)
+    page = min(max(page, 0), pages - 1)
+    start = page * SHORTLIST_PAGE_SIZE
+    page_ids = candidate_ids[start:start + SHORTLIST_PAGE_SIZE]
+    profiles = {profile.id: profile for profile in await profile_hydrator.hydrate(page_ids)}
+    lines: List[str] = [Messages.Shortlist.TITLE.format(total=len(candidate_ids)), ""]
+    rows: List[Tuple[int, str, bool]] = []
+    for number, candidate_id in enumerate(page_ids, start + 1):
+        profile = profiles.get(candidate_id)
+        if profile is None:
+            lines.append(Messages.Shortlist.UNAVAILABLE.format(number=number))
+            continue
+        lines.append(Messages.Shortlist.LINE.format(
+            number=number,
+            name=profile.display_name or Messages.Inline.NO_NAME,
+            role=profile.headline_role or Messages.Inline.NO_ROLE,
+        ))
+        rows.append((number, candidate_id, bool(profile.resumes)))
+    lines.extend(("", Messages.Shortlist.HINT))
+    return "\n".join(lines), get_shortlist_keyboard(tuple(rows), page, pages)
+
+@router.message(Command("shortlist"))
+async def cmd_shortlist(message: Message) -> None:
+    """Список понравившихся кандидатов одним сообщением."""
+    logger.info(f"User {message.from_user.id} opened shortlist")
+    text, keyboard = await _render_page(message.from_user.id, 0)
+    await message.answer(text, reply_markup=keyboard)
+
+@router.callback_query(ShortlistCallback.filter(F.action == "page"))
+async def handle_shortlist_page(callback: CallbackQuery, callback_data: ShortlistCallback) -> None:
+    """Переключение страницы списка (сообщение редактируется)."""
+    text, keyboard = await _render_page(callback.from_user.id, callback_data.page)
+    await render_card(callback.message, text, keyboard)
+
+@router.callback_query(ShortlistCallback.filter(F.action == "resume"))
+async def handle_shortlist_resume(callback: CallbackQuery, callback_data: ShortlistCallback) -> None:
+    """Резюме кандидата из списка."""
+    await send_resume(callback.message, callback_data.candidate_id)
+
+@router.callback_query(ShortlistCallback.filter(F.action == "contact"))
+async def handle_shortlist_contact(callback: CallbackQuery, callback_data: ShortlistCallback) -> None:
+    """Контакты кандидата из списка (работодатель берется из кэша профилей)."""
+    user = callback.from_user
+    employer = await employer_cache.get_or_create(user.id, user.username)
+    if not employer:
+        await callback.message.answer(Messages.EmployerSearch.EMPLOYER_ERROR)
+        return
+    await send_contacts(callback.message, employer.id, callback_data.candidate_id)
@@ -0,0 +1,80 @@
+import base64
+from functools import lru_cache
+from typing import Any, ClassVar, Dict, Optional, Tuple, Type, TypeVar
+from uuid import UUID
+from aiogram.filters.callback_data import MAX_CALLBACK_LENGTH
+
+T = TypeVar("T")
+
+RAW_MARKER = "~"
+
+def encode_uuid(value: str) -> str:
+    """UUID -> 22 символа base64url (не-UUID значения передаются как есть с маркером)."""
+    try:
+        raw = UUID(value).bytes
+    except (ValueError, AttributeError, TypeError):
+        return f"{RAW_MARKER}{value}"
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+def decode_uuid(value: str) -> str:
+    """Обратное преобразование encode_uuid."""
+    if value.startswith(RAW_MARKER):
+        return value[len(RAW_MARKER):]
+    return str(UUID(bytes=base64.urlsafe_b64decode(value + "==")))
+
+@lru_cache(maxsize=None)
+def _reverse_codes(cls: type) -> Dict[str, Dict[str, str]]:
+    """Обратные таблицы кодов (код -> значение) для класса callback."""
+    return {field: {code: value for value, code in codes.items()} for field, codes in cls.__codes__.items()}
+
+class CompactCallbackMixin:
+    """Компактная упаковка CallbackData: короткие коды значений и UUID в base64url.
+
+    Использование: class X(CompactCallbackMixin, CallbackData, prefix="x").
+    __codes__ задает коды значений по полям, __uuid_fields__ — поля с UUID.
+    __legacy_prefix__ позволяет разбирать кнопки, отправленные в старом формате.
+    Фильтры CallbackData работают без изменений: unpack восстанавливает исходные значения.
+    """
+    __codes__: ClassVar[Dict[str, Dict[str, str]]] = {}
+    __uuid_fields__: ClassVar[Tuple[str, ...]] = ()
+    __legacy_prefix__: ClassVar[Optional[str]] = None
+
+    def pack(self) -> str:
+        """Упаковка в callback_data."""
+        result = [self.__prefix__]
+        for key, value in self.model_dump(mode="json").items():
+            if value is None:
+                encoded = ""
+            elif key in self.__uuid_fields__:
+                encoded = encode_uuid(str(value))
+            else:
+                encoded = self.__codes__.get(key, {}).get(str(value), str(int(value)) if isinstance(value, bool) else str(value))
+            if self.__separator__ in encoded:
+                raise ValueError(f"Separator symbol {self.__separator__!r} can not be used in value {key}={encoded!r}")
+            result.append(encoded)
+        callback_data = self.__separator__.join(result)
+        if len(callback_data.encode()) > MAX_CALLBACK_LENGTH:
+            raise ValueError(f"Resulted callback data is too long! len({callback_data!r}.encode()) > {MAX_CALLBACK_LENGTH}")
+        return callback_data
+
+    @classmethod
+    def unpack(cls: Type[T], value: str) -> T:
+        """Разбор callback_data."""
+        prefix, *parts = value.split(cls.__separator__)
+        names = list(cls.model_fields.keys())
+        if len(parts) != len(names):
+            raise TypeError(f"Callback data {cls.__name__!r} takes {len(names)} arguments but {len(parts)} were given")
+        if prefix == cls.__legacy_prefix__:
+            return cls(**dict(zip(names, parts)))
+        if prefix != cls.__prefix__:
+            raise ValueError(f"Bad prefix ({prefix!r} != {cls.__prefix__!r})")
+        reverse_codes = _reverse_codes(cls)
+        payload: Dict[str, Any] = {}
+        for name, part in zip(names, parts):
+            if part == "" and not cls.model_fields[name].is_required():
+                payload[name] = None
+            elif name in cls.__uuid_fields__:
+                payload[name] = decode_uuid(part)
+            else:
+                payload[name] = reverse_codes.get(name, {}).get(part, part)
+        return cls(**payload)
@@ -1,6 +1,11 @@
+from functools import lru_cache
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 from aiogram.filters.callback_data import CallbackData
-from typing import Literal, Set
+from app.keyboards.callback_codec import CompactCallbackMixin
+from typing import Iterable, List, Literal, Optional, Tuple
+
+CANDIDATE_KEYBOARD_CACHE_SIZE = 1024
+WORK_MODES = ("office", "remote", "hybrid")
 
 class ContactsVisibilityCallback(CallbackData, prefix="vis"):
     """Callback для выбора видимости контактов."""
@@ -10,6 +15,10 @@ class SkillKindCallback(CallbackData, prefix="skill_kind"):
     """Callback для выбора типа навыка."""
     kind: str
 
+class SkillSuggestionCallback(CallbackData, prefix="skill_sugg"):
+    """Callback для выбора подсказки навыка (index — номер в словаре навыков, -1 — оставить введенное)."""
+    index: int
+
 class SkillLevelCallback(CallbackData, prefix="skill_level"):
     """Callback для выбора уровня навыка."""
     level: int
@@ -28,23 +37,52 @@ class EditFieldCallback(CallbackData, prefix="edit_field"):
     field_name: str
 
 class WorkModeCallback(CallbackData, prefix="work_mode"):
-    """Callback для выбора формата работы."""
+    """Callback для выбора формата работы (selected — битовая маска текущего выбора)."""
     mode: str
+    selected: int = 0
+
+    @classmethod
+    def unpack(cls, value: str) -> "WorkModeCallback":
+        """Разбор callback_data; кнопки старого формата work_mode:<mode> (без маски) — с пустым выбором."""
+        prefix, *parts = value.split(cls.__separator__)
+        if prefix == cls.__prefix__ and len(parts) == 1:
+            return cls(mode=parts[0])
+        return super().unpack(value)
 
 class ProfileAction(CallbackData, prefix="profile_action"):
     """Callback для действий с профилем."""
     action: str
 
-class SearchResultDecision(CallbackData, prefix="search_dec"):
+class SearchResultDecision(CompactCallbackMixin, CallbackData, prefix="sd"):
     """Callback для решений по результатам поиска."""
+    __codes__ = {"action": {"like": "l", "dislike": "d"}}
+    __uuid_fields__ = ("candidate_id",)
+    __legacy_prefix__ = "search_dec"
     action: str
     candidate_id: str
 
-class SearchResultAction(CallbackData, prefix="search_res"):
+class SearchResultAction(CompactCallbackMixin, CallbackData, prefix="sr"):
     """Callback для действий с результатами поиска."""
+    __codes__ = {"action": {"get_resume": "r", "next": "n", "contact": "c"}}
+    __uuid_fields__ = ("candidate_id",)
+    __legacy_prefix__ = "search_res"
     action: str
     candidate_id: str
 
+class ShortlistCallback(CompactCallbackMixin, CallbackData, prefix="sl"):
+    """Callback для списка понравившихся кандидатов (страница или действие с кандидатом)."""
+    __codes__ = {"action": {"page": "p", "resume": "r", "contact": "c"}}
+    __uuid_fields__ = ("candidate_id",)
+    action: Literal["page", "resume", "contact"]
+    page: int = 0
+    candidate_id: Optional[str] = None
+
+class SavedSearchCallback(CallbackData, prefix="ss"):
+    """Callback для действий с сохраненным поиском."""
+    action: Literal["run", "delete"]
+    search_id: str
+
+@lru_cache(maxsize=None)
 def get_role_selection_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора роли."""
     keyboard = [
@@ -63,6 +101,7 @@ def get_role_selection_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
+@lru_cache(maxsize=None)
 def get_contacts_visibility_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура видимости контактов."""
     keyboard = [
@@ -87,19 +126,37 @@ def get_contacts_visibility_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
-def get_work_modes_keyboard(selected: Set[str] = set()) -> InlineKeyboardMarkup:
-    """Клавиатура форматов работы (с отмеченными)."""
-    modes = ["office", "remote", "hybrid", "done"]
+def work_modes_to_mask(modes: Iterable[str]) -> int:
+    """Список форматов работы -> битовая маска."""
+    return sum(1 << WORK_MODES.index(m) for m in set(modes) if m in WORK_MODES)
+
+def mask_to_work_modes(mask: int) -> List[str]:
+    """Битовая маска -> список форматов работы."""
+    return [m for i, m in enumerate(WORK_MODES) if mask & (1 << i)]
+
+def toggle_work_mode(mask: int, mode: str) -> int:
+    """Переключение формата работы в маске."""
+    return mask ^ (1 << WORK_MODES.index(mode))
+
+@lru_cache(maxsize=1 << len(WORK_MODES))
+def get_work_modes_keyboard(selected: int = 0) -> InlineKeyboardMarkup:
+    """Клавиатура форматов работы (с отмеченными, selected — битовая маска)."""
     keyboard = [
         [
             InlineKeyboardButton(
-                text=f"{'✅ ' if m in selected else ''}{m.capitalize()}" if m != "done" else "Готово",
-                callback_data=WorkModeCallback(mode=m).pack(),
-            ) for m in modes
+                text=f"{'✅ ' if selected & (1 << i) else ''}{m.capitalize()}",
+                callback_data=WorkModeCallback(mode=m, selected=selected).pack(),
+            ) for i, m in enumerate(WORK_MODES)
+        ] + [
+            InlineKeyboardButton(
+                text="Готово",
+                callback_data=WorkModeCallback(mode="done", selected=selected).pack(),
+            )
         ]
     ]
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
+@lru_cache(maxsize=4)
 def get_profile_actions_keyboard(has_avatar: bool = False, has_resume: bool = False) -> InlineKeyboardMarkup:
     """Клавиатура выбора работы с профилем."""
     keyboard = [
@@ -113,6 +170,7 @@ def get_profile_actions_keyboard(has_avatar: bool = False, has_resume: bool = Fa
         keyboard.append([InlineKeyboardButton(text="🗑️ Удалить резюме", callback_data=ProfileAction(action="delete_resume").pack())])
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
+@lru_cache(maxsize=CANDIDATE_KEYBOARD_CACHE_SIZE)
 def get_initial_search_keyboard(candidate_id: str, has_resume: bool) -> InlineKeyboardMarkup:
     """Клавиатура выбора действия по результату поиска."""
     keyboard = [
@@ -144,6 +202,7 @@ def get_initial_search_keyboard(candidate_id: str, has_resume: bool) -> InlineKe
     ])
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
+@lru_cache(maxsize=CANDIDATE_KEYBOARD_CACHE_SIZE)
 def get_liked_candidate_keyboard(candidate_id: str) -> InlineKeyboardMarkup:
     """Клавиатура для лайкнутого кандидата."""
     keyboard = [
@@ -162,6 +221,50 @@ def get_liked_candidate_keyboard(candidate_id: str) -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
+@lru_cache(maxsize=CANDIDATE_KEYBOARD_CACHE_SIZE)
+def get_saved_searches_keyboard(searches: Tuple[Tuple[str, str], ...]) -> InlineKeyboardMarkup:
+    """Клавиатура сохраненных поисков (searches — пары (id, название))."""
+    keyboard = [
+        [
+            InlineKeyboardButton(
+                text=f"▶️ {title}",
+                callback_data=SavedSearchCallback(action="run", search_id=search_id).pack()
+            ),
+            InlineKeyboardButton(
+                text="🗑",
+                callback_data=SavedSearchCallback(action="delete", search_id=search_id).pack()
+            ),
+        ]
+        for search_id, title in searches
+    ]
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+@lru_cache(maxsize=CANDIDATE_KEYBOARD_CACHE_SIZE)
+def get_shortlist_keyboard(rows: Tuple[Tuple[int, str, bool], ...], page: int, pages: int) -> InlineKeyboardMarkup:
+    """Клавиатура списка понравившихся: (номер, id кандидата, есть резюме) и переключение страниц."""
+    keyboard = []
+    for number, candidate_id, has_resume in rows:
+        row = [
+            InlineKeyboardButton(
+                text=f"📞 {number}",
+                callback_data=ShortlistCallback(action="contact", page=page, candidate_id=candidate_id).pack()
+            )
+        ]
+        if has_resume:
+            row.append(InlineKeyboardButton(
+                text=f"📄 {number}",
+                callback_data=ShortlistCallback(action="resume", page=page, candidate_id=candidate_id).pack()
+            ))
+        keyboard.append(row)
+    if pages > 1:
+        keyboard.append([
+            InlineKeyboardButton(text="◀️", callback_data=ShortlistCallback(action="page", page=(page - 1) % pages).pack()),
+            InlineKeyboardButton(text=f"{page + 1}/{pages}", callback_data=ShortlistCallback(action="page", page=page).pack()),
+            InlineKeyboardButton(text="▶️", callback_data=ShortlistCallback(action="page", page=(page + 1) % pages).pack()),
+        ])
+    return InlineKeyboardMarkup(inline_keyboard=keyboard)
+
+@lru_cache(maxsize=None)
 def get_profile_edit_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура редактирования профиля."""
     keyboard = [
@@ -190,6 +293,7 @@ def get_profile_edit_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
 
+@lru_cache(maxsize=None)
 def get_skill_kind_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора типа навыка."""
     buttons = [
@@ -199,6 +303,17 @@ def get_skill_kind_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
+@lru_cache(maxsize=256)
+def get_skill_suggestions_keyboard(suggestions: Tuple[Tuple[int, str], ...], typed: str) -> InlineKeyboardMarkup:
+    """Клавиатура подсказок навыка: (номер в словаре, название) и вариант оставить введенное."""
+    buttons = [
+        [InlineKeyboardButton(text=name, callback_data=SkillSuggestionCallback(index=index).pack())]
+        for index, name in suggestions
+    ]
+    buttons.append([InlineKeyboardButton(text=f"✏️ Оставить «{typed}»", callback_data=SkillSuggestionCallback(index=-1).pack())])
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+@lru_cache(maxsize=None)
 def get_skill_level_keyboard() -> InlineKeyboardMarkup:
     """Клавиатура выбора уровня навыка."""
     buttons = [
@@ -209,6 +324,7 @@ def get_skill_level_keyboard() -> InlineKeyboardMarkup:
     ]
     return InlineKeyboardMarkup(inline_keyboard=buttons)
 
+@lru_cache(maxsize=32)
 def get_confirmation_keyboard(step: str) -> InlineKeyboardMarkup:
     """Клавиатура подтверждения действия."""
     buttons = [
@@ -217,4 +333,17 @@ def get_confirmation_keyboard(step: str) -> InlineKeyboardMarkup:
             InlineKeyboardButton(text="❌ Нет, продолжить", callback_data=ConfirmationCallback(action="no", step=step).pack())
         ]
     ]
-    return InlineKeyboardMarkup(inline_keyboard=buttons)
\ No newline at end of file
+    return InlineKeyboardMarkup(inline_keyboard=buttons)
+
+def warm_up_keyboards() -> None:
+    """Предварительная сборка статических клавиатур при старте бота."""
+    get_role_selection_keyboard()
+    get_contacts_visibility_keyboard()
+    get_profile_edit_keyboard()
+    get_skill_kind_keyboard()
+    get_skill_level_keyboard()
+    for mask in range(1 << len(WORK_MODES)):
+        get_work_modes_keyboard(mask)
+    for has_avatar in (False, True):
+        for has_resume in (False, True):
+            get_profile_actions_keyboard(has_avatar=has_avatar, has_resume=has_resume)
\ No newline at end of file
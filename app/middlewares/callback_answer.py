@@ -0,0 +1,27 @@
+import logging
+from typing import Optional
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.types import CallbackQuery
+from aiogram.utils.callback_answer import CallbackAnswer, CallbackAnswerMiddleware
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+class EarlyCallbackAnswerMiddleware(CallbackAnswerMiddleware):
+    """Inner middleware: ответ на callback-запрос до выполнения хендлера.
+
+    Спиннер на кнопке снимается сразу, поэтому хендлеры не вызывают callback.answer()
+    сами, а о ходе долгих операций сообщают редактированием сообщения (ProgressMessage).
+    Хендлер может переопределить поведение флагом: flags={"callback_answer": {"pre": False}}.
+    """
+    def __init__(self, pre: bool = True, text: Optional[str] = None, show_alert: Optional[bool] = None, cache_time: Optional[int] = None):
+        super().__init__(pre=pre, text=text, show_alert=show_alert, cache_time=cache_time)
+
+    async def answer(self, event: CallbackQuery, callback_answer: CallbackAnswer) -> None:
+        """Ответ на запрос; устаревший запрос (бот был недоступен) не мешает выполнить хендлер."""
+        try:
+            await super().answer(event, callback_answer)
+            metrics.inc("callback.answered")
+        except TelegramBadRequest as e:
+            metrics.inc("callback.answer_failed")
+            logger.warning(f"Failed to answer callback query {event.id}: {e.message}")
@@ -0,0 +1,28 @@
+from typing import Any, Awaitable, Callable, Dict
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.flags import get_flag
+from aiogram.types import TelegramObject
+from app.core.config import UPDATE_DEADLINE
+from app.utils.deadline import set_deadline, reset_deadline
+
+class DeadlineMiddleware(BaseMiddleware):
+    """Middleware, задающий дедлайн обработки апдейта.
+
+    Значение по умолчанию переопределяется флагом хендлера: flags={"deadline": 30}.
+    Все API-вызовы внутри хендлера берут таймаут из оставшегося времени.
+    """
+    def __init__(self, default_deadline: float = UPDATE_DEADLINE):
+        self.default_deadline = default_deadline
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        seconds = get_flag(data, "deadline", default=self.default_deadline)
+        token = set_deadline(seconds)
+        try:
+            return await handler(event, data)
+        finally:
+            reset_deadline(token)
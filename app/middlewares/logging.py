@@ -4,6 +4,7 @@ from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject, Message, CallbackQuery
 from aiogram.fsm.context import FSMContext
 from app.core.messages import Messages
+from app.services.api_client import APICircuitOpenError, APIDeadlineExceeded
 
 logger = logging.getLogger(__name__)
 
@@ -14,6 +15,14 @@ class CustomFormatter(logging.Formatter):
             record.user_id = 'system'
         return super().format(record)
 
+async def _reply(event: TelegramObject, text: str) -> None:
+    """Ответ пользователю: на callback — сообщением в чат (запрос уже подтвержден заранее)."""
+    if isinstance(event, CallbackQuery):
+        if event.message:
+            await event.message.answer(text)
+    elif hasattr(event, 'answer'):
+        await event.answer(text)
+
 class LoggingMiddleware(BaseMiddleware):
     """Middleware для логирования сообщений и коллбеков с user_id."""
     async def __call__(
@@ -48,8 +57,13 @@ class LoggingMiddleware(BaseMiddleware):
                 logger.info(f"Event from user {user_id}: {type(event)}", extra={'user_id': user_id})
             
             return await handler(event, data)
+        except APICircuitOpenError as e:
+            logger.warning(f"Degraded response for user {user_id}: {e}", extra={'user_id': user_id})
+            await _reply(event, Messages.Common.SERVICE_UNAVAILABLE)
+        except APIDeadlineExceeded as e:
+            logger.warning(f"Deadline exceeded for user {user_id}: {e}", extra={'user_id': user_id})
+            await _reply(event, Messages.Common.DEADLINE_EXCEEDED)
         except Exception as e:
             logger.error(f"Error handling event for user {user_id}: {e}", exc_info=True, extra={'user_id': user_id})
-            if hasattr(event, 'answer'):
-                await event.answer("❌ Внутренняя ошибка. Попробуйте позже или обратитесь в поддержку.")
+            await _reply(event, "❌ Внутренняя ошибка. Попробуйте позже или обратитесь в поддержку.")
             raise
\ No newline at end of file
@@ -1,14 +1,32 @@
-from datetime import date
-from uuid import UUID
+import asyncio
+import functools
+import json
+from contextvars import ContextVar
+from uuid import UUID, uuid4
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+import msgspec
+from tenacity import AsyncRetrying, RetryCallState, stop_after_attempt, wait_exponential, retry_all, retry_if_exception_type, retry_never
 from app.core.config import (
     CANDIDATE_SERVICE_URL,
     EMPLOYER_SERVICE_URL,
     SEARCH_SERVICE_URL,
     FILE_SERVICE_URL,
+    API_FALLBACK_TTL,
+    SEARCH_HEDGING_ENABLED,
+    SEARCH_HEDGE_PERCENTILE,
+    SEARCH_HEDGE_MIN_DELAY,
+    SEARCH_HEDGE_DEFAULT_DELAY,
 )
-from typing import Dict, Any, Optional
+from app.services.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from app.services.hedging import RequestHedger
+from app.services.models import (
+    Candidate, Employer, SearchSession, SearchResponse, ContactsResponse,
+    UploadedFile, DownloadLink, json_encode, json_decode,
+)
+from app.utils.deadline import time_left, deadline_exceeded
+from app.utils.cache import LRUCache
+from app.utils.metrics import metrics
+from typing import BinaryIO, Dict, Any, Optional, Type, TypeVar, Union
 import logging
 
 logger = logging.getLogger(__name__)
@@ -27,36 +45,214 @@ class APINetworkError(APIRequestError):
     """Сетевая ошибка (timeout, connection)."""
     pass
 
-def serialize_dates(obj: Any) -> Any:
-    """Сериализация дат в ISO формат."""
-    if isinstance(obj, date):
-        return obj.isoformat()
-    elif isinstance(obj, dict):
-        return {key: serialize_dates(value) for key, value in obj.items()}
-    elif isinstance(obj, list):
-        return [serialize_dates(item) for item in obj]
-    return obj
-
-def retry_api_call():
-    """Настройка retry для API-запросов."""
-    return retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=8),
-        retry=retry_if_exception_type((httpx.RequestError, httpx.TimeoutException)),
-        reraise=True
-    )
+class APICircuitOpenError(APIRequestError):
+    """Сервис временно недоступен: circuit breaker разомкнут."""
+    pass
+
+class APIDeadlineExceeded(APIRequestError):
+    """Истек дедлайн обработки апдейта, запрос не выполняется."""
+    pass
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+MAX_ATTEMPTS = 3
+RETRYABLE_ERRORS = (APINetworkError, httpx.RequestError, httpx.TimeoutException)
+_MISSING = object()
+
+_background: ContextVar[bool] = ContextVar("background_requests", default=False)
+
+T = TypeVar("T")
+
+def decode_response(response: httpx.Response, model: Type[T]) -> T:
+    """Декодирование тела ответа сразу в типизированную модель."""
+    try:
+        return json_decode(response.content, model)
+    except msgspec.DecodeError as e:
+        raise APIRequestError(f"Invalid response from {response.request.url}: {e}")
+
+def idempotency_headers(headers: Dict[str, str], idempotency_key: Optional[str]) -> Dict[str, str]:
+    """Заголовки запроса с ключом идемпотентности."""
+    if not idempotency_key:
+        return headers
+    return {**headers, IDEMPOTENCY_HEADER: idempotency_key}
+
+def effective_timeout(timeout: httpx.Timeout) -> httpx.Timeout:
+    """Таймаут запроса, ограниченный оставшимся временем до дедлайна апдейта."""
+    left = time_left()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise APIDeadlineExceeded("Update deadline exceeded")
+    def cap(value: Optional[float]) -> float:
+        return left if value is None else min(value, left)
+    return httpx.Timeout(connect=cap(timeout.connect), read=cap(timeout.read), write=cap(timeout.write), pool=cap(timeout.pool))
+
+_wait_between_attempts = wait_exponential(multiplier=1, min=1, max=8)
+
+def _stop_at_deadline(retry_state: RetryCallState) -> bool:
+    """Не ретраить, если следующая попытка начнется после дедлайна."""
+    left = time_left()
+    return left is not None and left <= retry_state.upcoming_sleep
+
+def mark_background() -> None:
+    """Запросы текущей задачи — фоновые: выполняются без ретраев и не пополняют бюджет ретраев."""
+    _background.set(True)
+
+def _retry_within_budget(breaker: CircuitBreaker):
+    """Условие ретрая: токен бюджета списывается, только если следующая попытка действительно будет.
+
+    tenacity проверяет retry раньше stop, поэтому последняя попытка и попытка
+    после дедлайна отсекаются здесь, до обращения к бюджету.
+    """
+    def predicate(retry_state: RetryCallState) -> bool:
+        if retry_state.attempt_number >= MAX_ATTEMPTS:
+            return False
+        left = time_left()
+        if left is not None and left <= _wait_between_attempts(retry_state):
+            return False
+        return breaker.allow_retry()
+    return predicate
+
+def _call_key(name: str, args: tuple, kwargs: dict) -> str:
+    """Ключ вызова метода API по имени и аргументам."""
+    return json.dumps([name, args, kwargs], sort_keys=True, default=str)
+
+def _is_service_failure(error: BaseException) -> bool:
+    """Ошибка, которая говорит о проблемах сервиса (сеть, таймаут, 5xx)."""
+    if isinstance(error, APIHTTPError):
+        return error.status_code >= 500
+    return isinstance(error, RETRYABLE_ERRORS)
+
+async def _call_with_breaker(breaker: CircuitBreaker, func, *args, **kwargs) -> Any:
+    """Одна попытка запроса через circuit breaker."""
+    if deadline_exceeded():
+        raise APIDeadlineExceeded("Update deadline exceeded")
+    if not breaker.allow_request():
+        raise APICircuitOpenError(f"Service '{breaker.name}' is unavailable (circuit open)")
+    try:
+        result = await func(*args, **kwargs)
+    except APIDeadlineExceeded:
+        breaker.release()
+        raise
+    except APIRequestError as e:
+        if isinstance(e, APINetworkError) and deadline_exceeded():
+            breaker.release()
+            raise APIDeadlineExceeded(f"Update deadline exceeded: {e}") from e
+        if _is_service_failure(e):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        raise
+    except RETRYABLE_ERRORS as e:
+        if deadline_exceeded():
+            breaker.release()
+            raise APIDeadlineExceeded(f"Update deadline exceeded: {e}") from e
+        breaker.record_failure()
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_success()
+    return result
+
+def retry_api_call(fallback: bool = False, idempotent: bool = False):
+    """Настройка retry для API-запросов через circuit breaker клиента.
+
+    Ретраи выполняются только в состоянии closed, в пределах бюджета ретраев
+    и пока не истек дедлайн апдейта. Фоновые запросы (mark_background) делают
+    одну попытку: бюджет ретраев остается интерактивным запросам.
+    С fallback=True последний успешный ответ кэшируется и отдается, если сервис недоступен.
+    С idempotent=True на логическую операцию генерируется idempotency_key,
+    одинаковый для всех ретраев (если вызывающий код не передал свой).
+    """
+    def decorator(func):
+        fallback_cache: Optional[LRUCache] = LRUCache(maxsize=1024, ttl=API_FALLBACK_TTL) if fallback else None
+
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            breaker: CircuitBreaker = self.breaker
+            background = _background.get()
+            if background:
+                metrics.inc(f"circuit.{breaker.name}.background_requests")
+            else:
+                breaker.on_request()
+            if idempotent and not kwargs.get("idempotency_key"):
+                kwargs["idempotency_key"] = str(uuid4())
+            retrying = AsyncRetrying(
+                stop=stop_after_attempt(MAX_ATTEMPTS) | _stop_at_deadline,
+                wait=_wait_between_attempts,
+                retry=retry_never if background else (
+                    retry_all(retry_if_exception_type(RETRYABLE_ERRORS), _retry_within_budget(breaker))
+                ),
+                reraise=True
+            )
+            try:
+                async for attempt in retrying:
+                    with attempt:
+                        result = await _call_with_breaker(breaker, func, self, *args, **kwargs)
+            except APIRequestError as e:
+                if fallback_cache is None or not (isinstance(e, (APICircuitOpenError, APIDeadlineExceeded)) or _is_service_failure(e)):
+                    raise
+                key = _call_key(func.__qualname__, args, kwargs)
+                cached = fallback_cache.get(key, _MISSING)
+                if cached is _MISSING:
+                    raise
+                logger.warning(f"{func.__qualname__}: serving cached response, service '{breaker.name}' degraded: {e}")
+                metrics.inc(f"circuit.{breaker.name}.fallback_hits")
+                return cached
+            if fallback_cache is not None and result is not None:
+                key = _call_key(func.__qualname__, args, kwargs)
+                fallback_cache.set(key, result)
+            return result
+        return wrapper
+    return decorator
+
+class SingleFlight:
+    """Объединение одинаковых одновременных запросов в один (single-flight)."""
+    def __init__(self):
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()
+
+    async def do(self, key: str, factory) -> Any:
+        """Выполнить запрос или присоединиться к уже выполняющемуся с тем же ключом."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+            metrics.inc("single_flight.leaders")
+        else:
+            metrics.inc("single_flight.shared")
+        return await asyncio.shield(task)
+
+_single_flight = SingleFlight()
+
+def single_flight():
+    """Объединение одновременных идентичных идемпотентных запросов."""
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            key = _call_key(func.__qualname__, args, kwargs)
+            return await _single_flight.do(key, lambda: func(self, *args, **kwargs))
+        return wrapper
+    return decorator
 
 class CandidateAPIClient:
     """Клиент для работы с кандидатами."""
     def __init__(self):
         self.base_url = f"{CANDIDATE_SERVICE_URL}/candidates"
+        self.breaker = get_circuit_breaker(self.base_url, "candidate")
         self.timeout = httpx.Timeout(10.0, connect=5.0)
         self.headers = {"Content-Type": "application/json"}
 
-    @retry_api_call()
+    @retry_api_call(idempotent=True)
     async def create_candidate(
-        self, telegram_id: int, telegram_name: str
-    ) -> Optional[Dict[str, Any]]:
+        self, telegram_id: int, telegram_name: str, idempotency_key: Optional[str] = None
+    ) -> Optional[Candidate]:
         """Создание кандидата."""
         payload = {
             "telegram_id": telegram_id,
@@ -66,32 +262,34 @@ class CandidateAPIClient:
             "contacts": {"telegram": f"@{telegram_name}"},
             "skills": [],
         }
-        payload = serialize_dates(payload)
 
         async with httpx.AsyncClient(
-            http2=False, trust_env=False, timeout=self.timeout
+            http2=False, trust_env=False, timeout=effective_timeout(self.timeout)
         ) as client:
             try:
-                response = await client.post(f"{self.base_url}/", json=payload, headers=self.headers)
+                response = await client.post(
+                    f"{self.base_url}/", content=json_encode(payload), headers=idempotency_headers(self.headers, idempotency_key)
+                )
                 if response.status_code == 409:
                     logger.info(f"Candidate with telegram_id {telegram_id} already exists.")
                     return None
                 response.raise_for_status()
                 logger.info(f"Successfully created candidate with telegram_id {telegram_id}")
-                return response.json()
+                return decode_response(response, Candidate)
             except httpx.HTTPStatusError as e:
                 raise APIHTTPError(e.response.status_code, f"HTTP error: {e.response.text}")
             except httpx.RequestError as e:
                 raise APINetworkError(f"Network error: {str(e)}")
 
-    @retry_api_call()
-    async def get_candidate_by_telegram_id(self, telegram_id: int) -> Optional[Dict[str, Any]]:
+    @single_flight()
+    @retry_api_call(fallback=True)
+    async def get_candidate_by_telegram_id(self, telegram_id: int) -> Optional[Candidate]:
         """Получение кандидата по telegram_id."""
-        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=self.timeout) as client:
+        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=effective_timeout(self.timeout)) as client:
             try:
                 response = await client.get(f"{self.base_url}/by-telegram/{telegram_id}")
                 response.raise_for_status()
-                return response.json()
+                return decode_response(response, Candidate)
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 404:
                     logger.info(f"CandidateAPI: Profile for telegram_id {telegram_id} not found.")
@@ -100,16 +298,17 @@ class CandidateAPIClient:
             except httpx.RequestError as e:
                 raise APINetworkError(f"Network error: {str(e)}")
 
-    @retry_api_call()
-    async def get_candidate(self, candidate_id: str) -> Optional[Dict[str, Any]]:
+    @single_flight()
+    @retry_api_call(fallback=True)
+    async def get_candidate(self, candidate_id: str) -> Optional[Candidate]:
         """Получение кандидата по candidate_id."""
         async with httpx.AsyncClient(
-            http2=False, trust_env=False, timeout=self.timeout
+            http2=False, trust_env=False, timeout=effective_timeout(self.timeout)
         ) as client:
             try:
                 response = await client.get(f"{self.base_url}/{candidate_id}")
                 response.raise_for_status()
-                return response.json()
+                return decode_response(response, Candidate)
             except httpx.HTTPStatusError as e:
                 raise APIHTTPError(e.response.status_code, f"HTTP error: {e.response.text}")
             except httpx.RequestError as e:
@@ -122,13 +321,11 @@ class CandidateAPIClient:
         """Обновление кандидата."""
         url = f"{self.base_url}/by-telegram/{telegram_id}"
 
-        payload = serialize_dates(profile_data.copy())
-
         async with httpx.AsyncClient(
-            http2=False, trust_env=False, timeout=self.timeout
+            http2=False, trust_env=False, timeout=effective_timeout(self.timeout)
         ) as client:
             try:
-                response = await client.patch(url, json=payload, headers=self.headers)
+                response = await client.patch(url, content=json_encode(profile_data), headers=self.headers)
                 response.raise_for_status()
                 logger.info(f"Successfully updated profile for telegram_id {telegram_id}")
                 return True
@@ -142,10 +339,9 @@ class CandidateAPIClient:
         """Добавление/замена резюме."""
         url = f"{self.base_url}/by-telegram/{telegram_id}/resume"
         payload = {"file_id": str(file_id)}
-        payload = serialize_dates(payload)
-        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=self.timeout) as client:
+        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=effective_timeout(self.timeout)) as client:
             try:
-                response = await client.put(url, json=payload, headers=self.headers)
+                response = await client.put(url, content=json_encode(payload), headers=self.headers)
                 response.raise_for_status()
                 return True
             except httpx.HTTPStatusError as e:
@@ -158,10 +354,9 @@ class CandidateAPIClient:
         """Добавление/замена аватара."""
         url = f"{self.base_url}/by-telegram/{telegram_id}/avatar"
         payload = {"file_id": str(file_id)}
-        payload = serialize_dates(payload)
-        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=self.timeout) as client:
+        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=effective_timeout(self.timeout)) as client:
             try:
-                response = await client.put(url, json=payload, headers=self.headers)
+                response = await client.put(url, content=json_encode(payload), headers=self.headers)
                 response.raise_for_status()
                 logger.info(f"Successfully replaced avatar for telegram_id {telegram_id}")
                 return True
@@ -174,7 +369,7 @@ class CandidateAPIClient:
     async def delete_avatar(self, telegram_id: int) -> bool:
         """Удаление аватара."""
         url = f"{self.base_url}/by-telegram/{telegram_id}/avatar"
-        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=self.timeout) as client:
+        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=effective_timeout(self.timeout)) as client:
             try:
                 response = await client.delete(url)
                 response.raise_for_status()
@@ -189,7 +384,7 @@ class CandidateAPIClient:
     async def delete_resume(self, telegram_id: int) -> bool:
         """Удаление резюме."""
         url = f"{self.base_url}/by-telegram/{telegram_id}/resume"
-        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=self.timeout) as client:
+        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=effective_timeout(self.timeout)) as client:
             try:
                 response = await client.delete(url)
                 response.raise_for_status()
@@ -204,52 +399,58 @@ class EmployerAPIClient:
     """Клиент для работы с работодателями."""
     def __init__(self):
         self.base_url = f"{EMPLOYER_SERVICE_URL}/employers"
+        self.breaker = get_circuit_breaker(self.base_url, "employer")
         self.timeout = httpx.Timeout(10.0, connect=5.0)
         self.headers = {"Content-Type": "application/json"}
 
     @retry_api_call()
-    async def get_or_create_employer(self, telegram_id: int, username: str) -> Optional[Dict[str, Any]]:
+    async def get_or_create_employer(self, telegram_id: int, username: str) -> Optional[Employer]:
         """Создание работодателя"""
         payload = {"telegram_id": telegram_id, "contacts": {"telegram": f"@{username}"}}
-        payload = serialize_dates(payload)
         async with httpx.AsyncClient(
-            http2=False, trust_env=False, timeout=self.timeout
+            http2=False, trust_env=False, timeout=effective_timeout(self.timeout)
         ) as client:
             try:
-                response = await client.post(f"{self.base_url}/", json=payload, headers=self.headers)
+                response = await client.post(f"{self.base_url}/", content=json_encode(payload), headers=self.headers)
                 response.raise_for_status()
-                return response.json()
+                return decode_response(response, Employer)
             except httpx.HTTPStatusError as e:
                 raise APIHTTPError(e.response.status_code, f"HTTP error: {e.response.text}")
             except httpx.RequestError as e:
                 raise APINetworkError(f"Network error: {str(e)}")
 
-    @retry_api_call()
-    async def create_search_session(self, employer_id: str, filters: dict) -> Optional[Dict[str, Any]]:
+    @retry_api_call(idempotent=True)
+    async def create_search_session(
+        self, employer_id: str, filters: dict, idempotency_key: Optional[str] = None
+    ) -> Optional[SearchSession]:
         """Создание сессии поиска."""
         payload = {"title": f"Search for {filters.get('role', 'candidate')}", "filters": filters}
-        payload = serialize_dates(payload)
         async with httpx.AsyncClient(
-            http2=False, trust_env=False, timeout=self.timeout
+            http2=False, trust_env=False, timeout=effective_timeout(self.timeout)
         ) as client:
             try:
-                response = await client.post(f"{self.base_url}/{employer_id}/searches", json=payload, headers=self.headers)
+                response = await client.post(
+                    f"{self.base_url}/{employer_id}/searches",
+                    content=json_encode(payload),
+                    headers=idempotency_headers(self.headers, idempotency_key),
+                )
                 response.raise_for_status()
-                return response.json()
+                return decode_response(response, SearchSession)
             except httpx.HTTPStatusError as e:
                 raise APIHTTPError(e.response.status_code, f"HTTP error: {e.response.text}")
             except httpx.RequestError as e:
                 raise APINetworkError(f"Network error: {str(e)}")
 
-    @retry_api_call()
-    async def save_decision(self, session_id: str, candidate_id: str, decision: str) -> bool:
+    @retry_api_call(idempotent=True)
+    async def save_decision(
+        self, session_id: str, candidate_id: str, decision: str, idempotency_key: Optional[str] = None
+    ) -> bool:
         """Сохранение выбора работодателя."""
         url = f"{self.base_url}/searches/{session_id}/decisions"
         payload = {"candidate_id": candidate_id, "decision": decision}
-        payload = serialize_dates(payload)
-        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=self.timeout) as client:
+        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=effective_timeout(self.timeout)) as client:
             try:
-                response = await client.post(url, json=payload, headers=self.headers)
+                response = await client.post(url, content=json_encode(payload), headers=idempotency_headers(self.headers, idempotency_key))
                 response.raise_for_status()
                 logger.info(f"Decision '{decision}' for candidate {candidate_id} in session {session_id} saved.")
                 return True
@@ -258,17 +459,18 @@ class EmployerAPIClient:
             except httpx.RequestError as e:
                 raise APINetworkError(f"Network error: {str(e)}")
 
-    @retry_api_call()
-    async def request_contacts(self, employer_id: str, candidate_id: str) -> Optional[Dict[str, Any]]:
+    @retry_api_call(idempotent=True)
+    async def request_contacts(
+        self, employer_id: str, candidate_id: str, idempotency_key: Optional[str] = None
+    ) -> Optional[ContactsResponse]:
         """Запрос контактов."""
         url = f"{self.base_url}/{employer_id}/contact-requests"
         payload = {"candidate_id": candidate_id}
-        payload = serialize_dates(payload)
-        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=self.timeout) as client:
+        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=effective_timeout(self.timeout)) as client:
             try:
-                response = await client.post(url, json=payload, headers=self.headers)
+                response = await client.post(url, content=json_encode(payload), headers=idempotency_headers(self.headers, idempotency_key))
                 response.raise_for_status()
-                return response.json()
+                return decode_response(response, ContactsResponse)
             except httpx.HTTPStatusError as e:
                 raise APIHTTPError(e.response.status_code, f"HTTP error: {e.response.text}")
             except httpx.RequestError as e:
@@ -278,17 +480,29 @@ class SearchAPIClient:
     """Клиент для работы с поиском."""
     def __init__(self):
         self.base_url = f"{SEARCH_SERVICE_URL}/search"
+        self.breaker = get_circuit_breaker(self.base_url, "search")
         self.timeout = httpx.Timeout(10.0, connect=5.0)
         self.headers = {"Content-Type": "application/json"}
+        self.hedger = RequestHedger(
+            "search",
+            percentile=SEARCH_HEDGE_PERCENTILE,
+            min_delay=SEARCH_HEDGE_MIN_DELAY,
+            default_delay=SEARCH_HEDGE_DEFAULT_DELAY,
+            enabled=SEARCH_HEDGING_ENABLED,
+        )
 
-    @retry_api_call()
-    async def search_candidates(self, filters: dict) -> Optional[Dict[str, Any]]:
-        """Поиск кандидатов."""
-        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=self.timeout) as client:
+    @retry_api_call(fallback=True)
+    async def search_candidates(self, filters: dict) -> Optional[SearchResponse]:
+        """Поиск кандидатов (с хеджированием медленных запросов)."""
+        return await self.hedger.run(lambda: self._search_once(filters))
+
+    async def _search_once(self, filters: dict) -> Optional[SearchResponse]:
+        """Один запрос поиска кандидатов."""
+        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=effective_timeout(self.timeout)) as client:
             try:
-                response = await client.post(f"{self.base_url}/", json=filters, headers=self.headers)
+                response = await client.post(f"{self.base_url}/", content=json_encode(filters), headers=self.headers)
                 response.raise_for_status()
-                return response.json()
+                return decode_response(response, SearchResponse)
             except httpx.HTTPStatusError as e:
                 raise APIHTTPError(e.response.status_code, f"HTTP error: {e.response.text}")
             except httpx.RequestError as e:
@@ -298,31 +512,40 @@ class FileAPIClient:
     """Клиент для работы с файлами."""
     def __init__(self):
         self.base_url = f"{FILE_SERVICE_URL}/files"
+        self.breaker = get_circuit_breaker(self.base_url, "file")
         self.timeout = httpx.Timeout(10.0, connect=5.0)
 
-    @retry_api_call()
-    async def upload_file(self, filename: str, file_data: bytes, content_type: str, owner_id: int, file_type: str) -> Optional[Dict[str, Any]]:
-        """Обновление файлов."""
+    @retry_api_call(idempotent=True)
+    async def upload_file(
+        self, filename: str, file_data: Union[bytes, BinaryIO], content_type: str, owner_id: int, file_type: str,
+        idempotency_key: Optional[str] = None
+    ) -> Optional[UploadedFile]:
+        """Обновление файлов (file_data — байты или файл, который отправляется потоком)."""
+        if hasattr(file_data, "seek"):
+            file_data.seek(0)
         data = {"owner_telegram_id": owner_id, "file_type": file_type}
         files = {'file': (filename, file_data, content_type)}
-        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=self.timeout) as client:
+        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=effective_timeout(self.timeout)) as client:
             try:
-                response = await client.post(f"{self.base_url}/upload", data=data, files=files)
+                response = await client.post(
+                    f"{self.base_url}/upload", data=data, files=files, headers=idempotency_headers({}, idempotency_key)
+                )
                 response.raise_for_status()
-                return response.json()
+                return decode_response(response, UploadedFile)
             except httpx.HTTPStatusError as e:
                 raise APIHTTPError(e.response.status_code, f"HTTP error: {e.response.text}")
             except httpx.RequestError as e:
                 raise APINetworkError(f"Network error: {str(e)}")
 
+    @single_flight()
     @retry_api_call()
     async def get_download_url_by_file_id(self, file_id: UUID) -> Optional[str]:
         """Получение ссылки на файл."""
-        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=self.timeout) as client:
+        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=effective_timeout(self.timeout)) as client:
             try:
                 response = await client.get(f"{self.base_url}/{file_id}/download-url")
                 response.raise_for_status()
-                return response.json().get("download_url")
+                return decode_response(response, DownloadLink).download_url
             except httpx.HTTPStatusError as e:
                 raise APIHTTPError(e.response.status_code, f"HTTP error: {e.response.text}")
             except httpx.RequestError as e:
@@ -332,7 +555,7 @@ class FileAPIClient:
     async def delete_file(self, file_id: UUID, owner_telegram_id: int) -> bool:
         """Удаление файла."""
         params = {"owner_telegram_id": owner_telegram_id}
-        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=self.timeout) as client:
+        async with httpx.AsyncClient(http2=False, trust_env=False, timeout=effective_timeout(self.timeout)) as client:
             try:
                 response = await client.delete(f"{self.base_url}/{file_id}", params=params)
                 response.raise_for_status()
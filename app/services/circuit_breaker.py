@@ -0,0 +1,146 @@
+import time
+import logging
+from enum import Enum
+from typing import Dict, Any
+from app.core.config import (
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RECOVERY_TIMEOUT,
+    CIRCUIT_HALF_OPEN_MAX_CALLS,
+    RETRY_BUDGET_RATIO,
+    RETRY_BUDGET_MAX_TOKENS,
+)
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+class CircuitState(str, Enum):
+    """Состояния circuit breaker."""
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+class RetryBudget:
+    """Бюджет ретраев: каждый запрос пополняет бюджет на ratio, каждый ретрай тратит 1."""
+    def __init__(self, ratio: float, max_tokens: float):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+
+    def deposit(self) -> None:
+        """Пополнение бюджета при новом запросе."""
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Списание токена на ретрай. False, если бюджет исчерпан."""
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+class CircuitBreaker:
+    """Circuit breaker для одного сервиса (closed -> open -> half_open -> closed)."""
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        recovery_timeout: float = CIRCUIT_RECOVERY_TIMEOUT,
+        half_open_max_calls: int = CIRCUIT_HALF_OPEN_MAX_CALLS,
+        retry_budget: RetryBudget | None = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.retry_budget = retry_budget or RetryBudget(RETRY_BUDGET_RATIO, RETRY_BUDGET_MAX_TOKENS)
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        metrics.set_gauge(f"circuit.{self.name}.state", self.state.value)
+
+    def _transition(self, new_state: CircuitState) -> None:
+        if new_state == self.state:
+            return
+        logger.warning(f"Circuit '{self.name}': {self.state.value} -> {new_state.value}")
+        self.state = new_state
+        self._half_open_calls = 0
+        if new_state == CircuitState.OPEN:
+            self._opened_at = time.monotonic()
+        if new_state == CircuitState.CLOSED:
+            self._failures = 0
+        metrics.set_gauge(f"circuit.{self.name}.state", new_state.value)
+        metrics.inc(f"circuit.{self.name}.transitions.{new_state.value}")
+
+    def on_request(self) -> None:
+        """Регистрация нового логического запроса (пополняет бюджет ретраев)."""
+        self.retry_budget.deposit()
+        metrics.inc(f"circuit.{self.name}.requests")
+
+    def allow_request(self) -> bool:
+        """Можно ли выполнить попытку запроса прямо сейчас."""
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.recovery_timeout:
+                metrics.inc(f"circuit.{self.name}.rejected")
+                return False
+            self._transition(CircuitState.HALF_OPEN)
+        if self.state == CircuitState.HALF_OPEN:
+            if self._half_open_calls >= self.half_open_max_calls:
+                metrics.inc(f"circuit.{self.name}.rejected")
+                return False
+            self._half_open_calls += 1
+        return True
+
+    def allow_retry(self) -> bool:
+        """Можно ли повторить запрос: только в closed и при наличии бюджета."""
+        if self.state != CircuitState.CLOSED:
+            return False
+        if not self.retry_budget.withdraw():
+            metrics.inc(f"circuit.{self.name}.retries_denied")
+            return False
+        metrics.inc(f"circuit.{self.name}.retries")
+        return True
+
+    def record_success(self) -> None:
+        """Успешный ответ сервиса."""
+        if self.state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.CLOSED)
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        """Сбой сервиса (сеть, таймаут, 5xx)."""
+        metrics.inc(f"circuit.{self.name}.failures")
+        if self.state == CircuitState.HALF_OPEN:
+            self._transition(CircuitState.OPEN)
+            return
+        self._failures += 1
+        if self._failures >= self.failure_threshold:
+            self._transition(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """Освобождение пробного слота half_open без результата (например, при отмене)."""
+        if self.state == CircuitState.HALF_OPEN and self._half_open_calls > 0:
+            self._half_open_calls -= 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Текущее состояние для метрик."""
+        return {
+            "state": self.state.value,
+            "failures": self._failures,
+            "retry_tokens": round(self.retry_budget.tokens, 2),
+        }
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+def get_circuit_breaker(base_url: str, name: str) -> CircuitBreaker:
+    """Circuit breaker для base URL (один на сервис)."""
+    if base_url not in _breakers:
+        _breakers[base_url] = CircuitBreaker(name)
+    return _breakers[base_url]
+
+def circuit_breakers_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Состояние всех circuit breaker."""
+    return {breaker.name: breaker.snapshot() for breaker in _breakers.values()}
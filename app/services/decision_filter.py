@@ -0,0 +1,159 @@
+import asyncio
+import hashlib
+import logging
+import math
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Set
+from app.core.config import (
+    DECISION_FILTER_PATH, DECISION_FILTER_CAPACITY, DECISION_FILTER_ERROR_RATE,
+    DECISION_FILTER_RECENT_SIZE, DECISION_FILTER_FLUSH_DELAY,
+)
+from app.services.models import Model
+from app.utils.deadline import clear_deadline
+from app.utils.json_store import load_json, save_json
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+class BloomFilter:
+    """Фильтр Блума фиксированного размера (двойное хэширование blake2b)."""
+    def __init__(self, capacity: int, error_rate: float, bits: Optional[bytes] = None):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        nbytes = (self.size + 7) // 8
+        self.bits = bytearray(bits) if bits and len(bits) == nbytes else bytearray(nbytes)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, key: str) -> None:
+        for pos in self._positions(key):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(key))
+
+class DecidedCandidates(Model):
+    """Сохраненное состояние фильтра одного работодателя."""
+    blooms: List[bytes] = []
+    bloom: bytes = b""  # формат до появления цепочки фильтров: один фильтр
+    recent: List[str] = []
+    count: int = 0
+
+class _EmployerDecisions:
+    """Решения одного работодателя: точное множество последних id и цепочка фильтров Блума для остальных.
+
+    Когда последний фильтр заполнен до capacity, добавляется новый с вдвое
+    меньшей долей ложных срабатываний (суммарно не больше 2 * error_rate),
+    поэтому старые решения не забываются.
+    """
+    def __init__(self, capacity: int, error_rate: float, recent_size: int, state: Optional[DecidedCandidates] = None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        layers = (state.blooms or ([state.bloom] if state.bloom else [])) if state else []
+        self.blooms: List[BloomFilter] = [BloomFilter(capacity, self._layer_error_rate(i), bits) for i, bits in enumerate(layers)]
+        if not self.blooms:
+            self.blooms.append(BloomFilter(capacity, error_rate))
+        self.recent: Deque[str] = deque(state.recent if state else (), maxlen=recent_size)
+        self.recent_set: Set[str] = set(self.recent)
+        self.count = state.count if state else 0
+
+    def _layer_error_rate(self, layer: int) -> float:
+        return self.error_rate * 0.5 ** layer
+
+    def add(self, candidate_id: str) -> None:
+        if candidate_id in self.recent_set:
+            return
+        if len(self.recent) == self.recent.maxlen:
+            self.recent_set.discard(self.recent[0])
+        self.recent.append(candidate_id)
+        self.recent_set.add(candidate_id)
+        if self.count >= self.capacity:
+            self.blooms.append(BloomFilter(self.capacity, self._layer_error_rate(len(self.blooms))))
+            self.count = 0
+            metrics.inc("decision_filter.new_layer")
+        self.blooms[-1].add(candidate_id)
+        self.count += 1
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return candidate_id in self.recent_set or any(candidate_id in bloom for bloom in self.blooms)
+
+    def dump(self) -> DecidedCandidates:
+        return DecidedCandidates(blooms=[bytes(b.bits) for b in self.blooms], recent=list(self.recent), count=self.count)
+
+class DecisionFilter:
+    """Кандидаты, по которым работодатель уже принял решение (like/dislike).
+
+    Пополняется после успешного save_decision и применяется к результатам поиска
+    до загрузки профилей. Фильтры Блума допускают редкие ложные срабатывания
+    (порядка DECISION_FILTER_ERROR_RATE); последние решения хранятся точно.
+    Состояние сохраняется в JSON-файл с задержкой DECISION_FILTER_FLUSH_DELAY.
+    """
+    def __init__(
+        self,
+        path: Optional[str] = DECISION_FILTER_PATH,
+        capacity: int = DECISION_FILTER_CAPACITY,
+        error_rate: float = DECISION_FILTER_ERROR_RATE,
+        recent_size: int = DECISION_FILTER_RECENT_SIZE,
+        flush_delay: float = DECISION_FILTER_FLUSH_DELAY,
+    ):
+        self.path = path
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.recent_size = recent_size
+        self.flush_delay = flush_delay
+        self._employers: Dict[int, _EmployerDecisions] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+
+    def _new(self, state: Optional[DecidedCandidates] = None) -> _EmployerDecisions:
+        return _EmployerDecisions(self.capacity, self.error_rate, self.recent_size, state)
+
+    async def load(self) -> None:
+        states = await load_json(self.path, Dict[int, DecidedCandidates], {})
+        self._employers = {telegram_id: self._new(state) for telegram_id, state in states.items()}
+        logger.info(f"Loaded decision filters for {len(self._employers)} employers")
+
+    async def save(self) -> None:
+        async with self._save_lock:
+            await save_json(self.path, {telegram_id: d.dump() for telegram_id, d in self._employers.items()})
+
+    def record(self, employer_telegram_id: int, candidate_id: str) -> None:
+        """Учет решения работодателя по кандидату."""
+        decisions = self._employers.get(employer_telegram_id)
+        if decisions is None:
+            decisions = self._employers[employer_telegram_id] = self._new()
+        decisions.add(candidate_id)
+        self._schedule_flush()
+
+    def has(self, employer_telegram_id: int) -> bool:
+        """Есть ли у работодателя хотя бы одно решение."""
+        return employer_telegram_id in self._employers
+
+    def is_decided(self, employer_telegram_id: int, candidate_id: str) -> bool:
+        decisions = self._employers.get(employer_telegram_id)
+        return decisions is not None and candidate_id in decisions
+
+    def filter(self, employer_telegram_id: int, candidate_ids: Iterable[str]) -> List[str]:
+        """id кандидатов без тех, по которым уже есть решение (порядок сохраняется)."""
+        candidate_ids = list(candidate_ids)
+        decisions = self._employers.get(employer_telegram_id)
+        if decisions is None:
+            return candidate_ids
+        result = [candidate_id for candidate_id in candidate_ids if candidate_id not in decisions]
+        metrics.inc("decision_filter.skipped", len(candidate_ids) - len(result))
+        return result
+
+    def _schedule_flush(self) -> None:
+        if self.path and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        clear_deadline()
+        await asyncio.sleep(self.flush_delay)
+        await self.save()
+
+decision_filter = DecisionFilter()
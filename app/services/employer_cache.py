@@ -0,0 +1,109 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Set
+from app.core.config import EMPLOYER_CACHE_PATH, EMPLOYER_CACHE_REFRESH_AFTER, EMPLOYER_CACHE_FLUSH_DELAY
+from app.services.api_client import employer_api_client
+from app.services.models import Employer, Model
+from app.utils.deadline import clear_deadline
+from app.utils.json_store import load_json, save_json
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+class EmployerCacheEntry(Model):
+    """Запись кэша: профиль работодателя, username на момент получения и время обновления."""
+    employer: Employer
+    username: Optional[str] = None
+    refreshed_at: float = 0.0
+
+class EmployerIdentityCache:
+    """Постоянный кэш профилей работодателей по telegram_id.
+
+    Повторный поиск не вызывает get_or_create_employer: профиль берется из кэша,
+    а устаревшая запись обновляется в фоне. Смена username — промах кэша, чтобы
+    сервис работодателей получил новые контакты. Кэш сохраняется в JSON-файл
+    в фоне, не чаще раза в flush_delay секунд.
+    """
+    def __init__(
+        self,
+        path: Optional[str] = EMPLOYER_CACHE_PATH,
+        refresh_after: float = EMPLOYER_CACHE_REFRESH_AFTER,
+        flush_delay: float = EMPLOYER_CACHE_FLUSH_DELAY,
+    ):
+        self.path = path
+        self.refresh_after = refresh_after
+        self.flush_delay = flush_delay
+        self._entries: Dict[int, EmployerCacheEntry] = {}
+        self._refreshing: Set[int] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        """Загрузка кэша из файла (битый или отсутствующий файл — пустой кэш)."""
+        self._entries = await load_json(self.path, Dict[int, EmployerCacheEntry], {})
+        logger.info(f"Loaded {len(self._entries)} employer profiles")
+
+    async def save(self) -> None:
+        async with self._save_lock:
+            await save_json(self.path, self._entries)
+
+    def _store(self, telegram_id: int, username: Optional[str], employer: Employer) -> None:
+        self._entries[telegram_id] = EmployerCacheEntry(employer=employer, username=username, refreshed_at=time.time())
+        self._schedule_flush()
+
+    def get(self, telegram_id: int) -> Optional[Employer]:
+        """Профиль из кэша без обращения к сервису (None — пользователь еще не искал как работодатель)."""
+        entry = self._entries.get(telegram_id)
+        return entry.employer if entry is not None else None
+
+    async def get_or_create(self, telegram_id: int, username: Optional[str]) -> Optional[Employer]:
+        """Профиль работодателя: из кэша или через сервис работодателей."""
+        entry = self._entries.get(telegram_id)
+        if entry is not None and entry.username == username:
+            metrics.inc("employer_cache.hit")
+            if time.time() - entry.refreshed_at > self.refresh_after:
+                self._schedule_refresh(telegram_id, username)
+            return entry.employer
+        metrics.inc("employer_cache.miss")
+        employer = await employer_api_client.get_or_create_employer(telegram_id, username)
+        if employer:
+            self._store(telegram_id, username, employer)
+        return employer
+
+    def invalidate(self, telegram_id: int) -> None:
+        """Удаление записи (например, если сервис не знает такого работодателя)."""
+        if self._entries.pop(telegram_id, None) is not None:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self.path and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        clear_deadline()
+        await asyncio.sleep(self.flush_delay)
+        await self.save()
+
+    def _schedule_refresh(self, telegram_id: int, username: Optional[str]) -> None:
+        if telegram_id in self._refreshing:
+            return
+        self._refreshing.add(telegram_id)
+        task = asyncio.create_task(self._refresh(telegram_id, username))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _refresh(self, telegram_id: int, username: Optional[str]) -> None:
+        clear_deadline()
+        try:
+            employer = await employer_api_client.get_or_create_employer(telegram_id, username)
+            if employer:
+                self._store(telegram_id, username, employer)
+                metrics.inc("employer_cache.refreshed")
+        except Exception as e:
+            logger.warning(f"Background employer refresh failed for {telegram_id}: {e}")
+        finally:
+            self._refreshing.discard(telegram_id)
+
+employer_cache = EmployerIdentityCache()
@@ -0,0 +1,65 @@
+import asyncio
+import time
+import logging
+from typing import Any, Awaitable, Callable
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+MIN_SAMPLES = 20
+
+class RequestHedger:
+    """Хеджирование запросов: если первая попытка не ответила за перцентиль задержки,
+    отправляется вторая идентичная, используется первый успешный ответ."""
+    def __init__(self, name: str, percentile: float, min_delay: float, default_delay: float, enabled: bool = True):
+        self.name = name
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.default_delay = default_delay
+        self.enabled = enabled
+        self._latency_metric = f"hedge.{name}.latency"
+
+    def delay(self) -> float:
+        """Задержка перед хеджем по перцентилю наблюдаемых задержек."""
+        if metrics.samples(self._latency_metric) < MIN_SAMPLES:
+            return self.default_delay
+        return max(self.min_delay, metrics.percentile(self._latency_metric, self.percentile))
+
+    async def _timed(self, factory: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.monotonic()
+        result = await factory()
+        metrics.observe(self._latency_metric, time.monotonic() - started)
+        return result
+
+    async def run(self, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """Выполнение запроса с хеджированием."""
+        metrics.inc(f"hedge.{self.name}.requests")
+        if not self.enabled:
+            return await self._timed(factory)
+
+        primary = asyncio.ensure_future(self._timed(factory))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.delay())
+            if done:
+                return primary.result()
+
+            metrics.inc(f"hedge.{self.name}.fired")
+            hedge = asyncio.ensure_future(self._timed(factory))
+            tasks.add(hedge)
+            pending = set(tasks)
+            error: BaseException | None = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            metrics.inc(f"hedge.{self.name}.won")
+                        return task.result()
+                    error = task.exception()
+            logger.warning(f"Hedged request '{self.name}': both attempts failed")
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
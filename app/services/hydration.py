@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from typing import Iterable, List, Optional
+from app.core.config import PROFILE_CACHE_SIZE, PROFILE_CACHE_TTL, HYDRATION_CONCURRENCY
+from app.services.api_client import APICircuitOpenError, APIDeadlineExceeded, APIRequestError, candidate_api_client
+from app.services.models import Candidate
+from app.utils.cache import LRUCache
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+class ProfileHydrator:
+    """Получение профилей кандидатов по id: LRU-кэш и параллельная догрузка промахов."""
+    def __init__(self, maxsize: int = PROFILE_CACHE_SIZE, ttl: float = PROFILE_CACHE_TTL, concurrency: int = HYDRATION_CONCURRENCY):
+        self._cache: LRUCache[Candidate] = LRUCache(maxsize=maxsize, ttl=ttl)
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    def cached(self, candidate_id: str) -> Optional[Candidate]:
+        """Профиль из кэша без запроса к сервису."""
+        return self._cache.get(candidate_id)
+
+    def put(self, profile: Candidate) -> None:
+        self._cache.set(profile.id, profile)
+
+    async def get(self, candidate_id: str) -> Optional[Candidate]:
+        """Профиль кандидата (из кэша или из сервиса кандидатов)."""
+        profile = self._cache.get(candidate_id)
+        if profile is not None:
+            metrics.inc("hydration.cache_hit")
+            return profile
+        metrics.inc("hydration.cache_miss")
+        async with self._semaphore:
+            profile = await candidate_api_client.get_candidate(candidate_id)
+        if profile is not None:
+            self._cache.set(candidate_id, profile)
+        return profile
+
+    async def _get_safe(self, candidate_id: str) -> Optional[Candidate]:
+        try:
+            return await self.get(candidate_id)
+        except (APICircuitOpenError, APIDeadlineExceeded):
+            raise
+        except APIRequestError as e:
+            logger.warning(f"Failed to hydrate candidate {candidate_id}: {e}")
+            return None
+
+    async def hydrate(self, candidate_ids: Iterable[str]) -> List[Candidate]:
+        """Профили по списку id параллельно; порядок сохраняется, ненайденные пропускаются."""
+        with metrics.timer("hydration.batch"):
+            profiles = await asyncio.gather(*(self._get_safe(candidate_id) for candidate_id in candidate_ids))
+        return [profile for profile in profiles if profile is not None]
+
+profile_hydrator = ProfileHydrator()
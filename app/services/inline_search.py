@@ -0,0 +1,134 @@
+import asyncio
+import logging
+import re
+from typing import Any, Dict, List, Optional
+from app.core.config import INLINE_CACHE_SIZE, INLINE_CACHE_TTL, INLINE_DEBOUNCE, INLINE_RESULTS_LIMIT
+from app.services.api_client import SingleFlight, search_api_client
+from app.services.hydration import profile_hydrator
+from app.services.models import Candidate
+from app.services.ranking import candidate_ranker
+from app.services.skills import skill_index, skill_key
+from app.utils.cache import LRUCache
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_EXPERIENCE = re.compile(r"^(\d+(?:[.,]\d+)?)(?:(\+)|-(\d+(?:[.,]\d+)?))?$")
+
+def _number(text: str) -> float:
+    return float(text.replace(",", "."))
+
+def parse_inline_query(text: str) -> Optional[Dict[str, Any]]:
+    """Фильтры поиска из inline-запроса вида «python django 3+» (None, если запрос пустой).
+
+    Навыки распознаются только по точному совпадению с названием или синонимом
+    из словаря (включая двухсловные), «3+», «3-5» или «3» — опыт в годах,
+    остальные слова — должность. Без слов вне словаря должностью считаются сами навыки.
+    """
+    tokens = text.split()
+    skills: List[str] = []
+    role_words: List[str] = []
+    experience_min: Optional[float] = None
+    experience_max: Optional[float] = None
+    i = 0
+    while i < len(tokens):
+        token = tokens[i]
+        match = _EXPERIENCE.match(token)
+        if match and experience_min is None:
+            experience_min = _number(match.group(1))
+            experience_max = _number(match.group(3)) if match.group(3) else None
+            i += 1
+            continue
+        pair = skill_index.exact(f"{token} {tokens[i + 1]}") if i + 1 < len(tokens) else None
+        if pair:
+            skills.append(pair)
+            i += 2
+            continue
+        name = skill_index.exact(token)
+        if name:
+            skills.append(name)
+        else:
+            role_words.append(token)
+        i += 1
+    skills = skill_index.normalize_many(skills)
+    if not skills and not role_words:
+        return None
+    filters: Dict[str, Any] = {
+        "role": " ".join(role_words) or " ".join(skills),
+        "must_skills": [s.lower() for s in skills],
+    }
+    if experience_min is not None:
+        filters["experience_min"] = experience_min
+        filters["experience_max"] = experience_max
+    return filters
+
+def query_key(filters: Dict[str, Any]) -> str:
+    """Нормализованный ключ запроса: порядок навыков и регистр не важны."""
+    return "|".join((
+        skill_key(filters.get("role", "")),
+        ",".join(sorted(filters.get("must_skills", []))),
+        str(filters.get("experience_min")),
+        str(filters.get("experience_max")),
+    ))
+
+class InlineCandidateSearch:
+    """Поиск кандидатов для inline-режима: кэш по запросу, debounce и объединение запросов.
+
+    Inline-запросы приходят на каждое нажатие клавиши, поэтому перед обращением
+    к сервису поиска запрос пользователя выдерживается INLINE_DEBOUNCE секунд
+    и отбрасывается, если за это время пришел более новый. Одинаковые запросы
+    разных пользователей выполняются один раз и кэшируются на INLINE_CACHE_TTL.
+    """
+    def __init__(
+        self,
+        cache_size: int = INLINE_CACHE_SIZE,
+        cache_ttl: float = INLINE_CACHE_TTL,
+        debounce: float = INLINE_DEBOUNCE,
+        limit: int = INLINE_RESULTS_LIMIT,
+    ):
+        self.debounce_delay = debounce
+        self.limit = limit
+        self._cache: LRUCache[List[Candidate]] = LRUCache(maxsize=cache_size, ttl=cache_ttl)
+        self._flight = SingleFlight()
+        self._latest: Dict[int, int] = {}
+
+    def cached(self, filters: Dict[str, Any]) -> Optional[List[Candidate]]:
+        return self._cache.get(query_key(filters))
+
+    async def debounce(self, user_id: int) -> bool:
+        """Ожидание паузы в наборе; False, если пользователь уже отправил более новый запрос."""
+        seq = self._latest.get(user_id, 0) + 1
+        self._latest[user_id] = seq
+        await asyncio.sleep(self.debounce_delay)
+        if self._latest.get(user_id) != seq:
+            metrics.inc("inline.debounced")
+            return False
+        del self._latest[user_id]
+        return True
+
+    async def search(self, filters: Dict[str, Any]) -> List[Candidate]:
+        """Кандидаты по фильтрам (из кэша или через сервис поиска)."""
+        key = query_key(filters)
+        candidates = self._cache.get(key)
+        if candidates is not None:
+            metrics.inc("inline.cache_hit")
+            return candidates
+        metrics.inc("inline.cache_miss")
+        return await self._flight.do(key, lambda: self._fetch(key, filters))
+
+    async def _fetch(self, key: str, filters: Dict[str, Any]) -> List[Candidate]:
+        response = await search_api_client.search_candidates({**filters, "page": 1, "size": self.limit})
+        if not response or not response.results:
+            candidates: List[Candidate] = []
+        else:
+            candidates = await profile_hydrator.hydrate(hit.candidate_id for hit in response.results)
+            candidates = candidate_ranker.rank(
+                candidates,
+                must_skills=filters["must_skills"],
+                experience_min=filters.get("experience_min"),
+                experience_max=filters.get("experience_max"),
+            )
+        self._cache.set(key, candidates)
+        return candidates
+
+inline_candidate_search = InlineCandidateSearch()
@@ -0,0 +1,110 @@
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Type, TypeVar, Union
+import msgspec
+
+T = TypeVar("T")
+
+class Model(msgspec.Struct, kw_only=True, omit_defaults=True):
+    """Базовая модель ответа API (slots, без лишних полей)."""
+    pass
+
+class CandidateExperience(Model):
+    """Опыт работы кандидата."""
+    company: str = ""
+    position: str = ""
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    responsibilities: Optional[str] = None
+
+class CandidateSkill(Model):
+    """Навык кандидата."""
+    skill: str
+    kind: str = "hard"
+    level: int = 1
+
+class CandidateProject(Model):
+    """Проект кандидата."""
+    title: str = ""
+    description: Optional[str] = None
+    links: Optional[Dict[str, str]] = None
+
+class FileRef(Model):
+    """Ссылка на файл в файловом сервисе."""
+    file_id: str
+
+class Candidate(Model):
+    """Профиль кандидата."""
+    id: str
+    telegram_id: Optional[int] = None
+    display_name: Optional[str] = None
+    headline_role: Optional[str] = None
+    location: Optional[str] = None
+    work_modes: List[str] = []
+    experience_years: Optional[Union[int, float]] = None
+    experiences: List[CandidateExperience] = []
+    skills: List[CandidateSkill] = []
+    projects: List[CandidateProject] = []
+    contacts: Optional[Dict[str, Optional[str]]] = None
+    contacts_visibility: Optional[str] = None
+    avatar_file_id: Optional[str] = None
+    avatars: List[FileRef] = []
+    resumes: List[FileRef] = []
+    has_resume: bool = False
+    updated_at: Optional[datetime] = None
+
+class Employer(Model):
+    """Профиль работодателя."""
+    id: str
+    telegram_id: Optional[int] = None
+    contacts: Optional[Dict[str, Optional[str]]] = None
+
+class SearchSession(Model):
+    """Сессия поиска работодателя."""
+    id: str
+
+class SearchHit(Model):
+    """Результат поиска."""
+    candidate_id: str
+    score: Optional[float] = None
+
+class SearchResponse(Model):
+    """Ответ сервиса поиска."""
+    results: List[SearchHit] = []
+    total: Optional[int] = None
+
+class ContactsResponse(Model):
+    """Ответ на запрос контактов."""
+    granted: bool = False
+    contacts: Optional[Dict[str, Optional[str]]] = None
+
+class UploadedFile(Model):
+    """Загруженный файл."""
+    id: str
+
+class DownloadLink(Model):
+    """Ссылка на скачивание файла."""
+    download_url: Optional[str] = None
+
+_encoder = msgspec.json.Encoder()
+_decoders: Dict[Any, msgspec.json.Decoder] = {}
+
+def json_encode(obj: Any) -> bytes:
+    """Кодирование в JSON (даты, модели и словари — без промежуточных копий)."""
+    return _encoder.encode(obj)
+
+def json_decode(data: bytes, type: Type[T]) -> T:
+    """Декодирование JSON сразу в типизированную модель."""
+    decoder = _decoders.get(type)
+    if decoder is None:
+        decoder = _decoders[type] = msgspec.json.Decoder(type)
+    return decoder.decode(data)
+
+def state_dump(obj: Any) -> Any:
+    """Модель -> встроенные типы для хранения в данных FSM (хранилище может сериализовать их в JSON)."""
+    return msgspec.to_builtins(obj)
+
+def state_load(data: Any, type: Type[T]) -> Optional[T]:
+    """Модель из данных FSM, сохраненных через state_dump (None, если данных нет)."""
+    if data is None:
+        return None
+    return msgspec.convert(data, type)
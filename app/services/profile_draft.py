@@ -0,0 +1,83 @@
+import logging
+from typing import Any, Dict, Mapping, Optional, Tuple
+import msgspec
+from app.services.models import Candidate
+
+logger = logging.getLogger(__name__)
+
+PROFILE_FIELDS: Tuple[str, ...] = (
+    'display_name', 'headline_role', 'location', 'work_modes',
+    'experiences', 'skills', 'projects', 'contacts', 'contacts_visibility',
+)
+EDIT_BLOCK_FIELDS: Dict[str, str] = {
+    'new_experiences': 'experiences',
+    'new_skills': 'skills',
+    'new_projects': 'projects',
+}
+_FIELD_TYPES: Dict[str, Any] = {f.name: f.type for f in msgspec.structs.fields(Candidate)}
+
+def _same_value(field: str, base: Candidate, value: Any) -> bool:
+    """Значение из FSM совпадает с полем профиля (сравнение через модели)."""
+    try:
+        converted = msgspec.convert(msgspec.to_builtins(value), _FIELD_TYPES[field], strict=False)
+    except (msgspec.ValidationError, TypeError):
+        return False
+    return converted == getattr(base, field)
+
+class ProfileDraft:
+    """Черновик изменений профиля кандидата.
+
+    Хранит только явно измененные поля профиля (без служебных ключей FSM) и
+    строит минимальный PATCH относительно последнего известного профиля.
+    """
+    def __init__(self, base: Optional[Candidate] = None):
+        self.base = base
+        self._dirty: Dict[str, Any] = {}
+
+    def set(self, field: str, value: Any) -> None:
+        """Изменение поля профиля."""
+        if field not in PROFILE_FIELDS:
+            raise KeyError(f"Unknown profile field: {field}")
+        self._dirty[field] = value
+
+    @property
+    def dirty_fields(self) -> Tuple[str, ...]:
+        return tuple(self._dirty)
+
+    def patch(self) -> Dict[str, Any]:
+        """Поля, значения которых отличаются от базового профиля."""
+        if self.base is None:
+            return dict(self._dirty)
+        return {field: value for field, value in self._dirty.items() if not _same_value(field, self.base, value)}
+
+    @classmethod
+    def from_state(cls, data: Mapping[str, Any], mode: str, base: Optional[Candidate] = None) -> "ProfileDraft":
+        """Черновик из данных FSM: при регистрации — все заполненные поля, при редактировании — редактируемые."""
+        draft = cls(base)
+        if mode == 'edit':
+            field = data.get('field_to_edit')
+            if field in PROFILE_FIELDS and field in data:
+                draft.set(field, data[field])
+            for key, field in EDIT_BLOCK_FIELDS.items():
+                if key in data:
+                    draft.set(field, data[key])
+        else:
+            for field in PROFILE_FIELDS:
+                if data.get(field) is not None:
+                    draft.set(field, data[field])
+        return draft
+
+def apply_patch(profile: Candidate, patch: Mapping[str, Any]) -> Optional[Candidate]:
+    """Локальное применение PATCH к профилю (версия сбрасывается, карточка перерисуется).
+
+    None, если значение из PATCH не приводится к модели: профиль нужно загрузить заново.
+    """
+    try:
+        changes = {
+            field: msgspec.convert(msgspec.to_builtins(value), _FIELD_TYPES[field], strict=False)
+            for field, value in patch.items()
+        }
+    except (msgspec.ValidationError, TypeError) as e:
+        logger.warning(f"Cannot apply patch {list(patch)} to profile {profile.id} locally: {e}")
+        return None
+    return msgspec.structs.replace(profile, **changes, updated_at=None)
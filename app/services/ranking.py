@@ -0,0 +1,120 @@
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+import numpy as np
+from app.core.config import RERANK_MUST_WEIGHT, RERANK_NICE_WEIGHT, RERANK_EXPERIENCE_WEIGHT, RERANK_EXPERIENCE_TOLERANCE
+from app.services.models import Candidate
+from app.services.skills import skill_index, skill_key
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+MAX_SKILL_LEVEL = 5
+UNKNOWN_EXPERIENCE_FIT = 0.5
+
+@lru_cache(maxsize=4096)
+def _normalized_key(skill: str, version: int) -> str:
+    return skill_key(skill_index.normalize(skill))
+
+def _skill_key(skill: str) -> str:
+    """Ключ навыка после нормализации по словарю (синонимы сводятся к одному названию).
+
+    Кэш привязан к версии словаря, поэтому ключи, посчитанные до skill_index.load(), не используются.
+    """
+    return _normalized_key(skill, skill_index.version)
+
+class SkillVocabulary:
+    """Словарь навыков запроса: навык -> номер столбца в матрице уровней."""
+    def __init__(self, skills: Iterable[str]):
+        self.index: Dict[str, int] = {}
+        for skill in skills:
+            key = _skill_key(skill)
+            if key and key not in self.index:
+                self.index[key] = len(self.index)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def columns(self, skills: Iterable[str]) -> np.ndarray:
+        return np.fromiter({self.index[k] for k in map(_skill_key, skills) if k in self.index}, dtype=np.intp)
+
+    def encode(self, candidates: Sequence[Candidate]) -> np.ndarray:
+        """Матрица уровней (кандидаты x навыки) в долях от максимального уровня."""
+        levels = np.zeros((len(candidates), len(self.index)), dtype=np.float32)
+        for row, candidate in enumerate(candidates):
+            for skill in candidate.skills:
+                col = self.index.get(_skill_key(skill.skill))
+                if col is not None:
+                    levels[row, col] = max(levels[row, col], min(skill.level, MAX_SKILL_LEVEL) / MAX_SKILL_LEVEL)
+        return levels
+
+class CandidateRanker:
+    """Переранжирование окна найденных кандидатов по фильтрам работодателя.
+
+    Оценка — взвешенная сумма покрытия обязательных и желательных навыков
+    (с учетом уровня навыка кандидата) и соответствия опыта диапазону.
+    При равной оценке сохраняется порядок сервиса поиска.
+    """
+    def __init__(
+        self,
+        must_weight: float = RERANK_MUST_WEIGHT,
+        nice_weight: float = RERANK_NICE_WEIGHT,
+        experience_weight: float = RERANK_EXPERIENCE_WEIGHT,
+        experience_tolerance: float = RERANK_EXPERIENCE_TOLERANCE,
+    ):
+        self.must_weight = must_weight
+        self.nice_weight = nice_weight
+        self.experience_weight = experience_weight
+        self.experience_tolerance = experience_tolerance
+
+    @staticmethod
+    def _coverage(levels: np.ndarray, columns: np.ndarray) -> np.ndarray:
+        if not len(columns):
+            return np.zeros(levels.shape[0], dtype=np.float32)
+        return levels[:, columns].mean(axis=1)
+
+    def _experience_fit(self, years: np.ndarray, exp_min: Optional[float], exp_max: Optional[float]) -> np.ndarray:
+        """1 внутри диапазона, линейное убывание до 0 на расстоянии experience_tolerance лет."""
+        low = -np.inf if exp_min is None else exp_min
+        high = np.inf if exp_max is None else exp_max
+        distance = np.maximum(low - years, 0) + np.maximum(years - high, 0)
+        fit = np.clip(1 - distance / self.experience_tolerance, 0, 1)
+        return np.where(np.isnan(years), UNKNOWN_EXPERIENCE_FIT, fit)
+
+    def score(
+        self,
+        candidates: Sequence[Candidate],
+        must_skills: Iterable[str] = (),
+        nice_skills: Iterable[str] = (),
+        experience_min: Optional[float] = None,
+        experience_max: Optional[float] = None,
+    ) -> np.ndarray:
+        must_skills, nice_skills = list(must_skills or ()), list(nice_skills or ())
+        vocabulary = SkillVocabulary(must_skills + nice_skills)
+        levels = vocabulary.encode(candidates)
+        years = np.array(
+            [np.nan if c.experience_years is None else c.experience_years for c in candidates], dtype=np.float32
+        )
+        return (
+            self.must_weight * self._coverage(levels, vocabulary.columns(must_skills))
+            + self.nice_weight * self._coverage(levels, vocabulary.columns(nice_skills))
+            + self.experience_weight * self._experience_fit(years, experience_min, experience_max)
+        )
+
+    def rank(
+        self,
+        candidates: Sequence[Candidate],
+        must_skills: Iterable[str] = (),
+        nice_skills: Iterable[str] = (),
+        experience_min: Optional[float] = None,
+        experience_max: Optional[float] = None,
+    ) -> List[Candidate]:
+        """Кандидаты в порядке убывания оценки."""
+        if len(candidates) < 2:
+            return list(candidates)
+        scores = self.score(candidates, must_skills, nice_skills, experience_min, experience_max)
+        order = np.argsort(-scores, kind="stable")
+        metrics.inc("rerank.moved", int(np.count_nonzero(order != np.arange(len(order)))))
+        return [candidates[i] for i in order]
+
+candidate_ranker = CandidateRanker()
@@ -0,0 +1,272 @@
+import asyncio
+import hashlib
+import logging
+import random
+import time
+import uuid
+from array import array
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+from aiogram import Bot
+from aiogram.exceptions import TelegramForbiddenError
+from app.core.config import (
+    SAVED_SEARCHES_PATH, SAVED_SEARCH_INTERVAL, SAVED_SEARCH_JITTER, SAVED_SEARCH_CONCURRENCY,
+    SAVED_SEARCH_TICK, SAVED_SEARCH_PAGE_SIZE, SAVED_SEARCH_SEEN_LIMIT, SAVED_SEARCH_MAX_PER_OWNER,
+    SAVED_SEARCH_FLUSH_DELAY,
+)
+from app.core.messages import Messages
+from app.services.api_client import mark_background, search_api_client
+from app.services.decision_filter import decision_filter
+from app.services.hydration import profile_hydrator
+from app.services.models import Model
+from app.utils.cache import LRUCache
+from app.utils.deadline import clear_deadline
+from app.utils.json_store import load_json, save_json
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FILTER_KEYS = ("role", "must_skills", "nice_skills", "experience_min", "experience_max", "location_query")
+NOTIFY_MAX_CANDIDATES = 5
+LAST_FILTERS_CACHE_SIZE = 4096
+
+def search_filters(data: Mapping[str, Any]) -> Dict[str, Any]:
+    """Фильтры поиска из данных FSM (без служебных ключей)."""
+    return {key: data[key] for key in SEARCH_FILTER_KEYS if data.get(key) is not None}
+
+class SeenSet:
+    """Компактное множество просмотренных кандидатов: 64-битные хэши id в порядке добавления.
+
+    Хранится как упакованный массив (8 байт на кандидата); при переполнении
+    вытесняются самые старые записи.
+    """
+    def __init__(self, packed: bytes = b"", maxsize: int = SAVED_SEARCH_SEEN_LIMIT):
+        self.maxsize = maxsize
+        hashes = array("Q")
+        hashes.frombytes(packed)
+        self._hashes: Dict[int, None] = dict.fromkeys(hashes)
+
+    @staticmethod
+    def _hash(candidate_id: str) -> int:
+        return int.from_bytes(hashlib.blake2b(candidate_id.encode(), digest_size=8).digest(), "little")
+
+    def __contains__(self, candidate_id: str) -> bool:
+        return self._hash(candidate_id) in self._hashes
+
+    def __len__(self) -> int:
+        return len(self._hashes)
+
+    def add(self, candidate_id: str) -> bool:
+        """Добавление id; True, если кандидат раньше не встречался."""
+        key = self._hash(candidate_id)
+        if key in self._hashes:
+            return False
+        self._hashes[key] = None
+        while len(self._hashes) > self.maxsize:
+            del self._hashes[next(iter(self._hashes))]
+        return True
+
+    def pack(self) -> bytes:
+        return array("Q", self._hashes).tobytes()
+
+class SavedSearch(Model):
+    """Сохраненный поиск работодателя."""
+    id: str
+    owner_telegram_id: int
+    title: str
+    filters: Dict[str, Any]
+    seen: bytes = b""
+    created_at: float = 0.0
+    last_run_at: Optional[float] = None
+
+class SavedSearchLimitError(Exception):
+    """Превышено число сохраненных поисков у владельца."""
+    pass
+
+class SavedSearchStore:
+    """Хранилище сохраненных поисков (в памяти, с сохранением в JSON-файл).
+
+    Добавление и удаление поиска сохраняются сразу; изменения после фоновых
+    запусков (seen-set, время запуска) — не чаще раза в flush_delay секунд.
+    """
+    def __init__(
+        self,
+        path: Optional[str] = SAVED_SEARCHES_PATH,
+        max_per_owner: int = SAVED_SEARCH_MAX_PER_OWNER,
+        flush_delay: float = SAVED_SEARCH_FLUSH_DELAY,
+    ):
+        self.path = path
+        self.max_per_owner = max_per_owner
+        self.flush_delay = flush_delay
+        self._searches: Dict[str, SavedSearch] = {}
+        self._last_filters: LRUCache[Dict[str, Any]] = LRUCache(maxsize=LAST_FILTERS_CACHE_SIZE)
+        self._flush_task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        self._searches = await load_json(self.path, Dict[str, SavedSearch], {})
+        logger.info(f"Loaded {len(self._searches)} saved searches")
+
+    async def save(self) -> None:
+        async with self._save_lock:
+            await save_json(self.path, self._searches)
+
+    def remember_filters(self, owner_telegram_id: int, filters: Mapping[str, Any]) -> None:
+        """Запоминание фильтров последнего запущенного поиска (данные FSM очищаются по его окончании)."""
+        self._last_filters.set(owner_telegram_id, search_filters(filters))
+
+    def last_filters(self, owner_telegram_id: int) -> Dict[str, Any]:
+        return dict(self._last_filters.get(owner_telegram_id) or {})
+
+    def all(self) -> List[SavedSearch]:
+        return list(self._searches.values())
+
+    def get(self, search_id: str) -> Optional[SavedSearch]:
+        return self._searches.get(search_id)
+
+    def list_for(self, owner_telegram_id: int) -> List[SavedSearch]:
+        """Поиски владельца в порядке создания."""
+        return sorted((s for s in self._searches.values() if s.owner_telegram_id == owner_telegram_id), key=lambda s: s.created_at)
+
+    async def add(self, owner_telegram_id: int, title: str, filters: Dict[str, Any]) -> SavedSearch:
+        if len(self.list_for(owner_telegram_id)) >= self.max_per_owner:
+            raise SavedSearchLimitError(f"Saved search limit reached for {owner_telegram_id}")
+        search = SavedSearch(
+            id=uuid.uuid4().hex[:12], owner_telegram_id=owner_telegram_id,
+            title=title, filters=filters, created_at=time.time(),
+        )
+        self._searches[search.id] = search
+        await self.save()
+        return search
+
+    async def remove(self, search_id: str, owner_telegram_id: Optional[int] = None) -> bool:
+        """Удаление поиска (если задан владелец — только его поиска)."""
+        search = self._searches.get(search_id)
+        if search is None or (owner_telegram_id is not None and search.owner_telegram_id != owner_telegram_id):
+            return False
+        del self._searches[search_id]
+        await self.save()
+        return True
+
+    def mark_dirty(self) -> None:
+        """Поиски изменились на месте: сохранение в фоне, не чаще раза в flush_delay секунд."""
+        if self.path and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        clear_deadline()
+        await asyncio.sleep(self.flush_delay)
+        await self.save()
+
+class SavedSearchScheduler:
+    """Периодический перезапуск сохраненных поисков с уведомлением о новых кандидатах.
+
+    Время следующего запуска каждого поиска случайно смещается (jitter), а число
+    одновременных запросов к сервису поиска ограничено семафором, чтобы тысячи
+    поисков не приходили в сервис одновременно.
+    """
+    def __init__(
+        self,
+        store: SavedSearchStore,
+        interval: float = SAVED_SEARCH_INTERVAL,
+        jitter: float = SAVED_SEARCH_JITTER,
+        concurrency: int = SAVED_SEARCH_CONCURRENCY,
+        tick: float = SAVED_SEARCH_TICK,
+    ):
+        self.store = store
+        self.interval = interval
+        self.jitter = jitter
+        self.tick = tick
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._next_run: Dict[str, float] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def _next_delay(self, first: bool = False) -> float:
+        if first:
+            # После рестарта запуски равномерно распределяются по интервалу.
+            return random.uniform(0, self.interval)
+        return self.interval * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def start(self, bot: Bot) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._loop(bot))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _due(self, now: float) -> List[SavedSearch]:
+        searches = self.store.all()
+        alive = {s.id for s in searches}
+        for search_id in list(self._next_run):
+            if search_id not in alive:
+                del self._next_run[search_id]
+        due = []
+        for search in searches:
+            next_run = self._next_run.setdefault(search.id, now + self._next_delay(first=True))
+            if next_run <= now:
+                self._next_run[search.id] = now + self._next_delay()
+                due.append(search)
+        return due
+
+    async def _loop(self, bot: Bot) -> None:
+        clear_deadline()
+        mark_background()
+        while True:
+            try:
+                due = self._due(time.monotonic())
+                if due:
+                    metrics.inc("saved_search.runs", len(due))
+                    await asyncio.gather(*(self._run_limited(bot, search) for search in due))
+                    self.store.mark_dirty()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Saved search scheduler error: {e}", exc_info=True)
+            await asyncio.sleep(self.tick)
+
+    async def _run_limited(self, bot: Bot, search: SavedSearch) -> None:
+        async with self._semaphore:
+            try:
+                await self.run_once(bot, search)
+            except TelegramForbiddenError:
+                logger.info(f"Owner of saved search {search.id} blocked the bot, removing it")
+                await self.store.remove(search.id)
+            except Exception as e:
+                metrics.inc("saved_search.errors")
+                logger.warning(f"Saved search {search.id} failed: {e}")
+
+    async def run_once(self, bot: Optional[Bot], search: SavedSearch) -> List[str]:
+        """Один запуск поиска: новые id кандидатов (первый запуск только заполняет seen-set)."""
+        response = await search_api_client.search_candidates({**search.filters, "page": 1, "size": SAVED_SEARCH_PAGE_SIZE})
+        seen = SeenSet(search.seen)
+        new_ids = [hit.candidate_id for hit in (response.results if response else []) if seen.add(hit.candidate_id)]
+        new_ids = decision_filter.filter(search.owner_telegram_id, new_ids)
+        first_run = search.last_run_at is None
+        search.seen = seen.pack()
+        search.last_run_at = time.time()
+        if new_ids and not first_run and bot is not None:
+            metrics.inc("saved_search.alerts")
+            await self._notify(bot, search, new_ids)
+        return new_ids
+
+    async def _notify(self, bot: Bot, search: SavedSearch, candidate_ids: Iterable[str]) -> None:
+        candidate_ids = list(candidate_ids)
+        profiles = await profile_hydrator.hydrate(candidate_ids[:NOTIFY_MAX_CANDIDATES])
+        lines = [
+            f"• <b>{p.display_name or 'Имя не указано'}</b> — {p.headline_role or 'должность не указана'}"
+            for p in profiles
+        ]
+        if len(candidate_ids) > len(profiles):
+            lines.append(Messages.SavedSearch.MORE_CANDIDATES.format(count=len(candidate_ids) - len(profiles)))
+        await bot.send_message(
+            search.owner_telegram_id,
+            Messages.SavedSearch.NEW_CANDIDATES.format(title=search.title, candidates="\n".join(lines)),
+        )
+
+saved_search_store = SavedSearchStore()
+saved_search_scheduler = SavedSearchScheduler(saved_search_store)
@@ -0,0 +1,57 @@
+import asyncio
+import logging
+from typing import Dict, List, Optional
+from app.core.config import SHORTLIST_PATH, SHORTLIST_MAX_SIZE, SHORTLIST_FLUSH_DELAY
+from app.utils.deadline import clear_deadline
+from app.utils.json_store import load_json, save_json
+
+logger = logging.getLogger(__name__)
+
+class ShortlistStore:
+    """Понравившиеся кандидаты работодателей (в памяти, с сохранением в JSON-файл).
+
+    Список пополняется после успешного save_decision с решением like;
+    последние добавленные кандидаты идут первыми. Файл перезаписывается в фоне,
+    не чаще раза в flush_delay секунд.
+    """
+    def __init__(
+        self,
+        path: Optional[str] = SHORTLIST_PATH,
+        max_size: int = SHORTLIST_MAX_SIZE,
+        flush_delay: float = SHORTLIST_FLUSH_DELAY,
+    ):
+        self.path = path
+        self.max_size = max_size
+        self.flush_delay = flush_delay
+        self._lists: Dict[int, List[str]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        self._lists = await load_json(self.path, Dict[int, List[str]], {})
+        logger.info(f"Loaded shortlists for {len(self._lists)} employers")
+
+    async def save(self) -> None:
+        async with self._save_lock:
+            await save_json(self.path, self._lists)
+
+    def get(self, employer_telegram_id: int) -> List[str]:
+        return self._lists.get(employer_telegram_id, [])
+
+    def add(self, employer_telegram_id: int, candidate_id: str) -> None:
+        """Добавление кандидата в начало списка (повторный like поднимает его наверх)."""
+        candidate_ids = [c for c in self.get(employer_telegram_id) if c != candidate_id]
+        candidate_ids.insert(0, candidate_id)
+        self._lists[employer_telegram_id] = candidate_ids[:self.max_size]
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self.path and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        clear_deadline()
+        await asyncio.sleep(self.flush_delay)
+        await self.save()
+
+shortlist_store = ShortlistStore()
@@ -0,0 +1,141 @@
+import logging
+import os
+import re
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+from app.core.config import SKILLS_DATA_PATH
+from app.services.models import Model
+from app.utils.json_store import load_json
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SUGGEST_LIMIT = 5
+_SPACES = re.compile(r"\s+")
+
+class SkillEntry(Model):
+    """Навык словаря: каноническое название и синонимы."""
+    name: str
+    aliases: List[str] = []
+
+def skill_key(text: str) -> str:
+    """Ключ поиска: нижний регистр, без лишних пробелов."""
+    return _SPACES.sub(" ", text.strip().lower())
+
+def _max_distance(key: str) -> int:
+    """Допустимое число опечаток: короткие названия (до 4 символов) сравниваются только точно."""
+    if len(key) <= 4:
+        return 0
+    return 1 if len(key) <= 7 else 2
+
+def _bounded_distance(a: str, b: str, limit: int) -> Optional[int]:
+    """Расстояние Дамерау-Левенштейна (перестановка соседних букв — одна правка), если оно не больше limit."""
+    if abs(len(a) - len(b)) > limit:
+        return None
+    before: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before[j - 2] + 1)
+            current.append(cost)
+        if min(current) > limit:
+            return None
+        before, previous = previous, current
+    return previous[-1] if previous[-1] <= limit else None
+
+class SkillIndex:
+    """Словарь навыков в памяти: нормализация, синонимы, опечатки и автодополнение.
+
+    Названия и синонимы хранятся отсортированным массивом ключей (префиксный
+    поиск через bisect); для опечаток ключи сгруппированы по длине, а расстояние
+    Дамерау-Левенштейна считается с отсечением по порогу. Автоматически
+    принимаются только точные совпадения и синонимы: вариант с опечаткой
+    показывается пользователю как подсказка.
+    """
+    def __init__(self, entries: Iterable[SkillEntry] = ()):
+        self.names: List[str] = []
+        self.version = 0
+        self._canonical: Dict[str, str] = {}
+        self._keys: List[str] = []
+        self._by_length: Dict[int, List[str]] = {}
+        self._build(entries)
+
+    def _build(self, entries: Iterable[SkillEntry]) -> None:
+        names: List[str] = []
+        canonical: Dict[str, str] = {}
+        for entry in entries:
+            names.append(entry.name)
+            for text in (entry.name, *entry.aliases):
+                canonical.setdefault(skill_key(text), entry.name)
+        by_length: Dict[int, List[str]] = {}
+        for key in canonical:
+            by_length.setdefault(len(key), []).append(key)
+        self.names, self._canonical, self._keys, self._by_length = names, canonical, sorted(canonical), by_length
+        # Номер версии словаря: кэши нормализованных ключей сбрасываются после перезагрузки.
+        self.version += 1
+
+    async def load(self, path: Optional[str] = SKILLS_DATA_PATH) -> None:
+        """Загрузка словаря из JSON-файла (список SkillEntry)."""
+        if path and not os.path.exists(path):
+            logger.warning(f"Skills data file {path} not found, skill index is empty")
+        self._build(await load_json(path, List[SkillEntry], []))
+        logger.info(f"Loaded {len(self.names)} skills ({len(self._keys)} names and aliases)")
+
+    def exact(self, text: str) -> Optional[str]:
+        """Каноническое название только при точном совпадении с названием или синонимом."""
+        return self._canonical.get(skill_key(text))
+
+    def fuzzy(self, text: str) -> Optional[str]:
+        """Ближайшее название с опечаткой (та же первая буква, ограниченное расстояние) — только как подсказка."""
+        key = skill_key(text)
+        limit = _max_distance(key)
+        if not limit or key in self._canonical:
+            return None
+        best: Optional[str] = None
+        best_distance = limit + 1
+        for length in range(len(key) - limit, len(key) + limit + 1):
+            for candidate in self._by_length.get(length, ()):
+                if candidate[0] != key[0]:
+                    continue
+                distance = _bounded_distance(key, candidate, best_distance - 1)
+                if distance is not None and distance < best_distance:
+                    best, best_distance = candidate, distance
+        if best is None:
+            return None
+        metrics.inc("skills.fuzzy_suggestion")
+        return self._canonical[best]
+
+    def normalize(self, text: str) -> str:
+        """Каноническое название при точном совпадении или синониме, иначе исходный текст без лишних пробелов."""
+        return self.exact(text) or _SPACES.sub(" ", text.strip())
+
+    def normalize_many(self, texts: Iterable[str]) -> List[str]:
+        """Нормализация списка навыков без пустых значений и повторов (порядок сохраняется)."""
+        result: Dict[str, str] = {}
+        for text in texts:
+            name = self.normalize(text)
+            if name:
+                result.setdefault(skill_key(name), name)
+        return list(result.values())
+
+    def suggest(self, prefix: str, limit: int = SUGGEST_LIMIT) -> List[str]:
+        """Автодополнение: канонические названия по префиксу названия или синонима, иначе вариант с опечаткой."""
+        key = skill_key(prefix)
+        if not key:
+            return []
+        suggestions: Dict[str, None] = {}
+        for i in range(bisect_left(self._keys, key), len(self._keys)):
+            candidate = self._keys[i]
+            if not candidate.startswith(key) or len(suggestions) >= limit:
+                break
+            suggestions[self._canonical[candidate]] = None
+        if not suggestions:
+            fuzzy = self.fuzzy(key)
+            if fuzzy:
+                suggestions[fuzzy] = None
+        return list(suggestions)
+
+skill_index = SkillIndex()
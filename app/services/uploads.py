@@ -0,0 +1,210 @@
+import asyncio
+import hashlib
+import logging
+from contextlib import asynccontextmanager
+from tempfile import SpooledTemporaryFile
+from typing import AsyncIterator, BinaryIO, List, Optional, Tuple
+from aiogram import Bot
+from aiogram.types import File
+from app.core.config import (
+    UPLOAD_MAX_CONCURRENT,
+    UPLOAD_MAX_BYTES_IN_FLIGHT,
+    UPLOAD_SPOOL_THRESHOLD,
+    FILE_HASH_INDEX_PATH,
+    FILE_HASH_INDEX_SIZE,
+    FILE_HASH_INDEX_FLUSH_DELAY,
+)
+from app.services.models import Model
+from app.utils.cache import LRUCache
+from app.utils.deadline import clear_deadline
+from app.utils.json_store import load_json, save_json
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+class _HashingWriter:
+    """Обертка над буфером, считающая sha256 по мере записи чанков."""
+    def __init__(self, buffer: BinaryIO):
+        self.buffer = buffer
+        self.hasher = hashlib.sha256()
+
+    def write(self, chunk: bytes) -> int:
+        self.hasher.update(chunk)
+        return self.buffer.write(chunk)
+
+    def flush(self) -> None:
+        self.buffer.flush()
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self.buffer.seek(offset, whence)
+
+class SpooledBuffer:
+    """Буфер скачанного файла для отправки в httpx и Pillow.
+
+    Наружу не отдается fileno(): httpx вызывает его для определения длины тела,
+    и SpooledTemporaryFile при этом сбрасывается на диск даже для маленьких
+    файлов. Без fileno() длина определяется через seek/tell, и файл до
+    spool_threshold остается в памяти.
+    """
+    def __init__(self, buffer: SpooledTemporaryFile):
+        self._buffer = buffer
+
+    @property
+    def rolled(self) -> bool:
+        """Файл сброшен на диск."""
+        return self._buffer._rolled
+
+    def read(self, size: int = -1) -> bytes:
+        return self._buffer.read(size)
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        return self._buffer.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._buffer.tell()
+
+    def close(self) -> None:
+        self._buffer.close()
+
+    def __enter__(self) -> "SpooledBuffer":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+class FileHashEntry(Model):
+    """Запись индекса хэшей: текущий файл владельца и sha256 его содержимого."""
+    owner_id: int
+    file_type: str
+    digest: str
+    file_id: str
+
+class FileHashIndex:
+    """Хэши содержимого текущих файлов владельцев: (владелец, тип) -> (sha256, file_id).
+
+    Индекс сохраняется в JSON-файл в фоне, не чаще раза в flush_delay секунд,
+    чтобы повторная загрузка того же файла после рестарта тоже не уходила в сервис файлов.
+    """
+    def __init__(
+        self,
+        path: Optional[str] = FILE_HASH_INDEX_PATH,
+        maxsize: int = FILE_HASH_INDEX_SIZE,
+        flush_delay: float = FILE_HASH_INDEX_FLUSH_DELAY,
+    ):
+        self.path = path
+        self.flush_delay = flush_delay
+        self._index: LRUCache[Tuple[str, str]] = LRUCache(maxsize=maxsize)
+        self._flush_task: Optional[asyncio.Task] = None
+        self._save_lock = asyncio.Lock()
+
+    async def load(self) -> None:
+        """Загрузка индекса из файла (битый или отсутствующий файл — пустой индекс)."""
+        entries = await load_json(self.path, List[FileHashEntry], [])
+        self._index.clear()
+        for entry in entries:
+            self._index.set((entry.owner_id, entry.file_type), (entry.digest, entry.file_id))
+        logger.info(f"Loaded {len(self._index)} file hashes")
+
+    async def save(self) -> None:
+        entries = [
+            FileHashEntry(owner_id=owner_id, file_type=file_type, digest=digest, file_id=file_id)
+            for (owner_id, file_type), (digest, file_id) in self._index.items()
+        ]
+        async with self._save_lock:
+            await save_json(self.path, entries)
+
+    def is_current(self, owner_id: int, file_type: str, digest: str, current_file_id: Optional[str]) -> bool:
+        """Файл с таким содержимым уже загружен и все еще привязан к профилю."""
+        if not current_file_id:
+            return False
+        return self._index.get((owner_id, file_type)) == (digest, str(current_file_id))
+
+    def remember(self, owner_id: int, file_type: str, digest: str, file_id: str) -> None:
+        self._index.set((owner_id, file_type), (digest, str(file_id)))
+        self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        if self.path and (self._flush_task is None or self._flush_task.done()):
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        clear_deadline()
+        await asyncio.sleep(self.flush_delay)
+        await self.save()
+
+class UploadManager:
+    """Ограничение ресурсов на загрузку файлов пользователей.
+
+    Одновременно обрабатывается не больше max_concurrent файлов и не больше
+    max_bytes_in_flight байт суммарно; файлы больше spool_threshold буферизуются
+    на диске (SpooledTemporaryFile), а не в памяти.
+    """
+    def __init__(
+        self,
+        max_concurrent: int = UPLOAD_MAX_CONCURRENT,
+        max_bytes_in_flight: int = UPLOAD_MAX_BYTES_IN_FLIGHT,
+        spool_threshold: int = UPLOAD_SPOOL_THRESHOLD,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_bytes_in_flight = max_bytes_in_flight
+        self.spool_threshold = spool_threshold
+        self._active = 0
+        self._bytes_in_flight = 0
+        self._released = asyncio.Condition()
+
+    def _reserve_size(self, size: Optional[int]) -> int:
+        # Файл больше лимита все равно должен пройти, но только в одиночку.
+        return min(size or self.spool_threshold, self.max_bytes_in_flight)
+
+    def _can_start(self, reserved: int) -> bool:
+        return self._active < self.max_concurrent and self._bytes_in_flight + reserved <= self.max_bytes_in_flight
+
+    def would_wait(self, size: Optional[int]) -> bool:
+        """Загрузка файла такого размера встанет в очередь."""
+        return not self._can_start(self._reserve_size(size))
+
+    @asynccontextmanager
+    async def slot(self, size: Optional[int]) -> AsyncIterator[None]:
+        """Слот на обработку файла (ожидает, пока освободятся лимиты)."""
+        reserved = self._reserve_size(size)
+        async with self._released:
+            if not self._can_start(reserved):
+                metrics.inc("uploads.queued")
+                with metrics.timer("uploads.queue_wait"):
+                    await self._released.wait_for(lambda: self._can_start(reserved))
+            self._active += 1
+            self._bytes_in_flight += reserved
+            metrics.set_gauge("uploads.active", self._active)
+            metrics.set_gauge("uploads.bytes_in_flight", self._bytes_in_flight)
+        try:
+            yield
+        finally:
+            async with self._released:
+                self._active -= 1
+                self._bytes_in_flight -= reserved
+                metrics.set_gauge("uploads.active", self._active)
+                metrics.set_gauge("uploads.bytes_in_flight", self._bytes_in_flight)
+                self._released.notify_all()
+
+    async def download(self, bot: Bot, file_id: str) -> Tuple[File, SpooledBuffer, str]:
+        """Скачивание файла из Telegram по частям в буфер (в памяти до spool_threshold).
+
+        Возвращает описание файла, буфер и sha256 содержимого, посчитанный при скачивании.
+        """
+        file_info = await bot.get_file(file_id)
+        buffer = SpooledTemporaryFile(max_size=self.spool_threshold)
+        writer = _HashingWriter(buffer)
+        try:
+            await bot.download_file(file_info.file_path, destination=writer, chunk_size=DOWNLOAD_CHUNK_SIZE)
+        except BaseException:
+            buffer.close()
+            raise
+        if (file_info.file_size or 0) > self.spool_threshold:
+            metrics.inc("uploads.spooled_to_disk")
+        buffer.seek(0)
+        return file_info, SpooledBuffer(buffer), writer.hasher.hexdigest()
+
+upload_manager = UploadManager()
+file_hash_index = FileHashIndex()
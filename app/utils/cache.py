@@ -0,0 +1,55 @@
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, List, Optional, Tuple, TypeVar
+
+V = TypeVar("V")
+
+class LRUCache(Generic[V]):
+    """LRU-кэш с ограниченным размером и опциональным TTL записей."""
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple[float, V]]" = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Получение значения (просроченные записи удаляются)."""
+        item = self._data.get(key)
+        if item is None:
+            return default
+        stored_at, value = item
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: V) -> None:
+        """Сохранение значения с вытеснением самых старых записей."""
+        self._data[key] = (time.monotonic(), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Удаление записи."""
+        item = self._data.pop(key, None)
+        return default if item is None else item[1]
+
+    def items(self) -> List[Tuple[Hashable, V]]:
+        """Непросроченные записи от самой старой к самой свежей."""
+        now = time.monotonic()
+        return [
+            (key, value) for key, (stored_at, value) in self._data.items()
+            if self.ttl is None or now - stored_at <= self.ttl
+        ]
+
+    def clear(self) -> None:
+        """Очистка кэша."""
+        self._data.clear()
+
+    def __contains__(self, key: Hashable) -> bool:
+        sentinel = object()
+        return self.get(key, sentinel) is not sentinel
+
+    def __len__(self) -> int:
+        return len(self._data)
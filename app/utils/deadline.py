@@ -0,0 +1,29 @@
+import time
+from contextvars import ContextVar, Token
+from typing import Optional
+
+_deadline: ContextVar[Optional[float]] = ContextVar("update_deadline", default=None)
+
+def set_deadline(seconds: float) -> Token:
+    """Установка дедлайна обработки текущего апдейта (через seconds секунд)."""
+    return _deadline.set(time.monotonic() + seconds)
+
+def reset_deadline(token: Token) -> None:
+    """Восстановление предыдущего дедлайна."""
+    _deadline.reset(token)
+
+def clear_deadline() -> None:
+    """Снятие дедлайна (для фоновых задач, переживающих апдейт)."""
+    _deadline.set(None)
+
+def time_left() -> Optional[float]:
+    """Сколько секунд осталось до дедлайна (None, если дедлайна нет)."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+def deadline_exceeded() -> bool:
+    """Истек ли дедлайн текущего апдейта."""
+    left = time_left()
+    return left is not None and left <= 0
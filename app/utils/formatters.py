@@ -1,68 +1,139 @@
-from typing import Dict, Any
-
-def format_candidate_profile(profile: Dict[str, Any]) -> str:
-    """Форматирование профиля для отображения."""
-    text = (
-        f"<b>👤 {profile.get('display_name', 'Имя не указано')}</b>\n"
-        f"<i>{profile.get('headline_role', 'Должность не указана')}</i>\n\n"
-        f"<b>📍 Локация:</b> {profile.get('location', 'Не указана')}\n"
-        f"<b>💻 Форматы работы:</b> {', '.join(profile.get('work_modes') or ['Не указаны'])}\n"
-    )
-
-    experiences = profile.get('experiences', [])
-    if experiences:
-        total_exp = profile.get('experience_years', 0)
-        text += f"<b>📈 Общий опыт:</b> ~{total_exp} лет\n\n"
-        text += "<b>💼 Опыт работы:</b>\n"
-        for exp in experiences[:3]:
-            end_date = (exp.get('end_date') or 'н.в.').replace('-', '.')
-            start_date = (exp.get('start_date') or '').replace('-', '.')
-            if exp.get('responsibilities'):
-                text += f" <i>{exp.get('responsibilities')[:200]}</i>\n"
-            text += (
-                f"  • <b>{exp.get('position', 'Не указана')}</b> в {exp.get('company', 'Не указана')}\n"
-                f"    <i>({start_date} - {end_date})</i>\n"
-            )
-    else:
-        text += f"<b>📈 Опыт:</b> {profile.get('experience_years', 'Не указан')} лет\n"
-
-    skills = profile.get('skills', [])
-    if skills:
-        hard_skills = [
-            f"{s['skill']} ({s['level']}/5)"
-            for s in skills if s['kind'] == 'hard'
-        ]
-        tools = [
-            f"{s['skill']} ({s['level']}/5)"
-            for s in skills if s['kind'] == 'tool'
-        ]
-        languages = [
-            f"{s['skill']} ({s['level']}/5)"
-            for s in skills if s['kind'] == 'language'
+import re
+from datetime import date
+from typing import Dict, List, Optional, Tuple
+from app.services.models import Candidate, json_encode
+from app.utils.cache import LRUCache
+
+CAPTION_LIMIT = 1024
+TEXT_LIMIT = 4096
+TRUNCATED_SUFFIX = "\n…"
+_TAG = re.compile(r"<(/?)([a-zA-Z]+)[^>]*>")
+
+SKILL_GROUPS: Tuple[Tuple[str, str], ...] = (
+    ('hard', 'Hard Skills'),
+    ('tool', 'Инструменты'),
+    ('language', 'Языки'),
+)
+
+def _format_date(value: Optional[date], default: str = '') -> str:
+    """Форматирование даты в вид YYYY.MM.DD."""
+    return value.strftime('%Y.%m.%d') if value else default
+
+def _close_tags(html: str) -> str:
+    """Закрывающие теги для тегов, оставшихся открытыми в обрезанном HTML."""
+    stack: List[str] = []
+    for match in _TAG.finditer(html):
+        name = match.group(2).lower()
+        if not match.group(1):
+            stack.append(name)
+        elif name in stack:
+            del stack[len(stack) - 1 - stack[::-1].index(name):]
+    return "".join(f"</{name}>" for name in reversed(stack))
+
+def _safe_prefix(html: str) -> str:
+    """Префикс без оборванного тега или HTML-сущности в конце."""
+    tag_start = html.rfind("<")
+    if tag_start > html.rfind(">"):
+        html = html[:tag_start]
+    entity_start = html.rfind("&")
+    if entity_start > html.rfind(";"):
+        html = html[:entity_start]
+    return html
+
+def fit_text(text: str, limit: int) -> str:
+    """Обрезка HTML-текста под лимит Telegram по границе строки с закрытием оборванных тегов.
+
+    Пользовательский текст внутри тега может содержать переносы строк, поэтому
+    граница строки не гарантирует, что все теги закрыты.
+    """
+    if len(text) <= limit:
+        return text
+    available = limit - len(TRUNCATED_SUFFIX)
+    cut = text.rfind("\n", 0, available)
+    if cut <= 0:
+        cut = available
+    while cut > 0:
+        head = _safe_prefix(text[:cut])
+        closing = _close_tags(head)
+        overflow = len(head) + len(closing) - available
+        if overflow <= 0:
+            return head + closing + TRUNCATED_SUFFIX
+        cut = len(head) - overflow
+    return TRUNCATED_SUFFIX.lstrip()
+
+class ProfileCardRenderer:
+    """Рендер карточки кандидата с мемоизацией по id и версии профиля."""
+    def __init__(self, maxsize: int = 2048):
+        self._cache: LRUCache[str] = LRUCache(maxsize=maxsize)
+
+    @staticmethod
+    def version(profile: Candidate) -> str:
+        """Версия профиля: updated_at, если сервис его отдает, иначе хэш содержимого."""
+        if profile.updated_at:
+            return profile.updated_at.isoformat()
+        return str(hash(json_encode(profile)))
+
+    def render(self, profile: Candidate, limit: Optional[int] = None) -> str:
+        """Карточка профиля (из кэша, если профиль не менялся)."""
+        key = (profile.id, self.version(profile))
+        text = self._cache.get(key)
+        if text is None:
+            text = self._build(profile)
+            self._cache.set(key, text)
+        return fit_text(text, limit) if limit else text
+
+    @staticmethod
+    def _build(profile: Candidate) -> str:
+        parts: List[str] = [
+            f"<b>👤 {profile.display_name or 'Имя не указано'}</b>\n"
+            f"<i>{profile.headline_role or 'Должность не указана'}</i>\n\n"
+            f"<b>📍 Локация:</b> {profile.location or 'Не указана'}\n"
+            f"<b>💻 Форматы работы:</b> {', '.join(profile.work_modes or ['Не указаны'])}\n"
         ]
-        skills_text = "\n<b>🛠 Ключевые навыки и инструменты:</b>\n"
-        if hard_skills:
-            skills_text += f" • <b>Hard Skills:</b> {', '.join(hard_skills)}\n"
-        if tools:
-            skills_text += f" • <b>Инструменты:</b> {', '.join(tools)}\n"
-        if languages:
-            skills_text += f" • <b>Языки:</b> {', '.join(languages)}\n"
-        text += skills_text
-    else:
-        text += "\n<b>🛠 Навыки:</b> Не указаны\n"
-
-    projects = profile.get('projects', [])
-    if projects:
-        text += "\n<b>🚀 Проекты:</b>\n"
-        for p in projects[:3]:
-            text += f"  • <b>{p.get('title', 'Без названия')}</b>\n"
-            if p.get('description'):
-                text += f" <i>{p.get('description')[:200]}...</i>\n"
-            if p.get('links') and p['links'].get('main_link'):
-                text += f" (<a href='{p['links']['main_link']}'>Ссылка</a>)\n"
-            else:
-                text += "\n"
-    else:
-        text += "\n<b>🚀 Проекты:</b> Не указаны\n"
-
-    return text
\ No newline at end of file
+        add = parts.append
+
+        if profile.experiences:
+            add(f"<b>📈 Общий опыт:</b> ~{profile.experience_years or 0:g} лет\n\n")
+            add("<b>💼 Опыт работы:</b>\n")
+            for exp in profile.experiences[:3]:
+                if exp.responsibilities:
+                    add(f" <i>{exp.responsibilities[:200]}</i>\n")
+                add(
+                    f"  • <b>{exp.position or 'Не указана'}</b> в {exp.company or 'Не указана'}\n"
+                    f"    <i>({_format_date(exp.start_date)} - {_format_date(exp.end_date, 'н.в.')})</i>\n"
+                )
+        else:
+            experience_years = f"{profile.experience_years:g}" if profile.experience_years is not None else 'Не указан'
+            add(f"<b>📈 Опыт:</b> {experience_years} лет\n")
+
+        if profile.skills:
+            groups: Dict[str, List[str]] = {}
+            for s in profile.skills:
+                groups.setdefault(s.kind, []).append(f"{s.skill} ({s.level}/5)")
+            add("\n<b>🛠 Ключевые навыки и инструменты:</b>\n")
+            for kind, title in SKILL_GROUPS:
+                if kind in groups:
+                    add(f" • <b>{title}:</b> {', '.join(groups[kind])}\n")
+        else:
+            add("\n<b>🛠 Навыки:</b> Не указаны\n")
+
+        if profile.projects:
+            add("\n<b>🚀 Проекты:</b>\n")
+            for p in profile.projects[:3]:
+                add(f"  • <b>{p.title or 'Без названия'}</b>\n")
+                if p.description:
+                    add(f" <i>{p.description[:200]}...</i>\n")
+                if p.links and p.links.get('main_link'):
+                    add(f" (<a href='{p.links['main_link']}'>Ссылка</a>)\n")
+                else:
+                    add("\n")
+        else:
+            add("\n<b>🚀 Проекты:</b> Не указаны\n")
+
+        return "".join(parts)
+
+profile_renderer = ProfileCardRenderer()
+
+def format_candidate_profile(profile: Candidate, limit: Optional[int] = None) -> str:
+    """Форматирование профиля для отображения (с учетом лимита длины Telegram)."""
+    return profile_renderer.render(profile, limit=limit)
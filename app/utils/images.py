@@ -0,0 +1,57 @@
+import asyncio
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Optional, Sequence
+from aiogram.types import PhotoSize
+from PIL import Image, ImageOps
+from app.core.config import AVATAR_MAX_SIDE, AVATAR_JPEG_QUALITY
+from app.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="image")
+
+def pick_photo_size(sizes: Sequence[PhotoSize], max_side: int = AVATAR_MAX_SIDE) -> PhotoSize:
+    """Наименьший из размеров Telegram, не меньше целевого (иначе — наибольший)."""
+    for size in sorted(sizes, key=lambda s: max(s.width, s.height)):
+        if max(size.width, size.height) >= max_side:
+            return size
+    return sizes[-1]
+
+def downscale_image(source: BinaryIO, max_side: int = AVATAR_MAX_SIDE, quality: int = AVATAR_JPEG_QUALITY) -> Optional[bytes]:
+    """Уменьшение изображения до max_side по большей стороне и пережатие в JPEG.
+
+    Возвращает None, если изображение уже достаточно маленькое, пережатие не дает
+    выигрыша или Pillow не смог его обработать (тогда загружается оригинал).
+    """
+    source.seek(0, io.SEEK_END)
+    original_size = source.tell()
+    source.seek(0)
+    try:
+        with Image.open(source) as image:
+            if max(image.size) <= max_side and image.format == "JPEG":
+                return None
+            image = ImageOps.exif_transpose(image)
+            image.thumbnail((max_side, max_side), Image.LANCZOS)
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            output = io.BytesIO()
+            image.save(output, format="JPEG", quality=quality, optimize=True)
+    except (OSError, Image.DecompressionBombError) as e:
+        logger.warning(f"Avatar downscale skipped, uploading original: {e}")
+        metrics.inc("images.avatar_downscale_failed")
+        return None
+    finally:
+        source.seek(0)
+    if output.tell() >= original_size:
+        return None
+    return output.getvalue()
+
+async def prepare_avatar(source: BinaryIO) -> Optional[bytes]:
+    """Подготовка аватара к загрузке в пуле потоков (не блокирует event loop)."""
+    loop = asyncio.get_running_loop()
+    with metrics.timer("images.avatar_prepare"):
+        result = await loop.run_in_executor(_executor, downscale_image, source)
+    metrics.inc("images.avatar_downscaled" if result is not None else "images.avatar_kept")
+    return result
@@ -0,0 +1,34 @@
+import logging
+import os
+from typing import Any, Optional, Type, TypeVar
+import aiofiles
+import msgspec
+from app.services.models import json_decode, json_encode
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+async def load_json(path: Optional[str], type: Type[T], default: T) -> T:
+    """Чтение JSON-файла в модель (нет файла или он битый — default)."""
+    if not path or not os.path.exists(path):
+        return default
+    try:
+        async with aiofiles.open(path, "rb") as f:
+            raw = await f.read()
+        return json_decode(raw, type)
+    except (OSError, msgspec.DecodeError) as e:
+        logger.warning(f"Failed to load {path}: {e}")
+        return default
+
+async def save_json(path: Optional[str], obj: Any) -> None:
+    """Атомарная запись объекта в JSON-файл (через временный файл и os.replace)."""
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    try:
+        async with aiofiles.open(tmp_path, "wb") as f:
+            await f.write(json_encode(obj))
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.warning(f"Failed to save {path}: {e}")
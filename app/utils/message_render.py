@@ -0,0 +1,135 @@
+import hashlib
+from typing import TYPE_CHECKING, Optional
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramBadRequest
+from aiogram.methods import (
+    DeleteMessage, DeleteMessages, EditMessageCaption, EditMessageMedia, EditMessageReplyMarkup, EditMessageText,
+    Response, TelegramMethod,
+)
+from aiogram.methods.base import TelegramType
+from aiogram.types import InlineKeyboardMarkup, InputMediaPhoto, Message
+from app.utils.cache import LRUCache
+from app.utils.metrics import metrics
+
+if TYPE_CHECKING:
+    from aiogram import Bot
+
+NOT_MODIFIED_ERROR = "message is not modified"
+
+def is_not_modified_error(error: Exception) -> bool:
+    """Ошибка Telegram "message is not modified" (содержимое не изменилось)."""
+    return isinstance(error, TelegramBadRequest) and NOT_MODIFIED_ERROR in error.message
+
+class RenderedMessages:
+    """Хэши последнего отрисованного содержимого по (чат, сообщение)."""
+    def __init__(self, maxsize: int = 10000):
+        self._hashes: LRUCache[str] = LRUCache(maxsize=maxsize)
+
+    @staticmethod
+    def digest(text: str, reply_markup: Optional[InlineKeyboardMarkup] = None, photo_key: Optional[str] = None) -> str:
+        """Хэш содержимого: текст, клавиатура и ключ фото (file_id, а не временная ссылка)."""
+        markup = reply_markup.model_dump_json(exclude_none=True) if reply_markup else ""
+        raw = f"{photo_key or ''}\x00{text}\x00{markup}".encode()
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def is_current(self, message: Message, digest: str) -> bool:
+        """На экране уже это содержимое."""
+        return self._hashes.get((message.chat.id, message.message_id)) == digest
+
+    def remember(self, message: Message, digest: str) -> None:
+        self._hashes.set((message.chat.id, message.message_id), digest)
+
+    def forget(self, message: Message) -> None:
+        self.forget_id(message.chat.id, message.message_id)
+
+    def forget_id(self, chat_id: int, message_id: int) -> None:
+        self._hashes.pop((chat_id, message_id))
+
+rendered_messages = RenderedMessages()
+
+_EDIT_METHODS = (EditMessageText, EditMessageCaption, EditMessageMedia, EditMessageReplyMarkup, DeleteMessage)
+
+class RenderedMessagesMiddleware(BaseRequestMiddleware):
+    """Сброс сохраненного хэша при любом редактировании или удалении сообщения.
+
+    Регистрируется на сессии бота, поэтому видит все изменения сообщений, а не
+    только сделанные через render_card: после edit_text/edit_reply_markup в
+    обработчиках следующий render_card не пропустит нужное редактирование.
+    render_card запоминает новый хэш уже после своего запроса.
+    """
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: "Bot",
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        try:
+            return await make_request(bot, method)
+        finally:
+            if isinstance(method, _EDIT_METHODS) and isinstance(method.chat_id, int) and method.message_id is not None:
+                rendered_messages.forget_id(method.chat_id, method.message_id)
+            elif isinstance(method, DeleteMessages) and isinstance(method.chat_id, int):
+                for message_id in method.message_ids:
+                    rendered_messages.forget_id(method.chat_id, message_id)
+
+async def render_card(
+    message: Message,
+    text: str,
+    reply_markup: Optional[InlineKeyboardMarkup] = None,
+    photo: Optional[str] = None,
+    photo_key: Optional[str] = None,
+    edit: bool = True,
+) -> Message:
+    """Показ карточки: редактирование сообщения (edit=True) или отправка нового.
+
+    Если на экране уже то же содержимое, запрос к Bot API не выполняется;
+    ответ "message is not modified" считается успешным редактированием.
+    Возвращает сообщение, в котором отображается карточка.
+    """
+    digest = rendered_messages.digest(text, reply_markup, (photo_key or photo) if photo else None)
+    if not edit:
+        if photo:
+            sent = await message.answer_photo(photo=photo, caption=text, reply_markup=reply_markup)
+        else:
+            sent = await message.answer(text=text, reply_markup=reply_markup)
+        rendered_messages.remember(sent, digest)
+        return sent
+
+    if rendered_messages.is_current(message, digest):
+        metrics.inc("telegram.edit.skipped")
+        return message
+
+    sent = message
+    try:
+        if photo and message.photo:
+            await message.edit_media(media=InputMediaPhoto(media=photo, caption=text), reply_markup=reply_markup)
+        elif photo:
+            await message.delete()
+            rendered_messages.forget(message)
+            sent = await message.answer_photo(photo=photo, caption=text, reply_markup=reply_markup)
+        elif message.photo:
+            await message.delete()
+            rendered_messages.forget(message)
+            sent = await message.answer(text=text, reply_markup=reply_markup)
+        else:
+            await message.edit_text(text=text, reply_markup=reply_markup)
+    except TelegramBadRequest as e:
+        if not is_not_modified_error(e):
+            raise
+        metrics.inc("telegram.edit.not_modified")
+    rendered_messages.remember(sent, digest)
+    return sent
+
+class ProgressMessage:
+    """Сообщение о ходе долгой операции: отправляется один раз, затем редактируется."""
+    def __init__(self, anchor: Message):
+        self.anchor = anchor
+        self.message: Optional[Message] = None
+
+    async def update(self, text: str, reply_markup: Optional[InlineKeyboardMarkup] = None) -> Message:
+        """Показать новый статус (или итог операции)."""
+        if self.message is None:
+            self.message = await render_card(self.anchor, text, reply_markup, edit=False)
+        else:
+            self.message = await render_card(self.message, text, reply_markup)
+        return self.message
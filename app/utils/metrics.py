@@ -0,0 +1,61 @@
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Deque, Dict, Iterator
+
+class Metrics:
+    """Простой реестр метрик в памяти процесса (счетчики, gauge, тайминги)."""
+    def __init__(self, window: int = 1000):
+        self._counters: Dict[str, float] = defaultdict(float)
+        self._gauges: Dict[str, Any] = {}
+        self._timings: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=window))
+
+    def inc(self, name: str, value: float = 1) -> None:
+        """Увеличение счетчика."""
+        self._counters[name] += value
+
+    def set_gauge(self, name: str, value: Any) -> None:
+        """Установка текущего значения gauge."""
+        self._gauges[name] = value
+
+    def observe(self, name: str, value: float) -> None:
+        """Запись наблюдения (например, длительности в секундах)."""
+        self._timings[name].append(value)
+
+    @contextmanager
+    def timer(self, name: str) -> Iterator[None]:
+        """Замер длительности блока кода."""
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.observe(name, time.monotonic() - started)
+
+    def samples(self, name: str) -> int:
+        """Количество наблюдений в окне."""
+        return len(self._timings.get(name) or ())
+
+    def percentile(self, name: str, percentile: float) -> float | None:
+        """Перцентиль по последним наблюдениям."""
+        values = sorted(self._timings.get(name) or ())
+        if not values:
+            return None
+        index = min(len(values) - 1, int(len(values) * percentile / 100))
+        return values[index]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Снимок всех метрик."""
+        return {
+            "counters": dict(self._counters),
+            "gauges": dict(self._gauges),
+            "timings": {
+                name: {
+                    "count": len(values),
+                    "p50": self.percentile(name, 50),
+                    "p95": self.percentile(name, 95),
+                }
+                for name, values in self._timings.items()
+            },
+        }
+
+metrics = Metrics()
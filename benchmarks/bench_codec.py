@@ -0,0 +1,114 @@
+"""Бенчмарк: json + dict против msgspec-моделей для ответов API.
+
+Запуск: python -m benchmarks.bench_codec из корня репозитория или python benchmarks/bench_codec.py.
+"""
+import json
+import sys
+import timeit
+import tracemalloc
+from datetime import date
+from pathlib import Path
+from typing import Any, Callable, List
+
+# При запуске файлом в sys.path попадает только benchmarks/, а не корень репозитория.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.models import Candidate, json_decode, json_encode
+
+N_PROFILES = 1000
+ROUNDS = 2000
+
+def make_profile(i: int) -> dict:
+    """Типичный профиль кандидата, как его возвращает сервис кандидатов."""
+    return {
+        "id": f"7f1c2a4e-0000-4000-8000-{i:012d}",
+        "telegram_id": 100000 + i,
+        "display_name": "Иванов Иван Иванович",
+        "headline_role": "Python Developer",
+        "location": "Москва",
+        "work_modes": ["remote", "hybrid"],
+        "experience_years": 5.5,
+        "experiences": [
+            {
+                "company": f"Company {j}",
+                "position": "Backend Engineer",
+                "start_date": "2019-01-01",
+                "end_date": None if j == 0 else "2021-06-30",
+                "responsibilities": "Разработка API, ревью кода, менторинг " * 3,
+            }
+            for j in range(3)
+        ],
+        "skills": [
+            {"skill": name, "kind": kind, "level": 4}
+            for name, kind in [
+                ("python", "hard"), ("django", "hard"), ("postgresql", "hard"),
+                ("docker", "tool"), ("git", "tool"), ("english", "language"),
+            ]
+        ],
+        "projects": [
+            {"title": "Telegram Bot", "description": "Чат-бот для HR", "links": {"main_link": "https://github.com/x/y"}},
+        ],
+        "contacts": {"telegram": "@ivanov", "email": "ivanov@example.com"},
+        "contacts_visibility": "on_request",
+        "avatar_file_id": "0b8a9d8e-1111-4000-8000-000000000000",
+        "resumes": [{"file_id": "0b8a9d8e-2222-4000-8000-000000000000"}],
+        "has_resume": True,
+    }
+
+def legacy_serialize_dates(obj: Any) -> Any:
+    """Прежняя рекурсивная сериализация дат (копирует весь payload)."""
+    if isinstance(obj, date):
+        return obj.isoformat()
+    elif isinstance(obj, dict):
+        return {key: legacy_serialize_dates(value) for key, value in obj.items()}
+    elif isinstance(obj, list):
+        return [legacy_serialize_dates(item) for item in obj]
+    return obj
+
+def bench(name: str, func: Callable[[], Any], number: int = ROUNDS) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {name:<40} {seconds * 1e6:9.2f} us/op")
+    return seconds
+
+def retained_memory(build: Callable[[], List[Any]]) -> int:
+    tracemalloc.start()
+    objects = build()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size
+
+def main() -> None:
+    raw = json.dumps(make_profile(1)).encode()
+    raws = [json.dumps(make_profile(i)).encode() for i in range(N_PROFILES)]
+
+    print("Decode one profile:")
+    old = bench("json.loads -> dict", lambda: json.loads(raw))
+    new = bench("msgspec -> Candidate", lambda: json_decode(raw, Candidate))
+    print(f"  speedup: x{old / new:.1f}")
+
+    print("Walk skills (3 kinds, as in the formatter):")
+    as_dict = json.loads(raw)
+    as_model = json_decode(raw, Candidate)
+    old = bench("dict.get()", lambda: [[s['skill'] for s in as_dict.get('skills', []) if s['kind'] == k] for k in ('hard', 'tool', 'language')])
+    new = bench("attributes", lambda: [[s.skill for s in as_model.skills if s.kind == k] for k in ('hard', 'tool', 'language')])
+    print(f"  speedup: x{old / new:.1f}")
+
+    payload = make_profile(1)
+    payload["experiences"] = [
+        {**exp, "start_date": date(2019, 1, 1), "end_date": date(2021, 6, 30)} for exp in payload["experiences"]
+    ]
+    print("Encode PATCH payload with dates:")
+    old = bench("serialize_dates + json.dumps", lambda: json.dumps(legacy_serialize_dates(payload)).encode())
+    new = bench("msgspec json_encode", lambda: json_encode(payload))
+    print(f"  speedup: x{old / new:.1f}")
+
+    print(f"Retained memory for {N_PROFILES} profiles:")
+    old_size = retained_memory(lambda: [json.loads(r) for r in raws])
+    new_size = retained_memory(lambda: [json_decode(r, Candidate) for r in raws])
+    print(f"  dict:      {old_size / N_PROFILES:9.0f} B/profile")
+    print(f"  Candidate: {new_size / N_PROFILES:9.0f} B/profile")
+    print(f"  ratio: x{old_size / new_size:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Бенчмарк: прежний format_candidate_profile против ProfileCardRenderer.
+
+Запуск: python -m benchmarks.bench_renderer из корня репозитория или python benchmarks/bench_renderer.py.
+"""
+import json
+import sys
+import timeit
+from pathlib import Path
+
+# При запуске файлом в sys.path попадает только benchmarks/, а не корень репозитория.
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.models import Candidate, json_decode
+from app.utils.formatters import ProfileCardRenderer, _format_date
+from benchmarks.bench_codec import make_profile
+
+ROUNDS = 2000
+
+def legacy_format_candidate_profile(profile: Candidate) -> str:
+    """Прежняя реализация: конкатенация строк и три прохода по навыкам."""
+    text = (
+        f"<b>👤 {profile.display_name or 'Имя не указано'}</b>\n"
+        f"<i>{profile.headline_role or 'Должность не указана'}</i>\n\n"
+        f"<b>📍 Локация:</b> {profile.location or 'Не указана'}\n"
+        f"<b>💻 Форматы работы:</b> {', '.join(profile.work_modes or ['Не указаны'])}\n"
+    )
+    experiences = profile.experiences
+    if experiences:
+        text += f"<b>📈 Общий опыт:</b> ~{profile.experience_years or 0} лет\n\n"
+        text += "<b>💼 Опыт работы:</b>\n"
+        for exp in experiences[:3]:
+            end_date = _format_date(exp.end_date, 'н.в.')
+            start_date = _format_date(exp.start_date)
+            if exp.responsibilities:
+                text += f" <i>{exp.responsibilities[:200]}</i>\n"
+            text += (
+                f"  • <b>{exp.position or 'Не указана'}</b> в {exp.company or 'Не указана'}\n"
+                f"    <i>({start_date} - {end_date})</i>\n"
+            )
+    else:
+        experience_years = profile.experience_years if profile.experience_years is not None else 'Не указан'
+        text += f"<b>📈 Опыт:</b> {experience_years} лет\n"
+    skills = profile.skills
+    if skills:
+        hard_skills = [f"{s.skill} ({s.level}/5)" for s in skills if s.kind == 'hard']
+        tools = [f"{s.skill} ({s.level}/5)" for s in skills if s.kind == 'tool']
+        languages = [f"{s.skill} ({s.level}/5)" for s in skills if s.kind == 'language']
+        skills_text = "\n<b>🛠 Ключевые навыки и инструменты:</b>\n"
+        if hard_skills:
+            skills_text += f" • <b>Hard Skills:</b> {', '.join(hard_skills)}\n"
+        if tools:
+            skills_text += f" • <b>Инструменты:</b> {', '.join(tools)}\n"
+        if languages:
+            skills_text += f" • <b>Языки:</b> {', '.join(languages)}\n"
+        text += skills_text
+    else:
+        text += "\n<b>🛠 Навыки:</b> Не указаны\n"
+    projects = profile.projects
+    if projects:
+        text += "\n<b>🚀 Проекты:</b>\n"
+        for p in projects[:3]:
+            text += f"  • <b>{p.title or 'Без названия'}</b>\n"
+            if p.description:
+                text += f" <i>{p.description[:200]}...</i>\n"
+            if p.links and p.links.get('main_link'):
+                text += f" (<a href='{p.links['main_link']}'>Ссылка</a>)\n"
+            else:
+                text += "\n"
+    else:
+        text += "\n<b>🚀 Проекты:</b> Не указаны\n"
+    return text
+
+def bench(name: str, func, number: int = ROUNDS) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=5)) / number
+    print(f"  {name:<40} {seconds * 1e6:9.2f} us/op")
+    return seconds
+
+def main() -> None:
+    profile = json_decode(json.dumps(make_profile(1)).encode(), Candidate)
+    renderer = ProfileCardRenderer()
+    assert ProfileCardRenderer._build(profile) == legacy_format_candidate_profile(profile)
+
+    print("Render one profile card:")
+    old = bench("legacy format_candidate_profile", lambda: legacy_format_candidate_profile(profile))
+    cold = bench("renderer, cold (no memo)", lambda: ProfileCardRenderer._build(profile))
+    renderer.render(profile)
+    warm = bench("renderer, memoized", lambda: renderer.render(profile))
+    print(f"  speedup cold: x{old / cold:.1f}, memoized: x{old / warm:.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import datetime
+import os
+from typing import Any, Callable, List
+import pytest
+
+os.environ.setdefault("BOT_TOKEN", "123456:ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghi")
+os.environ.setdefault("CANDIDATE_SERVICE_URL", "http://candidates")
+os.environ.setdefault("EMPLOYER_SERVICE_URL", "http://employers")
+os.environ.setdefault("SEARCH_SERVICE_URL", "http://search")
+os.environ.setdefault("FILE_SERVICE_URL", "http://files")
+
+from aiogram import Bot, Dispatcher, Router
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import SendMessage, SendPhoto, TelegramMethod
+from aiogram.types import Chat, Message
+
+
+class FakeSession(BaseSession):
+    """Сессия бота без сети: запоминает вызовы Bot API, отправка сообщений возвращает новое сообщение."""
+
+    def __init__(self):
+        super().__init__()
+        self.calls: List[TelegramMethod] = []
+        self._next_message_id = 100
+
+    async def make_request(
+        self, bot: Bot, method: TelegramMethod, timeout: Any = None
+    ) -> Any:
+        self.calls.append(method)
+        if isinstance(method, (SendMessage, SendPhoto)):
+            self._next_message_id += 1
+            return Message(
+                message_id=self._next_message_id,
+                date=datetime.datetime.now(),
+                chat=Chat(id=method.chat_id, type="private"),
+                text=getattr(method, "text", None),
+            ).as_(bot)
+        return True
+
+    async def close(self) -> None:
+        pass
+
+    async def stream_content(self, *args: Any, **kwargs: Any):
+        yield b""
+
+
+@pytest.fixture
+def session() -> FakeSession:
+    return FakeSession()
+
+
+@pytest.fixture
+def bot(session: FakeSession) -> Bot:
+    return Bot(token=os.environ["BOT_TOKEN"], session=session, parse_mode="HTML")
+
+
+@pytest.fixture
+def make_dispatcher():
+    """Диспетчер с роутерами бота; после теста роутеры отсоединяются, чтобы их можно было подключить снова."""
+    attached: List[Router] = []
+
+    def make(*routers: Router) -> Dispatcher:
+        dp = Dispatcher()
+        for router in routers:
+            dp.include_router(router)
+            attached.append(router)
+        return dp
+
+    yield make
+    for router in attached:
+        router._parent_router = None
@@ -0,0 +1,151 @@
+import asyncio
+import httpx
+import pytest
+from tenacity import wait_fixed
+from app.services import api_client
+from app.services.api_client import (
+    APIDeadlineExceeded,
+    APINetworkError,
+    MAX_ATTEMPTS,
+    retry_api_call,
+)
+from app.services.circuit_breaker import CircuitBreaker, RetryBudget
+from app.utils.deadline import set_deadline
+
+
+class _DownClient:
+    def __init__(self, tokens: float):
+        self.breaker = CircuitBreaker(
+            "down",
+            failure_threshold=100,
+            retry_budget=RetryBudget(ratio=0, max_tokens=tokens),
+        )
+        self.calls = 0
+
+    @retry_api_call()
+    async def fetch(self):
+        self.calls += 1
+        raise APINetworkError("down")
+
+
+def _fetch(client: _DownClient) -> None:
+    try:
+        asyncio.run(client.fetch())
+    except APINetworkError:
+        pass
+
+
+def test_final_attempt_does_not_spend_retry_budget(monkeypatch):
+    monkeypatch.setattr(api_client, "_wait_between_attempts", wait_fixed(0))
+    client = _DownClient(tokens=10)
+    _fetch(client)
+    assert client.calls == MAX_ATTEMPTS
+    assert client.breaker.retry_budget.tokens == 10 - (MAX_ATTEMPTS - 1)
+
+
+def test_exhausted_budget_stops_retries(monkeypatch):
+    monkeypatch.setattr(api_client, "_wait_between_attempts", wait_fixed(0))
+    client = _DownClient(tokens=1)
+    _fetch(client)
+    assert client.calls == 2
+    assert client.breaker.retry_budget.tokens == 0
+
+
+class _SlowClient:
+    def __init__(self):
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    @api_client.single_flight()
+    async def fetch(self, key: int):
+        self.calls += 1
+        await self.release.wait()
+        return {"key": key, "call": self.calls}
+
+
+def test_concurrent_identical_calls_share_one_request():
+    async def scenario():
+        client = _SlowClient()
+        same = [asyncio.ensure_future(client.fetch(1)) for _ in range(5)]
+        other = asyncio.ensure_future(client.fetch(2))
+        await asyncio.sleep(0)
+        client.release.set()
+        results = await asyncio.gather(*same)
+        await other
+        assert client.calls == 2
+        assert all(result is results[0] for result in results)
+        await client.fetch(1)
+        assert client.calls == 3
+
+    asyncio.run(scenario())
+
+
+class _FlakyWriter:
+    def __init__(self, failures: int):
+        self.breaker = CircuitBreaker(
+            "writer",
+            failure_threshold=100,
+            retry_budget=RetryBudget(ratio=0, max_tokens=10),
+        )
+        self.failures = failures
+        self.keys = []
+
+    @retry_api_call(idempotent=True)
+    async def create(self, name: str, idempotency_key=None):
+        self.keys.append(idempotency_key)
+        if len(self.keys) <= self.failures:
+            raise APINetworkError("flaky")
+        return name
+
+
+def test_idempotency_key_is_reused_across_retries(monkeypatch):
+    monkeypatch.setattr(api_client, "_wait_between_attempts", wait_fixed(0))
+    client = _FlakyWriter(failures=MAX_ATTEMPTS - 1)
+    assert asyncio.run(client.create("a")) == "a"
+    assert len(client.keys) == MAX_ATTEMPTS
+    assert client.keys[0] and len(set(client.keys)) == 1
+
+    asyncio.run(client.create("b"))
+    assert client.keys[-1] != client.keys[0]
+
+
+def test_caller_idempotency_key_is_kept(monkeypatch):
+    monkeypatch.setattr(api_client, "_wait_between_attempts", wait_fixed(0))
+    client = _FlakyWriter(failures=1)
+    asyncio.run(client.create("a", idempotency_key="fixed"))
+    assert client.keys == ["fixed", "fixed"]
+    assert api_client.idempotency_headers({}, "fixed") == {
+        api_client.IDEMPOTENCY_HEADER: "fixed"
+    }
+
+
+def test_timeout_is_capped_by_remaining_deadline():
+    timeout = httpx.Timeout(10.0, connect=5.0)
+    assert api_client.effective_timeout(timeout) is timeout
+
+    async def scenario():
+        set_deadline(2.0)
+        capped = api_client.effective_timeout(timeout)
+        assert 1.5 < capped.read <= 2.0
+        assert 1.5 < capped.connect <= 2.0
+        set_deadline(0.01)
+        assert api_client.effective_timeout(timeout).read <= 0.01
+        set_deadline(-1)
+        with pytest.raises(APIDeadlineExceeded):
+            api_client.effective_timeout(timeout)
+
+    asyncio.run(scenario())
+
+
+def test_no_retry_past_deadline(monkeypatch):
+    monkeypatch.setattr(api_client, "_wait_between_attempts", wait_fixed(1))
+    client = _DownClient(tokens=10)
+
+    async def scenario():
+        set_deadline(0.5)
+        await client.fetch()
+
+    with pytest.raises(APINetworkError):
+        asyncio.run(scenario())
+    assert client.calls == 1
+    assert client.breaker.retry_budget.tokens == 10
@@ -0,0 +1,66 @@
+import uuid
+
+import pytest
+
+from app.keyboards.callback_codec import decode_uuid, encode_uuid
+from app.keyboards.inline import (
+    SearchResultAction,
+    SearchResultDecision,
+    ShortlistCallback,
+    WorkModeCallback,
+)
+
+CANDIDATE_ID = "3f2b8c1e-7a4d-4e59-9c0b-1d2e3f4a5b6c"
+
+
+@pytest.mark.parametrize(
+    "callback",
+    [
+        SearchResultDecision(action="like", candidate_id=CANDIDATE_ID),
+        SearchResultDecision(action="dislike", candidate_id=CANDIDATE_ID),
+        SearchResultAction(action="get_resume", candidate_id=CANDIDATE_ID),
+        SearchResultAction(action="contact", candidate_id="not-a-uuid"),
+        ShortlistCallback(action="page", page=3),
+        ShortlistCallback(action="resume", page=1, candidate_id=CANDIDATE_ID),
+    ],
+)
+def test_round_trip(callback):
+    packed = callback.pack()
+    assert len(packed.encode()) <= 64
+    assert type(callback).unpack(packed) == callback
+
+
+def test_decision_is_compact():
+    packed = SearchResultDecision(action="like", candidate_id=CANDIDATE_ID).pack()
+    assert packed == f"sd:l:{encode_uuid(CANDIDATE_ID)}"
+    assert len(packed) == 27
+
+
+def test_uppercase_uuid_comes_back_lowercased():
+    upper = CANDIDATE_ID.upper()
+    assert decode_uuid(encode_uuid(upper)) == CANDIDATE_ID
+    packed = SearchResultAction(action="next", candidate_id=upper).pack()
+    assert SearchResultAction.unpack(packed).candidate_id == CANDIDATE_ID
+
+
+def test_legacy_prefixes_are_accepted():
+    decision = SearchResultDecision.unpack(f"search_dec:like:{CANDIDATE_ID}")
+    assert decision == SearchResultDecision(action="like", candidate_id=CANDIDATE_ID)
+    action = SearchResultAction.unpack(f"search_res:contact:{CANDIDATE_ID}")
+    assert action == SearchResultAction(action="contact", candidate_id=CANDIDATE_ID)
+    with pytest.raises(ValueError):
+        SearchResultDecision.unpack(f"other:like:{CANDIDATE_ID}")
+
+
+def test_old_work_mode_buttons_still_unpack():
+    assert WorkModeCallback.unpack("work_mode:remote") == WorkModeCallback(
+        mode="remote"
+    )
+    packed = WorkModeCallback(mode="done", selected=5).pack()
+    assert WorkModeCallback.unpack(packed) == WorkModeCallback(mode="done", selected=5)
+
+
+def test_random_uuids_round_trip():
+    for _ in range(100):
+        value = str(uuid.uuid4())
+        assert decode_uuid(encode_uuid(value)) == value
@@ -0,0 +1,33 @@
+import asyncio
+
+from app.services.decision_filter import DecidedCandidates, DecisionFilter
+
+
+def test_old_decisions_survive_capacity_overflow(tmp_path):
+    path = str(tmp_path / "decision_filter.json")
+    ids = [f"c{i}" for i in range(350)]
+
+    async def scenario():
+        decisions = DecisionFilter(path=path, capacity=100, recent_size=10)
+        for candidate_id in ids:
+            decisions.record(1, candidate_id)
+        assert decisions.filter(1, ids) == []
+        assert decisions.is_decided(1, "c0")
+        await decisions.save()
+        restored = DecisionFilter(path=path, capacity=100, recent_size=10)
+        await restored.load()
+        return restored
+
+    restored = asyncio.run(scenario())
+    assert restored.filter(1, ids) == []
+    fresh = [f"n{i}" for i in range(1000)]
+    assert len(restored.filter(1, fresh)) > 990
+
+
+def test_single_bloom_state_is_still_loaded():
+    decisions = DecisionFilter(path=None, capacity=100, recent_size=10)
+    decisions.record(1, "old")
+    legacy = DecidedCandidates(bloom=decisions._employers[1].dump().blooms[0])
+    restored = DecisionFilter(path=None, capacity=100, recent_size=10)
+    restored._employers = {1: restored._new(legacy)}
+    assert restored.is_decided(1, "old")
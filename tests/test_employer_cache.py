@@ -0,0 +1,61 @@
+import asyncio
+import json
+from app.handlers import employer_search
+from app.services.api_client import APIHTTPError, employer_api_client
+from app.services.employer_cache import EmployerIdentityCache
+from app.services.models import Employer, SearchSession
+
+
+def test_store_and_invalidate_are_persisted_in_background(tmp_path, monkeypatch):
+    path = tmp_path / "employer_cache.json"
+    cache = EmployerIdentityCache(path=str(path), flush_delay=0.01)
+
+    async def get_or_create_employer(telegram_id, username):
+        return Employer(id="e1", telegram_id=telegram_id)
+
+    monkeypatch.setattr(
+        employer_api_client, "get_or_create_employer", get_or_create_employer
+    )
+
+    async def scenario():
+        await cache.get_or_create(1, "boss")
+        assert not path.exists()
+        await asyncio.sleep(0.05)
+        assert json.loads(path.read_text())["1"]["employer"]["id"] == "e1"
+        cache.invalidate(1)
+        await asyncio.sleep(0.05)
+        assert json.loads(path.read_text()) == {}
+
+    asyncio.run(scenario())
+
+
+def test_search_session_retried_once_with_fresh_employer(monkeypatch):
+    cache = EmployerIdentityCache(path=None)
+    employers = iter([Employer(id="fresh")])
+    sessions = []
+
+    async def get_or_create_employer(telegram_id, username):
+        return next(employers)
+
+    async def create_search_session(employer_id, filters):
+        sessions.append(employer_id)
+        if employer_id == "stale":
+            raise APIHTTPError(404, "employer not found")
+        return SearchSession(id="s1")
+
+    monkeypatch.setattr(
+        employer_api_client, "get_or_create_employer", get_or_create_employer
+    )
+    monkeypatch.setattr(
+        employer_api_client, "create_search_session", create_search_session
+    )
+    monkeypatch.setattr(employer_search, "employer_cache", cache)
+
+    async def scenario():
+        cache._store(1, "boss", Employer(id="stale"))
+        return await employer_search._open_search_session(1, "boss", {"role": "dev"})
+
+    employer, session = asyncio.run(scenario())
+    assert sessions == ["stale", "fresh"]
+    assert employer.id == "fresh" and session.id == "s1"
+    assert cache.get(1).id == "fresh"
@@ -0,0 +1,103 @@
+import asyncio
+import datetime
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+from aiogram.methods import EditMessageText, SendMessage
+from aiogram.types import Chat, Message, User
+from app.handlers import employer_search
+from app.services.api_client import search_api_client
+from app.services.decision_filter import DecisionFilter
+from app.services.hydration import profile_hydrator
+from app.services.models import (
+    Candidate,
+    Employer,
+    SearchHit,
+    SearchResponse,
+    SearchSession,
+)
+
+
+def test_find_candidates_pages_past_decided_candidates(monkeypatch):
+    decisions = DecisionFilter(path=None)
+    window = employer_search.RERANK_WINDOW
+    size = employer_search.SEARCH_FETCH_SIZE
+    seen = [f"c{i}" for i in range(size + 3)]
+    for candidate_id in seen:
+        decisions.record(1, candidate_id)
+    requests = []
+
+    async def search_candidates(filters):
+        requests.append(filters["page"])
+        start = (filters["page"] - 1) * filters["size"]
+        ids = [f"c{i}" for i in range(start, min(start + filters["size"], 3 * size))]
+        return SearchResponse(
+            results=[SearchHit(candidate_id=i) for i in ids], total=3 * size
+        )
+
+    async def hydrate(candidate_ids):
+        return [Candidate(id=i, telegram_id=0) for i in candidate_ids]
+
+    monkeypatch.setattr(employer_search, "decision_filter", decisions)
+    monkeypatch.setattr(search_api_client, "search_candidates", search_candidates)
+    monkeypatch.setattr(profile_hydrator, "hydrate", hydrate)
+    response, profiles = asyncio.run(
+        employer_search._find_candidates(1, {"role": "dev"})
+    )
+    assert requests == [1, 2]
+    assert response.total == 3 * size
+    assert len(profiles) == window
+    assert not any(p.id in seen for p in profiles)
+
+
+def test_find_candidates_stops_at_last_page(monkeypatch):
+    decisions = DecisionFilter(path=None)
+    decisions.record(1, "c0")
+    requests = []
+
+    async def search_candidates(filters):
+        requests.append(filters["page"])
+        hits = (
+            [SearchHit(candidate_id="c0"), SearchHit(candidate_id="c1")]
+            if filters["page"] == 1
+            else []
+        )
+        return SearchResponse(results=hits)
+
+    async def hydrate(candidate_ids):
+        return [Candidate(id=i, telegram_id=0) for i in candidate_ids]
+
+    monkeypatch.setattr(employer_search, "decision_filter", decisions)
+    monkeypatch.setattr(search_api_client, "search_candidates", search_candidates)
+    monkeypatch.setattr(profile_hydrator, "hydrate", hydrate)
+    _, profiles = asyncio.run(employer_search._find_candidates(1, {"role": "dev"}))
+    assert requests == [1]
+    assert [p.id for p in profiles] == ["c1"]
+
+
+def test_first_card_is_sent_not_edited(bot, session, monkeypatch):
+    user = User(id=7004, is_bot=False, first_name="Петр")
+    message = Message(
+        message_id=1,
+        date=datetime.datetime.now(),
+        chat=Chat(id=user.id, type="private"),
+        from_user=user,
+        text="Москва",
+    ).as_(bot)
+    state = FSMContext(
+        MemoryStorage(), StorageKey(bot_id=bot.id, chat_id=user.id, user_id=user.id)
+    )
+
+    async def open_search_session(telegram_id, username, filters):
+        return Employer(id="e1"), SearchSession(id="s1")
+
+    async def find_candidates(telegram_id, filters):
+        return SearchResponse(total=1), [Candidate(id="c1", display_name="Анна")]
+
+    monkeypatch.setattr(employer_search, "_open_search_session", open_search_session)
+    monkeypatch.setattr(employer_search, "_find_candidates", find_candidates)
+    asyncio.run(employer_search.kickoff_search(message, state, {"role": "dev"}))
+    assert not [c for c in session.calls if isinstance(c, EditMessageText)]
+    assert "Анна" in session.calls[-1].text and isinstance(
+        session.calls[-1], SendMessage
+    )
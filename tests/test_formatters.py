@@ -0,0 +1,45 @@
+import re
+from app.services.models import Candidate, CandidateExperience, CandidateProject
+from app.utils.formatters import CAPTION_LIMIT, fit_text, format_candidate_profile
+
+
+def _balanced(html: str) -> bool:
+    stack = []
+    for closing, name in re.findall(r"<(/?)([a-z]+)[^>]*>", html):
+        if not closing:
+            stack.append(name)
+        elif not stack or stack.pop() != name:
+            return False
+    return not stack
+
+
+def test_multiline_description_over_caption_limit_keeps_tags_closed():
+    description = "\n".join(f"строка описания проекта номер {i}" for i in range(40))
+    profile = Candidate(
+        id="c1",
+        display_name="Иван",
+        experiences=[
+            CandidateExperience(
+                company="ACME", position="Dev", responsibilities="x" * 150
+            )
+        ],
+        projects=[
+            CandidateProject(title=f"Проект {i}", description=description)
+            for i in range(3)
+        ],
+    )
+    text = format_candidate_profile(profile, limit=CAPTION_LIMIT)
+    assert len(text) <= CAPTION_LIMIT
+    assert text.endswith("…")
+    assert _balanced(text)
+
+
+def test_fit_text_does_not_cut_inside_tag_or_entity():
+    text = (
+        "<b>" + "a" * 20 + "</b> <a href='https://example.com'>ссылка</a> &amp; хвост"
+    )
+    for limit in range(10, len(text)):
+        result = fit_text(text, limit)
+        assert len(result) <= limit
+        assert _balanced(result)
+        assert not re.search(r"<[^>]*$|&[a-z]*…", result.replace("\n…", ""))
@@ -0,0 +1,47 @@
+import asyncio
+
+from app.services.hedging import RequestHedger
+from app.utils.metrics import metrics
+
+
+def _hedger(name: str, delay: float) -> RequestHedger:
+    return RequestHedger(name, percentile=95, min_delay=0.0, default_delay=delay)
+
+
+def test_fast_request_is_not_hedged():
+    calls = []
+
+    async def factory():
+        calls.append(asyncio.get_running_loop().time())
+        return "ok"
+
+    assert asyncio.run(_hedger("test_fast", 0.05).run(factory)) == "ok"
+    assert len(calls) == 1
+    assert metrics.snapshot()["counters"].get("hedge.test_fast.fired", 0) == 0
+
+
+def test_hedge_fires_only_after_delay():
+    delay = 0.05
+    started = []
+
+    async def factory():
+        started.append(asyncio.get_running_loop().time())
+        if len(started) == 1:
+            await asyncio.sleep(1)
+            return "primary"
+        return "hedge"
+
+    assert asyncio.run(_hedger("test_slow", delay).run(factory)) == "hedge"
+    assert len(started) == 2
+    assert started[1] - started[0] >= delay
+    counters = metrics.snapshot()["counters"]
+    assert counters["hedge.test_slow.fired"] == 1
+    assert counters["hedge.test_slow.won"] == 1
+
+
+def test_delay_follows_observed_percentile():
+    hedger = _hedger("test_percentile", 1.0)
+    assert hedger.delay() == 1.0
+    for value in range(1, 101):
+        metrics.observe("hedge.test_percentile.latency", value / 1000)
+    assert abs(hedger.delay() - 0.096) < 1e-9
@@ -0,0 +1,35 @@
+import io
+
+from PIL import Image
+
+from app.utils.images import downscale_image
+
+
+def _png(size) -> io.BytesIO:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, (200, 10, 10)).save(buffer, format="PNG")
+    buffer.seek(0)
+    return buffer
+
+
+def test_large_image_is_downscaled_to_jpeg():
+    result = downscale_image(_png((2000, 1000)), max_side=200)
+    with Image.open(io.BytesIO(result)) as image:
+        assert image.format == "JPEG" and max(image.size) == 200
+
+
+def test_broken_image_falls_back_to_original():
+    source = io.BytesIO(b"not an image at all")
+    assert downscale_image(source) is None
+    assert source.tell() == 0
+
+
+def test_truncated_image_falls_back_to_original():
+    data = _png((800, 800)).getvalue()
+    source = io.BytesIO(data[: len(data) // 2])
+    assert downscale_image(source, max_side=100) is None
+
+
+def test_decompression_bomb_falls_back_to_original(monkeypatch):
+    monkeypatch.setattr(Image, "MAX_IMAGE_PIXELS", 1000)
+    assert downscale_image(_png((200, 200)), max_side=100) is None
@@ -0,0 +1,47 @@
+import asyncio
+from aiogram.methods import AnswerInlineQuery
+from aiogram.types import InlineQuery, Update, User
+from app.handlers import inline_search as inline_handlers
+from app.services import inline_search
+from app.services.api_client import search_api_client
+from app.services.skills import SkillEntry, SkillIndex
+
+USER = User(id=7002, is_bot=False, first_name="Анна")
+
+
+def _index() -> SkillIndex:
+    return SkillIndex(
+        [
+            SkillEntry(name="Next.js", aliases=["nextjs"]),
+            SkillEntry(name="Python"),
+            SkillEntry(name="REST API", aliases=["rest"]),
+        ]
+    )
+
+
+def test_parse_inline_query_keeps_unknown_tokens_in_role(monkeypatch):
+    monkeypatch.setattr(inline_search, "skill_index", _index())
+    filters = inline_search.parse_inline_query("nestjs 3+")
+    assert filters == {
+        "role": "nestjs",
+        "must_skills": [],
+        "experience_min": 3.0,
+        "experience_max": None,
+    }
+    filters = inline_search.parse_inline_query("python jest")
+    assert filters["must_skills"] == ["python"]
+    assert filters["role"] == "jest"
+
+
+def test_inline_query_requires_employer(bot, session, monkeypatch, make_dispatcher):
+    async def search_candidates(filters):
+        raise AssertionError("search must not run for non-employers")
+
+    monkeypatch.setattr(search_api_client, "search_candidates", search_candidates)
+    dp = make_dispatcher(inline_handlers.router)
+    query = InlineQuery(id="iq", from_user=USER, query="python", offset="")
+    asyncio.run(dp.feed_update(bot, Update(update_id=1, inline_query=query)))
+    answer = session.calls[-1]
+    assert isinstance(answer, AnswerInlineQuery)
+    assert answer.results == []
+    assert answer.button.start_parameter == "employer"
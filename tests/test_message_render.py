@@ -0,0 +1,148 @@
+import asyncio
+import datetime
+from aiogram.methods import EditMessageText, SendMessage
+from aiogram.types import CallbackQuery, Chat, Message, Update, User
+from app.handlers import candidate_handlers
+from app.keyboards.inline import ConfirmationCallback, EditFieldCallback, ProfileAction
+from app.services.api_client import candidate_api_client
+from app.services.models import Candidate, state_dump
+from app.states.candidate import CandidateFSM
+from app.utils.message_render import RenderedMessagesMiddleware, render_card
+
+USER = User(id=7001, is_bot=False, first_name="Иван")
+
+
+def _message(bot, message_id: int, text: str) -> Message:
+    return Message(
+        message_id=message_id,
+        date=datetime.datetime.now(),
+        chat=Chat(id=USER.id, type="private"),
+        from_user=USER,
+        text=text,
+    ).as_(bot)
+
+
+def _callback(bot, message: Message, data: str) -> Update:
+    return Update(
+        update_id=2,
+        callback_query=CallbackQuery(
+            id="q",
+            from_user=USER,
+            chat_instance="c",
+            data=data,
+            message=message,
+        ),
+    )
+
+
+def test_render_card_edits_after_outside_edit(bot, session):
+    bot.session.middleware(RenderedMessagesMiddleware())
+
+    async def scenario():
+        card = await render_card(_message(bot, 1, "old"), "card", edit=False)
+        await card.edit_text("menu")
+        session.calls.clear()
+        await render_card(card, "card")
+        return session.calls
+
+    calls = asyncio.run(scenario())
+    assert [type(c) for c in calls] == [EditMessageText]
+    assert calls[0].text == "card"
+
+
+def test_profile_edit_then_back_shows_profile_again(
+    bot, session, monkeypatch, make_dispatcher
+):
+    bot.session.middleware(RenderedMessagesMiddleware())
+    profile = Candidate(
+        id="c1", telegram_id=USER.id, display_name="Иван", headline_role="Backend"
+    )
+
+    async def get_candidate_by_telegram_id(telegram_id):
+        return profile
+
+    monkeypatch.setattr(
+        candidate_api_client,
+        "get_candidate_by_telegram_id",
+        get_candidate_by_telegram_id,
+    )
+    dp = make_dispatcher(candidate_handlers.router)
+
+    async def scenario():
+        await dp.feed_update(
+            bot, Update(update_id=1, message=_message(bot, 1, "/profile"))
+        )
+        sent = session.calls[-1]
+        assert isinstance(sent, SendMessage)
+        card = _message(bot, session._next_message_id, sent.text)
+        await dp.feed_update(
+            bot, _callback(bot, card, ProfileAction(action="edit").pack())
+        )
+        assert session.calls[-1].text != sent.text
+        menu = _message(bot, card.message_id, session.calls[-1].text)
+        session.calls.clear()
+        await dp.feed_update(
+            bot, _callback(bot, menu, EditFieldCallback(field_name="back").pack())
+        )
+        return sent.text, session.calls
+
+    profile_text, calls = asyncio.run(scenario())
+    edits = [c for c in calls if isinstance(c, EditMessageText)]
+    assert edits and edits[-1].text == profile_text
+
+
+def test_confirm_added_skill_shows_updated_profile_without_refetch(
+    bot, session, monkeypatch, make_dispatcher
+):
+    bot.session.middleware(RenderedMessagesMiddleware())
+    profile = Candidate(
+        id="c1", telegram_id=USER.id, display_name="Иван", headline_role="Backend"
+    )
+    fetches, updates = [], []
+
+    async def get_candidate_by_telegram_id(telegram_id):
+        fetches.append(telegram_id)
+        return profile
+
+    async def update_candidate_profile(telegram_id, profile_data):
+        updates.append(profile_data)
+        return True
+
+    monkeypatch.setattr(
+        candidate_api_client,
+        "get_candidate_by_telegram_id",
+        get_candidate_by_telegram_id,
+    )
+    monkeypatch.setattr(
+        candidate_api_client, "update_candidate_profile", update_candidate_profile
+    )
+    dp = make_dispatcher(candidate_handlers.router)
+
+    async def scenario():
+        state = dp.fsm.get_context(bot, chat_id=USER.id, user_id=USER.id)
+        await state.set_state(CandidateFSM.confirm_action)
+        await state.update_data(
+            mode="edit",
+            action_type="add_another_skill",
+            profile_cache=state_dump(profile),
+            new_skills=[{"skill": "Rust", "kind": "hard", "level": 3}],
+        )
+        menu = _message(bot, 5, "Навык добавлен")
+        await dp.feed_update(
+            bot,
+            _callback(
+                bot, menu, ConfirmationCallback(action="no", step="skill").pack()
+            ),
+        )
+        return fetches[:], await state.get_data()
+
+    fetched_before_render, data = asyncio.run(scenario())
+    assert updates == [{"skills": [{"skill": "Rust", "kind": "hard", "level": 3}]}]
+    assert fetched_before_render == []
+    assert data["profile_cache"]["skills"] == [{"skill": "Rust", "level": 3}]
+    cards = [
+        c
+        for c in session.calls
+        if isinstance(c, (SendMessage, EditMessageText)) and "Иван" in c.text
+    ]
+    assert cards and "Rust" in cards[-1].text
@@ -0,0 +1,38 @@
+import datetime
+from app.services.models import (
+    Candidate,
+    CandidateExperience,
+    Employer,
+    json_decode,
+    state_dump,
+    state_load,
+)
+from app.utils.formatters import format_candidate_profile, TEXT_LIMIT
+
+
+def test_integer_experience_is_not_shown_as_float():
+    profile = json_decode(b'{"id": "c1", "experience_years": 5}', Candidate)
+    assert profile.experience_years == 5 and isinstance(profile.experience_years, int)
+    text = format_candidate_profile(profile, limit=TEXT_LIMIT)
+    assert "5 лет" in text and "5.0" not in text
+    assert "2.5 лет" in format_candidate_profile(
+        Candidate(id="c2", experience_years=2.5), limit=TEXT_LIMIT
+    )
+
+
+def test_models_round_trip_through_fsm_data():
+    profile = Candidate(
+        id="c1",
+        experience_years=3,
+        experiences=[
+            CandidateExperience(company="ACME", start_date=datetime.date(2020, 1, 1))
+        ],
+        updated_at=datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc),
+    )
+    data = state_dump(profile)
+    assert (
+        isinstance(data, dict) and data["experiences"][0]["start_date"] == "2020-01-01"
+    )
+    assert state_load(data, Candidate) == profile
+    assert state_load(state_dump(Employer(id="e1")), Employer) == Employer(id="e1")
+    assert state_load(None, Candidate) is None
@@ -0,0 +1,38 @@
+import asyncio
+
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.storage.base import StorageKey
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from app.handlers import candidate_handlers
+from app.services.models import Candidate, CandidateSkill, state_dump
+from app.services.profile_draft import apply_patch
+
+
+def test_apply_patch_converts_fsm_values():
+    profile = Candidate(id="c1", display_name="Иван")
+    patched = apply_patch(
+        profile, {"skills": [{"skill": "Go", "kind": "hard", "level": "3"}]}
+    )
+    assert patched.skills == [CandidateSkill(skill="Go", level=3)]
+    assert patched.display_name == "Иван"
+
+
+def test_apply_patch_returns_none_on_invalid_value():
+    profile = Candidate(id="c1")
+    assert apply_patch(profile, {"skills": [{"kind": "hard"}]}) is None
+    assert apply_patch(profile, {"work_modes": "remote"}) is None
+
+
+def test_invalid_patch_drops_cached_profile():
+    profile = Candidate(id="c1")
+    state = FSMContext(MemoryStorage(), StorageKey(bot_id=1, chat_id=2, user_id=2))
+
+    async def scenario():
+        await state.update_data(profile_cache=state_dump(profile))
+        await candidate_handlers._apply_local_update(
+            state, 2, profile, {"skills": [{}]}
+        )
+        return await state.get_data()
+
+    assert asyncio.run(scenario())["profile_cache"] is None
@@ -0,0 +1,73 @@
+import asyncio
+
+from app.handlers import employer_search
+from app.services import ranking
+from app.services.api_client import search_api_client
+from app.services.decision_filter import DecisionFilter
+from app.services.hydration import profile_hydrator
+from app.services.models import Candidate, CandidateSkill, SearchHit, SearchResponse
+from app.services.ranking import CandidateRanker
+from app.services.skills import SkillEntry, SkillIndex
+
+
+def _candidate(candidate_id, skills=(), years=None):
+    return Candidate(
+        id=candidate_id,
+        experience_years=years,
+        skills=[CandidateSkill(skill=name, level=level) for name, level in skills],
+    )
+
+
+def test_rank_orders_by_skill_coverage_and_experience():
+    candidates = [
+        _candidate("none"),
+        _candidate("half", [("Python", 5)], years=4),
+        _candidate("full", [("Python", 5), ("Django", 5)], years=4),
+        _candidate("full_far", [("Python", 5), ("Django", 5)], years=15),
+    ]
+    ranked = CandidateRanker().rank(
+        candidates, must_skills=["python", "django"], experience_min=3, experience_max=5
+    )
+    assert [c.id for c in ranked] == ["full", "full_far", "half", "none"]
+
+
+def test_rank_keeps_search_order_without_known_skills():
+    candidates = [_candidate(f"c{i}", [("Rust", 3)]) for i in range(4)]
+    ranker = CandidateRanker()
+    assert ranker.rank(candidates) == candidates
+    assert ranker.rank(candidates, must_skills=["cobol"]) == candidates
+    assert ranker.rank([]) == []
+    assert ranker.rank(candidates[:1], must_skills=["rust"]) == candidates[:1]
+
+
+def test_skill_keys_follow_dictionary_reload(monkeypatch):
+    index = SkillIndex()
+    monkeypatch.setattr(ranking, "skill_index", index)
+    assert ranking._skill_key("py") == "py"
+    index._build([SkillEntry(name="Python", aliases=["py"])])
+    assert ranking._skill_key("py") == "python"
+
+
+def test_rerank_is_limited_to_window(monkeypatch):
+    window = employer_search.RERANK_WINDOW
+    ids = [f"c{i}" for i in range(window + 5)]
+    profiles = {i: _candidate(i) for i in ids}
+    profiles[ids[3]] = _candidate(ids[3], [("Python", 5)])
+    profiles[ids[-1]] = _candidate(ids[-1], [("Python", 5)])
+
+    async def search_candidates(filters):
+        hits = [SearchHit(candidate_id=i) for i in ids[: filters["size"]]]
+        return SearchResponse(results=hits, total=len(ids))
+
+    async def hydrate(candidate_ids):
+        return [profiles[i] for i in candidate_ids]
+
+    monkeypatch.setattr(employer_search, "decision_filter", DecisionFilter(path=None))
+    monkeypatch.setattr(search_api_client, "search_candidates", search_candidates)
+    monkeypatch.setattr(profile_hydrator, "hydrate", hydrate)
+    _, ranked = asyncio.run(
+        employer_search._find_candidates(1, {"role": "dev", "must_skills": ["python"]})
+    )
+    assert len(ranked) == window
+    assert ranked[0].id == ids[3]
+    assert ids[-1] not in {c.id for c in ranked}
@@ -0,0 +1,125 @@
+import asyncio
+import datetime
+from aiogram.types import Chat, Message, Update, User
+from app.handlers import employer_search, saved_searches
+from app.services.api_client import APINetworkError, mark_background, retry_api_call
+from app.services.circuit_breaker import CircuitBreaker
+from app.services.models import Employer, SearchResponse, SearchSession
+from app.services.saved_searches import SavedSearchScheduler, SavedSearchStore
+
+USER = User(id=7003, is_bot=False, first_name="Олег")
+
+
+def _message(bot, text: str) -> Message:
+    return Message(
+        message_id=1,
+        date=datetime.datetime.now(),
+        chat=Chat(id=USER.id, type="private"),
+        from_user=USER,
+        text=text,
+    ).as_(bot)
+
+
+def test_save_search_after_empty_results(bot, session, monkeypatch, make_dispatcher):
+    store = SavedSearchStore(path=None)
+    filters = {
+        "role": "Backend",
+        "must_skills": ["python"],
+        "experience_min": 3.0,
+        "filter_step": "location_and_work_modes",
+    }
+
+    async def open_search_session(telegram_id, username, filters):
+        return Employer(id="e1"), SearchSession(id="s1")
+
+    async def find_candidates(telegram_id, filters):
+        return SearchResponse(), []
+
+    async def run_once(bot, search):
+        return []
+
+    monkeypatch.setattr(employer_search, "saved_search_store", store)
+    monkeypatch.setattr(saved_searches, "saved_search_store", store)
+    monkeypatch.setattr(
+        saved_searches, "saved_search_scheduler", SavedSearchScheduler(store)
+    )
+    monkeypatch.setattr(saved_searches.saved_search_scheduler, "run_once", run_once)
+    monkeypatch.setattr(employer_search, "_open_search_session", open_search_session)
+    monkeypatch.setattr(employer_search, "_find_candidates", find_candidates)
+    dp = make_dispatcher(saved_searches.router)
+
+    async def scenario():
+        state = dp.fsm.get_context(bot, chat_id=USER.id, user_id=USER.id)
+        await state.update_data(**filters)
+        await employer_search.kickoff_search(_message(bot, "Москва"), state, filters)
+        assert await state.get_data() == {}
+        await dp.feed_update(
+            bot, Update(update_id=1, message=_message(bot, "/save_search"))
+        )
+
+    asyncio.run(scenario())
+    [search] = store.list_for(USER.id)
+    assert search.filters == {
+        "role": "Backend",
+        "must_skills": ["python"],
+        "experience_min": 3.0,
+    }
+
+
+class _FlakyClient:
+    def __init__(self):
+        self.breaker = CircuitBreaker("flaky")
+        self.calls = 0
+
+    @retry_api_call()
+    async def fetch(self):
+        self.calls += 1
+        raise APINetworkError("down")
+
+
+def test_background_requests_do_not_retry():
+    client = _FlakyClient()
+    tokens = client.breaker.retry_budget.tokens
+
+    async def scenario():
+        mark_background()
+        try:
+            await client.fetch()
+        except APINetworkError:
+            pass
+
+    asyncio.run(scenario())
+    assert client.calls == 1
+    assert client.breaker.retry_budget.tokens == tokens
+
+
+def test_scheduler_ticks_share_one_debounced_save(tmp_path, monkeypatch):
+    store = SavedSearchStore(
+        path=str(tmp_path / "saved_searches.json"), flush_delay=0.2
+    )
+    scheduler = SavedSearchScheduler(store, interval=0.001, jitter=0, tick=0.001)
+    runs, saves = [], []
+    save = store.save
+
+    async def run_once(bot, search):
+        runs.append(search.id)
+        return []
+
+    async def counting_save():
+        saves.append(len(runs))
+        await save()
+
+    monkeypatch.setattr(scheduler, "run_once", run_once)
+    monkeypatch.setattr(store, "save", counting_save)
+
+    async def scenario():
+        await store.add(USER.id, "Backend", {"role": "Backend"})
+        saves.clear()
+        scheduler.start(None)
+        await asyncio.sleep(0.3)
+        await scheduler.stop()
+        await store._flush_task
+
+    asyncio.run(scenario())
+    assert len(runs) > 10
+    assert 1 <= len(saves) <= 2
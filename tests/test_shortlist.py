@@ -0,0 +1,27 @@
+import asyncio
+import json
+from app.services.shortlist import ShortlistStore
+
+
+def test_likes_are_saved_once_in_background(tmp_path, monkeypatch):
+    path = tmp_path / "shortlist.json"
+    store = ShortlistStore(path=str(path), max_size=2, flush_delay=0.01)
+    saves = []
+    save = store.save
+
+    async def counting_save():
+        saves.append(1)
+        await save()
+
+    monkeypatch.setattr(store, "save", counting_save)
+
+    async def scenario():
+        for candidate_id in ("c1", "c2", "c1", "c3"):
+            store.add(1, candidate_id)
+        assert not path.exists()
+        await asyncio.sleep(0.05)
+
+    asyncio.run(scenario())
+    assert store.get(1) == ["c3", "c1"]
+    assert json.loads(path.read_text()) == {"1": ["c3", "c1"]}
+    assert len(saves) == 1
@@ -0,0 +1,51 @@
+import asyncio
+from app.services.skills import SkillEntry, SkillIndex
+
+
+def _index() -> SkillIndex:
+    return SkillIndex(
+        [
+            SkillEntry(name="REST API", aliases=["rest"]),
+            SkillEntry(name="Next.js", aliases=["nextjs"]),
+            SkillEntry(name="Python", aliases=["py"]),
+        ]
+    )
+
+
+def test_short_or_different_first_letter_is_not_fuzzy_matched():
+    index = _index()
+    assert index.fuzzy("jest") is None
+    assert index.fuzzy("nest") is None
+    assert index.fuzzy("nuxt") is None
+    assert index.normalize("NestJS") == "NestJS"
+    assert index.normalize("Jest") == "Jest"
+
+
+def test_fuzzy_hit_is_never_auto_accepted():
+    index = _index()
+    assert index.fuzzy("nestjs") == "Next.js"
+    assert index.normalize("nestjs") == "nestjs"
+
+
+def test_typo_is_only_a_suggestion():
+    index = _index()
+    assert index.fuzzy("pyhton") == "Python"
+    assert index.suggest("pyhton") == ["Python"]
+    assert index.exact("pyhton") is None
+    assert index.normalize("pyhton") == "pyhton"
+
+
+def test_exact_names_and_aliases_are_accepted():
+    index = _index()
+    assert index.exact(" REST ") == "REST API"
+    assert index.normalize("nextjs") == "Next.js"
+    assert index.normalize_many(["py", "Python", "  Go  "]) == ["Python", "Go"]
+
+
+def test_bundled_dictionary_keeps_similar_names_apart():
+    index = SkillIndex()
+    asyncio.run(index.load())
+    assert index.exact("Jest") == "Jest"
+    assert index.exact("NestJS") == "NestJS"
+    assert index.exact("nuxt") == "Nuxt.js"
+    assert index.exact("Postgres") == "PostgreSQL"
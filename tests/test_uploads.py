@@ -0,0 +1,77 @@
+import asyncio
+import hashlib
+
+import httpx
+from aiogram.types import File
+
+from app.services.uploads import FileHashIndex, UploadManager
+
+
+class _FakeBot:
+    def __init__(self, content: bytes):
+        self.content = content
+
+    async def get_file(self, file_id):
+        return File(
+            file_id=file_id,
+            file_unique_id="u",
+            file_size=len(self.content),
+            file_path="docs/cv.pdf",
+        )
+
+    async def download_file(self, file_path, destination, chunk_size):
+        for i in range(0, len(self.content), chunk_size):
+            destination.write(self.content[i : i + chunk_size])
+
+
+def _download(content: bytes, spool_threshold: int):
+    manager = UploadManager(spool_threshold=spool_threshold)
+    return asyncio.run(manager.download(_FakeBot(content), "f1"))
+
+
+def test_small_upload_stays_in_memory():
+    content = b"0123456789"
+    _, buffer, digest = _download(content, spool_threshold=1024)
+    with buffer:
+        request = httpx.Request(
+            "POST",
+            "http://files/upload",
+            files={"file": ("cv.pdf", buffer, "application/pdf")},
+        )
+        body = request.read()
+        assert not buffer.rolled
+    assert content in body
+    assert digest == hashlib.sha256(content).hexdigest()
+
+
+def test_large_upload_is_spooled_to_disk():
+    content = b"x" * 4096
+    _, buffer, _ = _download(content, spool_threshold=1024)
+    with buffer:
+        assert buffer.rolled
+        request = httpx.Request(
+            "POST",
+            "http://files/upload",
+            files={"file": ("cv.pdf", buffer, "application/pdf")},
+        )
+        assert content in request.read()
+
+
+def test_file_hash_index_survives_restart(tmp_path):
+    path = str(tmp_path / "file_hash_index.json")
+
+    async def scenario():
+        index = FileHashIndex(path=path, maxsize=2, flush_delay=0)
+        index.remember(1, "resume", "aaa", "file-1")
+        index.remember(2, "avatar", "bbb", "file-2")
+        index.remember(3, "resume", "ccc", "file-3")
+        await index._flush_task
+
+        restored = FileHashIndex(path=path, maxsize=2)
+        await restored.load()
+        assert restored.is_current(3, "resume", "ccc", "file-3")
+        assert restored.is_current(2, "avatar", "bbb", "file-2")
+        assert not restored.is_current(1, "resume", "aaa", "file-1")
+        assert not restored.is_current(3, "resume", "ccc", "file-4")
+
+    asyncio.run(scenario())